@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Cache Codec Benchmark
+
+Compares pickle with the CacheService codecs (orjson, msgpack, with and
+without compression) on real surah payloads and on the Quran search
+index built from them: encoded size, encode time and decode time.
+
+"set path" rows use the codec exactly as CacheService.set does with the
+current settings (compression threshold, zlib opt-in, strict mode);
+"strict" rows add the full type walk of cache_codec_strict.
+
+Surahs are read from the cache populated by cache_quran.py; any that are
+missing are fetched from api.alquran.cloud.
+
+Usage:
+    python benchmark_cache_codecs.py                    # Surahs 1, 2, 18, 36, 112
+    python benchmark_cache_codecs.py --surahs 2 3 4     # Specific surahs
+    python benchmark_cache_codecs.py --rounds 200       # More iterations
+"""
+
+import argparse
+import asyncio
+import pickle
+import time
+
+import httpx
+
+from src.services.cache_codecs import MSGPACK_AVAILABLE, ZSTD_AVAILABLE, CacheCodec
+from src.services.cache_service import get_cache_service
+from src.services.search_index import build_quran_index
+
+
+async def load_surahs(surah_numbers: list[int], edition: str) -> list[dict]:
+    """Load surahs from the cache, fetching missing ones from the API."""
+    cache = get_cache_service()
+    await cache.connect_redis()
+
+    keys = {f"quran_surah:{n}:{edition}": n for n in surah_numbers}
+    cached = await cache.get_many(keys, promote=False)
+    surahs = list(cached.values())
+
+    missing = [n for key, n in keys.items() if key not in cached]
+    if missing:
+        print(f"Fetching {len(missing)} surah(s) not in cache from api.alquran.cloud...")
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            for n in missing:
+                response = await client.get(f"https://api.alquran.cloud/v1/surah/{n}/{edition}")
+                response.raise_for_status()
+                surahs.append(response.json()["data"])
+
+    await cache.disconnect_redis()
+    return surahs
+
+
+def bench(name: str, encode, decode, payloads: list[dict], rounds: int) -> dict:
+    """Time encode/decode over all payloads."""
+    encoded = [encode(p) for p in payloads]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for p in payloads:
+            encode(p)
+    encode_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for data in encoded:
+            decode(data)
+    decode_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    return {
+        "name": name,
+        "bytes": sum(len(data) for data in encoded),
+        "encode_ms": encode_ms,
+        "decode_ms": decode_ms,
+    }
+
+
+def candidates() -> list[tuple]:
+    """Encoders/decoders to compare, pickle first."""
+    rows = [
+        ("pickle", lambda v: pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+        ("set path", CacheCodec().encode, CacheCodec().decode),
+    ]
+    codec_names = ["orjson"] + (["msgpack"] if MSGPACK_AVAILABLE else [])
+    for codec_name in codec_names:
+        codec = CacheCodec(codec_name, compress_min_bytes=0, allow_pickle=False, strict=False)
+        rows.append((codec_name, codec.encode, codec.decode))
+        strict = CacheCodec(codec_name, compress_min_bytes=0, allow_pickle=False, strict=True)
+        rows.append((f"{codec_name} strict", strict.encode, strict.decode))
+        if ZSTD_AVAILABLE:
+            zstd = CacheCodec(codec_name, compress_min_bytes=1, allow_pickle=False, strict=False)
+            rows.append((f"{codec_name}+zstd", zstd.encode, zstd.decode))
+    return rows
+
+
+def report(title: str, payloads: list[dict], rounds: int) -> None:
+    """Benchmark every candidate on the payloads and print a table."""
+    results = [bench(name, enc, dec, payloads, rounds) for name, enc, dec in candidates()]
+    baseline = results[0]
+
+    print("\n" + "=" * 70)
+    print(f"📊 {title} - {rounds} rounds")
+    print("=" * 70)
+    print(f"{'codec':<16}{'size KB':>10}{'vs pickle':>11}{'encode ms':>12}{'decode ms':>12}")
+    for r in results:
+        ratio = r["bytes"] / baseline["bytes"]
+        print(
+            f"{r['name']:<16}{r['bytes'] / 1024:>10.1f}{ratio:>10.0%} "
+            f"{r['encode_ms']:>11.2f}{r['decode_ms']:>12.2f}"
+        )
+    print("=" * 70 + "\n")
+
+
+def main() -> None:
+    """Run the benchmark and print comparison tables."""
+    parser = argparse.ArgumentParser(description="Benchmark cache value codecs")
+    parser.add_argument("--surahs", nargs="+", type=int, default=[1, 2, 18, 36, 112])
+    parser.add_argument("--edition", default="quran-uthmani")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--index-rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    payloads = asyncio.run(load_surahs(args.surahs, args.edition))
+    report(f"CACHE CODEC BENCHMARK - {len(payloads)} surahs", payloads, args.rounds)
+
+    index = build_quran_index({s["number"]: s for s in payloads}).to_dict()
+    report("CACHE CODEC BENCHMARK - Quran search index", [index], args.index_rounds)
+
+
+if __name__ == "__main__":
+    main()
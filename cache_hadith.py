@@ -18,6 +18,7 @@ import httpx
 from loguru import logger
 
 from src.services.cache_service import get_cache_service
+from src.services.cached_content_service import get_cached_content_service
 
 
 async def fetch_and_cache_batch(
@@ -27,6 +28,7 @@ async def fetch_and_cache_batch(
     start: int,
     end: int,
     base_url: str,
+    collected: list | None = None,
 ) -> int:
     """
     Fetch and cache a single batch of hadiths.
@@ -38,6 +40,7 @@ async def fetch_and_cache_batch(
         start: Start index
         end: End index
         base_url: API base URL
+        collected: Optional list receiving the fetched hadiths (for indexing)
     
     Returns:
         Number of entries cached (0 on failure)
@@ -58,12 +61,15 @@ async def fetch_and_cache_batch(
             
             # Cache individual hadiths
             hadiths = data.get("data", {}).get("hadiths", [])
-            for hadith in hadiths:
-                hadith_num = hadith.get("number")
-                if hadith_num:
-                    cache_key = f"hadith_single:{collection_id}:{hadith_num}"
-                    await cache.set(cache_key, hadith, ttl=31536000)
-                    cached_count += 1
+            if collected is not None:
+                collected.extend(hadiths)
+            singles = {
+                f"hadith_single:{collection_id}:{hadith['number']}": hadith
+                for hadith in hadiths
+                if hadith.get("number")
+            }
+            await cache.set_many(singles, ttl=31536000)
+            cached_count += len(singles)
             
             return cached_count
         else:
@@ -113,6 +119,7 @@ async def cache_hadith_collection(
     
     total_cached = 0
     processed = 0
+    fetched_hadiths: list = []
     
     # Process batches in parallel with concurrency limit
     for i in range(0, len(batches), max_concurrent_batches):
@@ -121,7 +128,7 @@ async def cache_hadith_collection(
         # Create tasks for parallel execution
         tasks = [
             fetch_and_cache_batch(
-                cache, client, collection_id, start, end, BASE_URL
+                cache, client, collection_id, start, end, BASE_URL, fetched_hadiths
             )
             for start, end in batch_group
         ]
@@ -146,6 +153,10 @@ async def cache_hadith_collection(
         await asyncio.sleep(0.2)
     
     logger.info(f"✅ {name}: {total_cached:,} entries cached successfully")
+    
+    # Build and persist the collection's search index from what was fetched
+    await get_cached_content_service().build_hadith_index(collection_id, fetched_hadiths)
+    
     return total_cached
 
 
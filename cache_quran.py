@@ -17,6 +17,7 @@ import httpx
 from loguru import logger
 
 from src.services.cache_service import get_cache_service
+from src.services.cached_content_service import get_cached_content_service
 
 
 async def cache_all_quran(cache, editions: list = None, minimal: bool = False):
@@ -152,6 +153,11 @@ async def main():
     
     total_cached = await cache_all_quran(cache, editions, args.minimal)
     
+    # Build and persist the search index for each cached edition
+    content_service = get_cached_content_service()
+    for edition in editions:
+        await content_service.build_quran_index(edition)
+    
     elapsed_time = asyncio.get_event_loop().time() - start_time
     final_stats = cache.get_stats()
     
@@ -18,16 +18,13 @@ from src.services.fiqh_rag_service import FiqhRAG
 from src.services.multi_madhab_scraper import load_predefined_content, to_ingestion_stream
 
 
-def ingest_documents(rag: FiqhRAG, documents: Iterable[Dict[str, Any]]) -> int:
-    added = 0
-    for doc in documents:
-        try:
-            ok = rag.add_document(text=doc["text"], metadata=doc["metadata"])
-            if ok:
-                added += 1
-        except Exception as exc:
-            logger.error(f"Failed to add doc: {exc}")
-    return added
+def ingest_documents(
+    rag: FiqhRAG, documents: Iterable[Dict[str, Any]], batch_size: int = 64
+) -> int:
+    report = rag.add_documents(documents, batch_size=batch_size)
+    if report["failed"]:
+        logger.error(f"Failed to add {report['failed']} docs")
+    return report["added"]
 
 
 def main() -> None:
@@ -408,17 +408,16 @@ def _normalize_external_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
     return {"text": text, "metadata": metadata}
 
 
-async def ingest_documents(rag: MalikiFiqhRAG, documents: Iterable[Dict[str, Any]]) -> int:
-    added = 0
-    for doc in documents:
-        normalized = _normalize_external_doc(doc)
-        if not normalized["text"]:
-            continue
-        success = rag.add_document(text=normalized["text"], metadata=normalized["metadata"])
-        if success:
-            added += 1
-            logger.info(f"✅ Added external doc: {normalized['metadata']['topic']}")
-    return added
+async def ingest_documents(
+    rag: MalikiFiqhRAG, documents: Iterable[Dict[str, Any]], batch_size: int = 128
+) -> int:
+    normalized = (_normalize_external_doc(doc) for doc in documents)
+    report = rag.add_documents(normalized, batch_size=batch_size)
+    print(
+        f"   • {report['added']} added, {report['failed']} failed in {report['seconds']}s "
+        f"({report['docs_per_second']} docs/s)"
+    )
+    return report["added"]
 
 
 async def main():
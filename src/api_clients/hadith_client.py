@@ -7,13 +7,27 @@ This client interfaces with multiple Hadith APIs including:
 - hadith.p.rapidapi.com (free tier)
 """
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from ..config import settings
 from .base_client import BaseAPIClient
 
+if TYPE_CHECKING:
+    from ..services.cache_service import cached
+else:
+    # Lazy import to avoid circular dependency
+    def _get_cached():
+        from ..services.cache_service import cached
+
+        return cached
+
+    def cached(*args, **kwargs):
+        """Lazy-loaded cached decorator."""
+        actual_cached = _get_cached()
+        return actual_cached(*args, **kwargs)
+
 
 class HadithAPIClient(BaseAPIClient):
     """Client for accessing Hadith collections from various sources."""
@@ -32,6 +46,14 @@ class HadithAPIClient(BaseAPIClient):
         if settings.sunnah_api_key:
             self.sunnah_headers["X-API-Key"] = settings.sunnah_api_key
 
+    # 30 days - collection list rarely changes; an empty list is a failed fetch
+    @cached(
+        prefix="hadith_collections",
+        ttl=2592000,
+        stale_ttl=604800,
+        negative_ttl=60,
+        negative_if=lambda collections: not collections,
+    )
     async def get_collections(self) -> list[dict[str, Any]]:
         """
         Get all available Hadith collections.
@@ -53,6 +75,7 @@ class HadithAPIClient(BaseAPIClient):
             logger.error(f"Failed to get Hadith collections: {e}")
             return []
 
+    @cached(prefix="hadith_collection", ttl=2592000, stale_ttl=604800, negative_ttl=60)
     async def get_collection_by_name(self, collection_name: str) -> dict[str, Any] | None:
         """
         Get a specific Hadith collection by name.
@@ -78,6 +101,13 @@ class HadithAPIClient(BaseAPIClient):
             logger.error(f"Failed to get collection '{collection_name}': {e}")
             return None
 
+    @cached(
+        prefix="hadith_books",
+        ttl=2592000,
+        stale_ttl=604800,
+        negative_ttl=60,
+        negative_if=lambda books: not books,
+    )
     async def get_books_from_collection(self, collection_name: str) -> list[dict[str, Any]]:
         """
         Get all books from a specific Hadith collection.
@@ -140,6 +170,8 @@ class HadithAPIClient(BaseAPIClient):
             logger.error(f"Failed to get Hadiths from '{collection_name}' book {book_number}: {e}")
             return {"data": [], "total": 0, "limit": limit, "page": page}
 
+    # 365 days - static content
+    @cached(prefix="hadith_number", ttl=31536000, stale_ttl=2592000, negative_ttl=60)
     async def get_hadith_by_number(
         self,
         collection_name: str,
@@ -45,7 +45,7 @@ class PrayerTimesAPIClient(BaseAPIClient):
         """Initialize the Prayer Times API client."""
         super().__init__(base_url=self.ALADHAN_API_BASE)
 
-    @cached(prefix="prayer_times", ttl=86400)  # 24 hours
+    @cached(prefix="prayer_times", ttl=86400, stale_ttl=3600, negative_ttl=30)  # 24 hours
     async def get_timings(
         self,
         latitude: float,
@@ -101,7 +101,7 @@ class PrayerTimesAPIClient(BaseAPIClient):
             logger.error(f"Failed to get prayer timings: {e}")
             return None
 
-    @cached(prefix="prayer_times_city", ttl=86400)  # 24 hours
+    @cached(prefix="prayer_times_city", ttl=86400, stale_ttl=3600, negative_ttl=30)  # 24 hours
     async def get_timings_by_city(
         self,
         city: str,
@@ -400,7 +400,8 @@ class PrayerTimesAPIClient(BaseAPIClient):
             logger.error(f"Failed to convert Hijri {day}-{month}-{year} to Gregorian: {e}")
             return None
 
-    @cached(prefix="qibla_direction", ttl=31536000)  # 365 days - never changes for location
+    # 365 days - never changes for location
+    @cached(prefix="qibla_direction", ttl=31536000, negative_ttl=60)
     async def get_qibla_direction(
         self,
         latitude: float,
@@ -458,7 +459,14 @@ class PrayerTimesAPIClient(BaseAPIClient):
             logger.error(f"Failed to get Qibla direction: {e}")
             return None
 
-    @cached(prefix="asma_al_husna", ttl=31536000)  # 365 days - static content
+    # 365 days - static content; an empty list is a failed fetch
+    @cached(
+        prefix="asma_al_husna",
+        ttl=31536000,
+        stale_ttl=2592000,
+        negative_ttl=60,
+        negative_if=lambda names: not names,
+    )
     async def get_asma_al_husna(self) -> list[dict[str, Any]]:
         """
         Get the 99 Names of Allah (Asma Al-Husna).
@@ -52,7 +52,8 @@ class QuranComAPIClient(BaseAPIClient):
     def __init__(self) -> None:
         super().__init__(base_url=self.QURAN_COM_BASE)
 
-    @cached(prefix="quran_full", ttl=31536000)  # 365 days - static content
+    # 365 days - static content
+    @cached(prefix="quran_full", ttl=31536000, stale_ttl=2592000, negative_ttl=60)
     async def get_full_quran(
         self,
         edition: str = "quran-uthmani",
@@ -84,7 +85,8 @@ class QuranComAPIClient(BaseAPIClient):
             logger.error(f"Failed to get full Quran (edition={edition}): {e}")
             return None
 
-    @cached(prefix="quran_surah", ttl=31536000)  # 365 days - static content
+    # 365 days - static content
+    @cached(prefix="quran_surah", ttl=31536000, stale_ttl=2592000, negative_ttl=60)
     async def get_surah(
         self,
         surah_number: int,
@@ -131,7 +133,8 @@ class QuranComAPIClient(BaseAPIClient):
             logger.error(f"Failed to get Surah {surah_number}: {e}")
             return None
 
-    @cached(prefix="quran_ayah", ttl=31536000)  # 365 days - static content
+    # 365 days - static content
+    @cached(prefix="quran_ayah", ttl=31536000, stale_ttl=2592000, negative_ttl=60)
     async def get_ayah(
         self,
         ayah_reference: str,
@@ -261,7 +264,14 @@ class QuranComAPIClient(BaseAPIClient):
             logger.error(f"Failed to get page {page_number}: {e}")
             return None
 
-    @cached(prefix="quran_editions", ttl=31536000)  # 365 days - static content
+    # 365 days - static content
+    @cached(
+        prefix="quran_editions",
+        ttl=31536000,
+        stale_ttl=2592000,
+        negative_ttl=60,
+        negative_if=lambda editions: not editions,
+    )
     async def get_editions(
         self,
         format_type: str | None = None,
@@ -298,7 +308,14 @@ class QuranComAPIClient(BaseAPIClient):
             logger.error(f"Failed to get editions: {e}")
             return []
 
-    @cached(prefix="quran_search", ttl=2592000)  # 30 days - search results
+    # 30 days - search results
+    @cached(
+        prefix="quran_search",
+        ttl=2592000,
+        stale_ttl=86400,
+        negative_ttl=60,
+        negative_if=lambda result: not (result or {}).get("matches"),
+    )
     async def search_quran(
         self,
         query: str,
@@ -45,6 +45,14 @@ class Settings(BaseSettings):
         default="gemini-2.0-flash-exp",
         description="Gemini model to use",
     )
+    gemini_max_concurrency: int = Field(
+        default=4,
+        description="Concurrent Gemini SDK calls; further calls queue for a worker",
+    )
+    gemini_request_timeout: float = Field(
+        default=90.0,
+        description="Deadline in seconds for a Gemini call or stream, including queue time",
+    )
 
     # Ollama Configuration
     ollama_model: str = Field(
@@ -55,6 +63,78 @@ class Settings(BaseSettings):
         default="http://localhost:11434",
         description="Ollama server URL",
     )
+    ollama_max_concurrency: int = Field(
+        default=2,
+        description="Concurrent Ollama generations; further requests wait for a slot",
+    )
+    ollama_timeout: float = Field(
+        default=300.0,
+        description="Timeout in seconds for a single Ollama generation",
+    )
+
+    # LLM provider HTTP clients
+    llm_http_timeout: float = Field(
+        default=60.0,
+        description="Read/write timeout in seconds for LLM provider HTTP calls",
+    )
+    llm_http_connect_timeout: float = Field(
+        default=10.0,
+        description="Connect timeout in seconds for LLM provider HTTP calls",
+    )
+    llm_http_max_connections: int = Field(
+        default=20,
+        description="Maximum open connections per LLM provider",
+    )
+    llm_http_max_keepalive: int = Field(
+        default=10,
+        description="Idle keep-alive connections kept per LLM provider",
+    )
+    llm_http2: bool = Field(
+        default=True,
+        description="Use HTTP/2 for HTTPS providers when the h2 package is installed",
+    )
+    llm_catalog_ttl: int = Field(
+        default=21600,
+        description="Seconds a provider's model list is served before it is refreshed",
+    )
+    llm_catalog_stale_ttl: int = Field(
+        default=604800,
+        description="Extra seconds a stale model list is served while refreshing in the background",
+    )
+
+    # LLM routing (hedging / failover)
+    llm_fallback_routes: list[dict[str, str]] = Field(
+        default_factory=list,
+        description="Backup routes ({provider, model, api_key}) tried after the requested provider",
+    )
+    llm_route_timeout: float = Field(
+        default=120.0,
+        description="Overall deadline in seconds for a routed generation, including failovers",
+    )
+    llm_hedge_percentile: float = Field(
+        default=95.0,
+        description="Latency percentile of a provider after which the request is hedged",
+    )
+    llm_hedge_min_delay: float = Field(
+        default=1.0,
+        description="Shortest wait in seconds before hedging to the next route",
+    )
+    llm_hedge_default_delay: float = Field(
+        default=15.0,
+        description="Hedge delay in seconds for providers without enough latency samples",
+    )
+    llm_health_window: int = Field(
+        default=50,
+        description="Recent calls per provider used to compute its error rate",
+    )
+    llm_health_min_samples: int = Field(
+        default=5,
+        description="Calls needed before a provider's latency or error rate is trusted",
+    )
+    llm_unhealthy_error_rate: float = Field(
+        default=0.5,
+        description="Recent error rate at which a provider is moved behind healthy ones",
+    )
 
     # External API Keys / Toggles
     sunnah_api_key: str | None = Field(
@@ -97,12 +177,130 @@ class Settings(BaseSettings):
         default=None,
         description="Qdrant server URL (e.g., http://localhost:6333). If not set, uses embedded local DB.",
     )
+    qdrant_path: str = Field(
+        default="./qdrant_db",
+        description="Path of the embedded Qdrant database (used when qdrant_url is not set)",
+    )
+
+    # Embeddings / RAG
+    embedding_model_name: str = Field(
+        default="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+        description="Sentence-Transformers model shared by all RAG services",
+    )
+    rag_warmup_on_startup: bool = Field(
+        default=True,
+        description="Load the embedding model and Qdrant collections during startup",
+    )
+    embedding_cache_size: int = Field(
+        default=2048,
+        description="Number of query embeddings kept in the in-process LRU",
+    )
+    embedding_cache_use_redis: bool = Field(
+        default=False,
+        description="Also store query embeddings (float16) in Redis for cross-worker reuse",
+    )
+    embedding_cache_ttl: int = Field(
+        default=604800,
+        description="Redis TTL for cached query embeddings in seconds",
+    )
+    semantic_cache_enabled: bool = Field(
+        default=True,
+        description="Serve /ask answers cached for semantically similar questions",
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.92,
+        description="Minimum cosine similarity for a semantic answer cache hit",
+    )
+    semantic_cache_ttl: int = Field(
+        default=86400,
+        description="Seconds a semantically cached answer stays servable",
+    )
+    semantic_cache_collection: str = Field(
+        default="answer_cache",
+        description="Qdrant collection holding cached answers and question embeddings",
+    )
+    semantic_cache_sweep_interval: int = Field(
+        default=3600,
+        description="Minimum seconds between deletions of expired semantic cache answers",
+    )
+    madhab_classifier_enabled: bool = Field(
+        default=True,
+        description="Answer multi-madhab classification locally when confident, before asking the LLM",
+    )
+    madhab_classifier_path: str = Field(
+        default="./madhab_classifier.json",
+        description="File holding the local multi-madhab classifier learned from LLM decisions",
+    )
+    madhab_classifier_min_margin: float = Field(
+        default=0.05,
+        description="Similarity gap between class centroids required for a local decision",
+    )
+    madhab_classifier_min_examples: int = Field(
+        default=20,
+        description="LLM decisions per class required before the local classifier answers",
+    )
+    madhab_classifier_flush_every: int = Field(
+        default=20,
+        description="Recorded LLM decisions buffered before they are merged into the classifier file",
+    )
+    madhab_classifier_flush_interval: float = Field(
+        default=60.0,
+        description="Seconds after which buffered classifier decisions are merged into the file",
+    )
+
+    # Orchestration
+    retrieval_timeouts: dict[str, float] = Field(
+        default_factory=lambda: {"fiqh": 10.0, "quran_hadith": 5.0, "web": 30.0},
+        description="Per-source timeouts (seconds) of the concurrent AS-mode retrieval stage",
+    )
+
+    # Prompt budgeting
+    prompt_context_budget: int = Field(
+        default=6000,
+        description="Estimated tokens of retrieved context packed into an answer prompt",
+    )
+    prompt_context_budget_by_provider: dict[str, int] = Field(
+        default_factory=lambda: {"ollama": 3000, "groq": 4000},
+        description="Per-provider override of prompt_context_budget",
+    )
+    prompt_dedup_threshold: float = Field(
+        default=0.8,
+        description="Word-shingle overlap at which a context piece is dropped as a duplicate",
+    )
+    web_context_budget: int = Field(
+        default=4000,
+        description="Estimated tokens of scraped web pages kept per web enrichment call",
+    )
 
     # Web Search / Firecrawl
     firecrawl_api_key: str | None = Field(
         default=None,
         description="Firecrawl API key for web scraping (optional)",
     )
+    web_search_max_concurrency: int = Field(
+        default=8,
+        description="Concurrent Firecrawl requests (also the HTTP connection pool size)",
+    )
+    web_search_per_host_limit: int = Field(
+        default=2,
+        description="Concurrent scrapes of the same target host",
+    )
+    web_search_request_timeout: float = Field(
+        default=30.0,
+        description="Timeout in seconds of a single Firecrawl request",
+    )
+    web_search_deadline: float = Field(
+        default=20.0,
+        description="Seconds scrape_urls waits for pages before cancelling the remaining scrapes",
+    )
+    web_page_cache_ttl: int = Field(
+        default=604800,
+        description="Seconds a scraped page is served from cache before it is revalidated",
+    )
+    web_search_cache_ttl: int = Field(
+        default=86400,
+        description="Seconds Firecrawl search results (query -> URLs) are cached",
+    )
 
     # Logging Configuration
     log_level: str = Field(default="INFO", description="Logging level")
@@ -115,6 +313,70 @@ class Settings(BaseSettings):
         default=3600,
         description="Cache time-to-live in seconds",
     )
+    cache_memory_maxsize: int = Field(
+        default=1000,
+        description="Entries kept in the in-process cache tier",
+    )
+    cache_memory_ttl: int = Field(
+        default=3600,
+        description="Longest time (seconds) a Redis-backed entry stays in the in-process tier",
+    )
+    cache_memory_ttl_by_prefix: dict[str, int] = Field(
+        default_factory=lambda: {
+            "quran_surah": 86400,
+            "quran_ayah": 86400,
+            "asma_al_husna": 86400,
+            "prayer_times": 3600,
+            "prayer_times_city": 3600,
+            "quran_index": 0,
+            "hadith_index": 0,
+        },
+        description="Per key-prefix override of cache_memory_ttl (0 keeps the prefix out of memory)",
+    )
+    cache_distributed_lock: bool = Field(
+        default=False,
+        description="Coalesce @cached misses across workers with a Redis lock",
+    )
+    cache_lock_timeout: float = Field(
+        default=30.0,
+        description="Seconds before a @cached Redis lock expires if its holder dies",
+    )
+    cache_lock_wait: float = Field(
+        default=10.0,
+        description="Seconds a worker waits for another worker's @cached result before computing it",
+    )
+    cache_codec: str = Field(
+        default="orjson",
+        description="Serialization for Redis cache entries: orjson, msgpack or pickle",
+    )
+    cache_compress_min_bytes: int = Field(
+        default=65536,
+        description="Compress cache entries at least this large (zstd if installed); 0 disables",
+    )
+    cache_compress_zlib: bool = Field(
+        default=False,
+        description="Compress with zlib when zstandard is not installed (slower than sending the bytes)",
+    )
+    cache_codec_strict: bool = Field(
+        default=False,
+        description="Deep-check every cached value for exact round-trips (slow; development and tests)",
+    )
+    cache_allow_pickle: bool = Field(
+        default=False,
+        description="Allow pickle for values the codec cannot encode exactly (unsafe with shared Redis)",
+    )
+    cache_pickle_migration: bool = Field(
+        default=False,
+        description="Temporary: read legacy header-less pickle entries while migrating old caches",
+    )
+    search_index_on_startup: bool = Field(
+        default=True,
+        description="Load or build the cached Quran/Hadith search indexes in the background at startup",
+    )
+    search_index_refresh_interval: int = Field(
+        default=300,
+        description="Seconds between checks for a newer persisted search index (and rebuild retries)",
+    )
 
     # Security Configuration
     allowed_origins: str = Field(
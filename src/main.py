@@ -5,6 +5,7 @@ Main FastAPI application specialized in Maliki jurisprudence with
 RAG-enhanced responses using Google Gemini and Qdrant vector database.
 """
 
+import asyncio
 import uuid
 from contextlib import asynccontextmanager
 from typing import Any
@@ -21,6 +22,7 @@ from .middleware.rate_limiting import limiter, rate_limit_exceeded_handler
 from .routers import (
     ai_router,
     hadith_router,
+    metrics_router,
     prayer_times_router,
     quran_router,
     settings_router,
@@ -55,14 +57,55 @@ async def lifespan(app: FastAPI):
     cache = get_cache_service()
     await cache.connect_redis()
 
+    # Load the shared embedding model / Qdrant collections once for all requests
+    from .services.rag_registry import get_rag_registry
+
+    rag_registry = get_rag_registry()
+    if settings.rag_warmup_on_startup:
+        await asyncio.to_thread(rag_registry.warm_up)
+
+    # Load (or build) the cached Quran/Hadith search indexes without delaying startup
+    index_task: asyncio.Task | None = None
+    if settings.search_index_on_startup:
+        from .services.cached_content_service import get_cached_content_service
+
+        index_task = asyncio.create_task(get_cached_content_service().warm_search_indexes())
+
     yield
 
     # Shutdown
     logger.info("Shutting down Al-Muwatta")
 
+    if index_task is not None and not index_task.done():
+        index_task.cancel()
+
     # Disconnect cache service
     await cache.disconnect_redis()
 
+    # Release shared Qdrant client
+    rag_registry.close()
+
+    # Close the pooled Firecrawl client
+    from .services.web_search_service import get_web_search_service
+
+    await get_web_search_service().close()
+
+    # Close the pooled LLM provider clients
+    from .services.provider_clients import get_provider_client_pool
+
+    await get_provider_client_pool().aclose()
+
+    # Drop queued Gemini SDK calls
+    from .services.gemini_executor import get_gemini_executor
+
+    get_gemini_executor().shutdown()
+
+    # Persist buffered multi-madhab classifier examples
+    if settings.madhab_classifier_enabled:
+        from .services.madhab_classifier import get_madhab_classifier
+
+        get_madhab_classifier().flush()
+
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -226,6 +269,7 @@ app.include_router(prayer_times_router)
 app.include_router(ai_router)
 app.include_router(upload_router)
 app.include_router(settings_router)
+app.include_router(metrics_router)
 
 
 # Root endpoint
@@ -279,6 +323,14 @@ async def health_check() -> dict[str, Any]:
         health_status["cache"] = {"status": "unhealthy", "error": str(e)}
         health_status["status"] = "degraded"
 
+    # Check shared RAG registry (embedding model + Qdrant)
+    from .services.rag_registry import get_rag_registry
+
+    rag_status = get_rag_registry().status()
+    health_status["rag"] = rag_status
+    if not rag_status["ready"]:
+        health_status["status"] = "degraded"
+
     # Check external APIs (quick ping test)
     try:
         import httpx
@@ -296,6 +348,24 @@ async def health_check() -> dict[str, Any]:
     return health_status
 
 
+# Readiness probe
+@app.get("/ready", tags=["Health"])
+async def readiness_check() -> JSONResponse:
+    """
+    Readiness probe for load balancers and orchestrators.
+
+    Returns:
+        200 once the shared embedding model and collections are loaded, 503 otherwise
+    """
+    from .services.rag_registry import get_rag_registry
+
+    rag_status = get_rag_registry().status()
+    return JSONResponse(
+        status_code=200 if rag_status["ready"] else 503,
+        content={"status": "ready" if rag_status["ready"] else "starting", "rag": rag_status},
+    )
+
+
 # API info endpoint
 @app.get("/api/v1/info", tags=["Info"])
 async def api_info() -> dict[str, Any]:
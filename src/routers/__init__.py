@@ -2,6 +2,7 @@
 
 from .ai_router import router as ai_router
 from .hadith_router import router as hadith_router
+from .metrics_router import router as metrics_router
 from .prayer_times_router import router as prayer_times_router
 from .quran_router import router as quran_router
 from .settings_router import router as settings_router
@@ -14,4 +15,5 @@ __all__ = [
     "ai_router",
     "upload_router",
     "settings_router",
+    "metrics_router",
 ]
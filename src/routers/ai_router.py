@@ -5,6 +5,7 @@ This router provides intelligent AI features using Google Gemini for
 Islamic knowledge, questions, explanations, and content generation.
 """
 
+import asyncio
 import json
 
 from fastapi import APIRouter, Body, HTTPException, Query
@@ -20,7 +21,15 @@ from ..models.schemas import (
 )
 from ..services import GeminiService, MultiLLMService
 from ..services.cache_service import get_cache_service
+from ..services.embedding_cache import normalize_query
+from ..services.llm_router import get_llm_router
 from ..services.orchestrator_service import get_orchestrator_service
+from ..services.semantic_cache import get_semantic_cache
+from ..utils.prompt_budget import (
+    ContextAssembler,
+    prompt_token_report,
+    split_markdown_sections,
+)
 
 # Optional DSPy import - only needed for /ask-dspy endpoint
 try:
@@ -35,6 +44,25 @@ from ..utils.question_classifier import is_fiqh_question
 router = APIRouter(prefix="/api/v1/ai", tags=["AI Assistant"])
 
 
+def _cached_answer(response: dict, stream: bool) -> AIResponse | StreamingResponse:
+    """Serve a cached answer in the shape the client asked for."""
+    if not stream:
+        return AIResponse(**response)
+
+    async def replay():
+        yield response.get("content", "")
+
+    return StreamingResponse(
+        replay(),
+        media_type="text/plain; charset=utf-8",
+        headers={
+            "X-RAG-Chunks": json.dumps(
+                (response.get("metadata") or {}).get("rag_chunks", [])
+            )[:4000],
+        },
+    )
+
+
 @router.post("/ask", summary="Ask Islamic questions")
 async def ask_islamic_question(request: IslamicQuestionRequest) -> AIResponse:
     """
@@ -53,37 +81,15 @@ async def ask_islamic_question(request: IslamicQuestionRequest) -> AIResponse:
         logger.info(f"AI request using provider={provider}, model={model or 'default'}")
 
         cache = get_cache_service()
-        orchestrator = get_orchestrator_service()
 
-        is_fiqh, category = is_fiqh_question(request.question)
-        
-        # Use orchestrator to determine if multi-madhab is needed
-        should_multi_madhab, reason = await orchestrator.should_use_multi_madhab(request.question)
-        
-        # Determine target madhabs: only use multi-madhab if orchestrator says so AND user selected madhabs
-        target_madhabs = None
-        if should_multi_madhab and request.madhabs:
-            target_madhabs = request.madhabs
-        elif should_multi_madhab and not request.madhabs:
-            # Default to all four if fiqh question but no specific madhabs selected
-            target_madhabs = ["maliki", "hanafi", "shafii", "hanbali"]
-        elif not should_multi_madhab:
-            # Not a fiqh question or doesn't need multi-madhab - use single response
-            target_madhabs = None
-        
-        logger.info(
-            f"Question classification: is_fiqh={is_fiqh}, should_multi_madhab={should_multi_madhab}, "
-            f"reason={reason}, target_madhabs={target_madhabs}"
-        )
-        
-        # Build cache key (question + prefs)
+        # Build cache key from request fields only, so hits skip classification
         cache_key = cache._generate_cache_key(
             "ai:answer",
-            request.question,
+            normalize_query(request.question),
             language=request.language,
             provider=provider,
             model=model,
-            madhabs=tuple(request.madhabs or []),
+            madhabs=tuple(sorted(request.madhabs or [])),
             as_mode=request.as_mode,
             healing=request.quran_healing_mode,
             web=request.web_search_enabled,
@@ -93,154 +99,190 @@ async def ask_islamic_question(request: IslamicQuestionRequest) -> AIResponse:
         # Serve from cache if exists
         cached = await cache.get(cache_key)
         if cached:
-            return AIResponse(**cached)
+            return _cached_answer(cached, request.stream)
 
-        if request.stream:
-            if provider != "gemini":
-                raise HTTPException(
-                    status_code=400, detail="Streaming only supported with Gemini provider"
+        # Then look for an answer to a semantically similar question in the same scope
+        semantic_cache = get_semantic_cache() if settings.semantic_cache_enabled else None
+        semantic_scope = None
+        if semantic_cache is not None:
+            semantic_scope = semantic_cache.scope_key(
+                language=request.language,
+                provider=provider,
+                model=model,
+                madhabs=request.madhabs or [],
+                as_mode=request.as_mode,
+                healing=request.quran_healing_mode,
+                web=request.web_search_enabled,
+                web_attempts=request.web_search_attempts,
+            )
+            hit = await asyncio.to_thread(semantic_cache.lookup, request.question, semantic_scope)
+            if hit:
+                response = hit["response"]
+                response["metadata"] = {
+                    **(response.get("metadata") or {}),
+                    "semantic_cache": {
+                        "similarity": hit["similarity"],
+                        "matched_question": hit["matched_question"],
+                    },
+                }
+                # Not copied into the exact cache: a near-miss must not outlive its own TTL
+                return _cached_answer(response, request.stream)
+
+        async def remember(ai_response: AIResponse, cacheable: bool = True) -> AIResponse:
+            """Store the final answer in the exact and semantic answer caches."""
+            if not cacheable:
+                return ai_response
+            payload = ai_response.model_dump()
+            await cache.set(cache_key, payload)
+            if semantic_cache is not None:
+                await asyncio.to_thread(
+                    semantic_cache.store, request.question, semantic_scope, payload
                 )
-            if not is_fiqh:
-                raise HTTPException(status_code=400, detail="Streaming restricted to fiqh queries")
+            return ai_response
+
+        # Classify only on a cache miss (itself cached per normalized question)
+        orchestrator = get_orchestrator_service()
+        classification = await orchestrator.classify_question(request.question)
+        is_fiqh = classification["is_fiqh"]
+        category = classification["category"]
+        should_multi_madhab = classification["multi_madhab"]
+        reason = classification["reason"]
+
+        # Determine target madhabs: only use multi-madhab if orchestrator says so AND user selected madhabs
+        target_madhabs = None
+        if should_multi_madhab and request.madhabs:
+            target_madhabs = request.madhabs
+        elif should_multi_madhab and not request.madhabs:
+            # Default to all four if fiqh question but no specific madhabs selected
+            target_madhabs = ["maliki", "hanafi", "shafii", "hanbali"]
+
+        logger.info(
+            f"Question classification: is_fiqh={is_fiqh}, should_multi_madhab={should_multi_madhab}, "
+            f"reason={reason}, target_madhabs={target_madhabs}"
+        )
+
+        if request.stream:
             try:
-                # Lazy init Gemini only when needed
-                gemini = GeminiService()
-                stream_payload = await gemini.stream_fiqh_answer(
-                    request.question,
-                    language=request.language,
-                    madhabs=target_madhabs,
-                )
-            except Exception as exc:  # pragma: no cover - runtime safeguard
+                if provider == "gemini" and is_fiqh:
+                    # Lazy init Gemini only when needed
+                    gemini = GeminiService()
+                    stream_payload = await gemini.stream_fiqh_answer(
+                        request.question,
+                        language=request.language,
+                        madhabs=target_madhabs,
+                    )
+                    chunks = stream_payload["stream"]
+                    rag_chunks = stream_payload["rag_chunks"]
+                    structured_sources = []
+                    prompt_tokens = None
+                else:
+                    context = await _build_provider_context(
+                        request, orchestrator, is_fiqh, category, target_madhabs, provider, model
+                    )
+                    service = MultiLLMService(
+                        provider=provider,
+                        api_key=request.api_key
+                        or (settings.gemini_api_key if provider == "gemini" else None),
+                    )
+                    chunks = service.stream(
+                        prompt=context["prompt"],
+                        model=model or "",
+                        temperature=0.6,
+                        max_tokens=1500,
+                    )
+                    rag_chunks = context["rag_chunks"]
+                    structured_sources = context["sources"]
+                    prompt_tokens = context["prompt_tokens"]
+                # Wait for the first token so provider failures still map to an HTTP error
+                first_chunk = await anext(chunks, None)
+            except HTTPException:
+                raise
+            except Exception as exc:
                 logger.error(f"Streaming setup failed: {exc}")
                 raise HTTPException(status_code=500, detail="Failed to stream answer") from exc
+            if first_chunk is None:
+                raise HTTPException(status_code=503, detail="No response from selected model")
+
+            async def relay():
+                parts = [first_chunk]
+                try:
+                    yield first_chunk
+                    async for chunk in chunks:
+                        parts.append(chunk)
+                        yield chunk
+                finally:
+                    # Stop the provider stream promptly if the client disconnected
+                    await chunks.aclose()
+                # Only complete answers are cached; a client disconnect cancels before this
+                await remember(
+                    AIResponse(
+                        content="".join(parts),
+                        language=request.language,
+                        model=model
+                        or (settings.gemini_model if provider == "gemini" else provider),
+                        metadata={
+                            "question": request.question,
+                            "provider": provider,
+                            "model": model,
+                            "include_sources": request.include_sources,
+                            "sources": structured_sources,
+                            "rag_chunks": rag_chunks,
+                            "streamed": True,
+                            **({"prompt_tokens": prompt_tokens} if prompt_tokens else {}),
+                        },
+                    )
+                )
 
             return StreamingResponse(
-                stream_payload["stream"],
+                relay(),
                 media_type="text/plain; charset=utf-8",
                 headers={
-                    "X-RAG-Chunks": json.dumps(stream_payload["rag_chunks"])[:4000],
+                    "X-RAG-Chunks": json.dumps(rag_chunks)[:4000],
                 },
             )
 
         # If user selected a non-Gemini provider, answer with that provider directly
         if provider != "gemini":
-            # Build retrieval context without using Gemini generation
             try:
-                from ..services.fiqh_rag_service import get_fiqh_rag
-                from ..services.cached_content_service import get_cached_content_service
-                from ..utils.question_classifier import get_response_instructions
-
-                rag = get_fiqh_rag()
-                cached_service = get_cached_content_service()
-
-                # RAG for fiqh
-                rag_chunks = []
-                rag_context = ""
-                if is_fiqh:
-                    rag_chunks = rag.search(
-                        request.question,
-                        n_results=5,
-                        madhabs=target_madhabs,
-                        score_threshold=0.25,
-                    )
-                    rag_context = rag.get_relevant_context(
-                        request.question, max_context_length=1500, madhabs=target_madhabs
-                    )
-
-                # Quran/Hadith (cache-only)
-                quran_results = await cached_service.search_quran_in_cache(
-                    request.question, edition="quran-uthmani", limit=3
+                context = await _build_provider_context(
+                    request, orchestrator, is_fiqh, category, target_madhabs, provider, model
                 )
-                hadith_results = await cached_service.search_hadith_in_cache(
-                    request.question, collections=["bukhari", "muslim", "malik"], limit=3
-                )
-
-                def _format_quran(qrs: list[dict]) -> str:
-                    out = []
-                    for v in qrs or []:
-                        name = v.get("surah_name", "")
-                        ay = v.get("ayah_number", "")
-                        text = v.get("text", "")
-                        if text:
-                            out.append(f"[Quran {name} {ay}]\n{text}")
-                    return "\n\n".join(out)
-
-                def _format_hadith(hds: list[dict]) -> str:
-                    out = []
-                    for h in hds or []:
-                        coll = (h.get("collection") or "").title()
-                        num = h.get("number", "")
-                        arab = h.get("arab", "")
-                        txt = h.get("text", "")
-                        if arab or txt:
-                            out.append(f"[Hadith {coll} #{num}]\n{arab}\n{txt}")
-                    return "\n\n".join(out)
-
-                quran_context = _format_quran(quran_results)
-                hadith_context = _format_hadith(hadith_results)
-
-                # Optional web context (per user setting)
-                web_context = ""
-                if request.web_search_enabled:
-                    attempts = min(3, max(1, request.web_search_attempts or 2))
-                    if target_madhabs:
-                        web_context = await orchestrator.perform_web_search_by_madhab(
-                            request.question, target_madhabs, attempts=attempts
-                        )
-                    else:
-                        web_context = await orchestrator.perform_web_search(
-                            request.question, attempts=attempts
-                        )
-
-                # Build prompt for selected provider
-                scholar_role = get_response_instructions(is_fiqh, category, request.language)
-                sources_text = "\n\n".join(
-                    [s for s in [quran_context, hadith_context, rag_context, web_context] if s]
-                )
-                school_instruction = (
-                    f"Present rulings per selected madhabs: {', '.join(target_madhabs)}"
-                    if (is_fiqh and target_madhabs)
-                    else "Provide direct answer"
-                )
-
-                prompt = (
-                    f"{scholar_role}\n\n"
-                    f"Use the verified context below. Do NOT alter Quran/Hadith texts.\n\n"
-                    f"{sources_text}\n\n"
-                    f"Question: {request.question}\n\n"
-                    f"Answer in {request.language} with: 1) {school_instruction}, 2) Evidence from Quran/Hadith when relevant, 3) Clear, respectful explanation."
-                )
-
-                service = MultiLLMService(provider=provider, api_key=request.api_key)
-                generated = await service.generate(
-                    prompt=prompt,
-                    model=model or "",
+                llm_router = get_llm_router()
+                routed = await llm_router.generate(
+                    prompt=context["prompt"],
+                    routes=llm_router.routes_for(provider, request.api_key, model),
                     temperature=0.6,
                     max_tokens=1500,
                 )
 
-                if not generated:
+                if not routed:
                     raise HTTPException(status_code=503, detail="No response from selected model")
 
-                structured_sources = [
-                    {"type": "quran", "content": quran_context},
-                    {"type": "hadith", "content": hadith_context},
-                    {"type": "fiqh", "content": rag_context},
-                    {"type": "web", "content": web_context},
-                ]
-
-                return AIResponse(
-                    content=generated,
-                    language=request.language,
-                    model=model or provider,
-                    metadata={
-                        "question": request.question,
-                        "provider": provider,
-                        "model": model,
-                        "include_sources": request.include_sources,
-                        "sources": structured_sources,
-                        "rag_chunks": rag_chunks if is_fiqh else [],
-                    },
+                metadata = {
+                    "question": request.question,
+                    "provider": provider,
+                    "model": model,
+                    "include_sources": request.include_sources,
+                    "sources": context["sources"],
+                    "rag_chunks": context["rag_chunks"],
+                    "prompt_tokens": context["prompt_tokens"],
+                }
+                # A failover answer must not be served later as the requested model's
+                failed_over = (routed["provider"], routed["model"]) != (provider, model or "")
+                if failed_over or routed["hedged"]:
+                    metadata["routing"] = {
+                        "served_by": routed["provider"],
+                        "served_model": routed["model"],
+                        "attempts": routed["attempts"],
+                    }
+                return await remember(
+                    AIResponse(
+                        content=routed["content"],
+                        language=request.language,
+                        model=routed["model"] or routed["provider"],
+                        metadata=metadata,
+                    ),
+                    cacheable=not failed_over,
                 )
             except HTTPException:
                 raise
@@ -248,6 +290,8 @@ async def ask_islamic_question(request: IslamicQuestionRequest) -> AIResponse:
                 logger.error(f"Non-Gemini flow failed: {exc}")
                 raise HTTPException(status_code=500, detail=str(exc))
 
+        retrieval_timings = None
+
         # Handle Quran Healing mode (Gemini only)
         if request.quran_healing_mode:
             # Lazy init Gemini only when healing mode is requested
@@ -263,31 +307,18 @@ async def ask_islamic_question(request: IslamicQuestionRequest) -> AIResponse:
                 healing_content=healing_content,
             )
         elif request.as_mode and is_fiqh:
-            # AS Mode: Search each madhab separately before answering
-            madhab_results = await orchestrator.search_madhabs_separately(
+            # AS Mode: fiqh per madhab, cached Quran/Hadith and web search, concurrently
+            gemini = GeminiService()
+            retrieval = await orchestrator.gather_context(
                 request.question,
                 madhabs=target_madhabs,
-                n_results_per_madhab=5,
+                web_search=request.web_search_enabled,
+                web_attempts=request.web_search_attempts,
             )
-            # Get Quran/Hadith from cache
-            cached_content = await orchestrator.get_quran_hadith_from_cache(
-                request.question,
-                limit=5,
-            )
-            web_context = ""
-            if request.web_search_enabled:
-                # Ensure at least two different queries; cap at 3 attempts
-                attempts = min(3, max(1, request.web_search_attempts or 2))
-                if target_madhabs and isinstance(target_madhabs, list) and len(target_madhabs) >= 1:
-                    web_context = await orchestrator.perform_web_search_by_madhab(
-                        request.question,
-                        target_madhabs,
-                        attempts=attempts,
-                    )
-                else:
-                    web_context = await orchestrator.perform_web_search(
-                        request.question, attempts=attempts
-                    )
+            retrieval_timings = retrieval["timings"]
+            madhab_results = retrieval["madhab_results"]
+            cached_content = retrieval["cached_content"]
+            web_context = retrieval["web_context"]
 
             result = await gemini.answer_with_orchestrated_context(
                 request.question,
@@ -363,11 +394,13 @@ async def ask_islamic_question(request: IslamicQuestionRequest) -> AIResponse:
                 "rag_chunks": rag_chunks,
             },
         )
+        if retrieval_timings:
+            ai_response.metadata["retrieval_timings_ms"] = retrieval_timings
+        if result.get("prompt_tokens"):
+            ai_response.metadata["prompt_tokens"] = result["prompt_tokens"]
 
         # Cache the final answer (avoid regeneration). Default TTL from settings.
-        await cache.set(cache_key, ai_response.model_dump())
-
-        return ai_response
+        return await remember(ai_response)
 
     except HTTPException:
         raise
@@ -376,6 +409,134 @@ async def ask_islamic_question(request: IslamicQuestionRequest) -> AIResponse:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _build_provider_context(
+    request: IslamicQuestionRequest,
+    orchestrator,
+    is_fiqh: bool,
+    category: str,
+    target_madhabs: list[str] | None,
+    provider: str,
+    model: str | None,
+) -> dict:
+    """
+    Retrieve sources and build the prompt for a non-Gemini-SDK answer.
+
+    Evidence is deduplicated and packed into the provider's context budget,
+    verified Quran/Hadith texts first, then fiqh chunks by relevance, then
+    web sections.
+
+    Args:
+        request: The /ask request
+        orchestrator: Orchestrator service (web search)
+        is_fiqh: Whether the question is fiqh
+        category: Question category from classification
+        target_madhabs: Madhabs to present, if any
+        provider: Provider the prompt is for (token budget and estimates)
+        model: Model the prompt is for
+
+    Returns:
+        Dictionary with prompt, structured sources, rag_chunks and prompt_tokens
+    """
+    from ..services.fiqh_rag_service import get_fiqh_rag
+    from ..services.cached_content_service import get_cached_content_service
+    from ..utils.question_classifier import get_response_instructions
+
+    rag = get_fiqh_rag()
+    cached_service = get_cached_content_service()
+    assembler = ContextAssembler(provider=provider, model=model)
+
+    # RAG for fiqh
+    rag_chunks = []
+    if is_fiqh:
+        retrieval = await asyncio.to_thread(
+            rag.retrieve,
+            request.question,
+            n_results=5,
+            madhabs=target_madhabs,
+            score_threshold=0.25,
+        )
+        rag_chunks = retrieval.chunks
+        for chunk, formatted in retrieval.formatted_chunks(min_score=0.3):
+            assembler.add("fiqh", formatted, score=chunk.get("score", 0.0))
+
+    # Quran/Hadith (cache-only)
+    quran_results = await cached_service.search_quran_in_cache(
+        request.question, edition="quran-uthmani", limit=3
+    )
+    hadith_results = await cached_service.search_hadith_in_cache(
+        request.question, collections=["bukhari", "muslim", "malik"], limit=3
+    )
+
+    for rank, v in enumerate(quran_results or []):
+        name = v.get("surah_name", "")
+        ay = v.get("ayah_number", "")
+        text = v.get("text", "")
+        if text:
+            assembler.add("quran", f"[Quran {name} {ay}]\n{text}", score=2.0 - rank * 0.01)
+
+    for rank, h in enumerate(hadith_results or []):
+        coll = (h.get("collection") or "").title()
+        num = h.get("number", "")
+        arab = h.get("arab", "")
+        txt = h.get("text", "")
+        if arab or txt:
+            assembler.add(
+                "hadith", f"[Hadith {coll} #{num}]\n{arab}\n{txt}", score=1.5 - rank * 0.01
+            )
+
+    # Optional web context (per user setting)
+    web_context = ""
+    if request.web_search_enabled:
+        attempts = min(3, max(1, request.web_search_attempts or 2))
+        if target_madhabs:
+            web_context = await orchestrator.perform_web_search_by_madhab(
+                request.question, target_madhabs, attempts=attempts
+            )
+        else:
+            web_context = await orchestrator.perform_web_search(
+                request.question, attempts=attempts
+            )
+        for rank, section in enumerate(split_markdown_sections(web_context)):
+            assembler.add("web", section, score=-rank * 0.001)
+
+    packed = assembler.assemble()
+    quran_context = "\n\n".join(packed["sections"].get("quran", []))
+    hadith_context = "\n\n".join(packed["sections"].get("hadith", []))
+    rag_context = "\n".join(packed["sections"].get("fiqh", []))
+    web_context = "\n\n".join(packed["sections"].get("web", []))
+
+    # Build prompt for selected provider
+    scholar_role = get_response_instructions(is_fiqh, category, request.language)
+    sources_text = "\n\n".join(
+        [s for s in [quran_context, hadith_context, rag_context, web_context] if s]
+    )
+    school_instruction = (
+        f"Present rulings per selected madhabs: {', '.join(target_madhabs)}"
+        if (is_fiqh and target_madhabs)
+        else "Provide direct answer"
+    )
+
+    prompt = (
+        f"{scholar_role}\n\n"
+        f"Use the verified context below. Do NOT alter Quran/Hadith texts.\n\n"
+        f"{sources_text}\n\n"
+        f"Question: {request.question}\n\n"
+        f"Answer in {request.language} with: 1) {school_instruction}, 2) Evidence from Quran/Hadith when relevant, 3) Clear, respectful explanation."
+    )
+
+    return {
+        "prompt": prompt,
+        "sources": [
+            {"type": "quran", "content": quran_context},
+            {"type": "hadith", "content": hadith_context},
+            {"type": "fiqh", "content": rag_context},
+            {"type": "web", "content": web_context},
+        ],
+        "rag_chunks": rag_chunks if is_fiqh else [],
+        "prompt_tokens": prompt_token_report(prompt, packed, provider, model),
+    }
+
+
 @router.post(
     "/thematic-study",
     summary="Generate thematic Islamic study",
@@ -722,8 +883,9 @@ async def ask_with_dspy(request: IslamicQuestionRequest) -> AIResponse:
                 detail="DSPy RAG is optimized for Maliki fiqh questions only. Use /ask for general Islamic queries.",
             )
 
-        # Get answer with DSPy
-        result = dspy_rag.answer_question(
+        # Get answer with DSPy (blocking retrieval and LLM calls: run off the event loop)
+        result = await asyncio.to_thread(
+            dspy_rag.answer_question,
             question=request.question,
             return_context=True,
         )
@@ -11,6 +11,12 @@ from fastapi.responses import JSONResponse
 from loguru import logger
 
 from ..services.cache_service import get_cache_service
+from ..services.embedding_cache import get_embedding_cache
+from ..services.gemini_executor import get_gemini_executor
+from ..services.llm_router import get_llm_router
+from ..services.madhab_classifier import get_madhab_classifier
+from ..services.semantic_cache import get_semantic_cache
+from ..services.web_search_service import get_web_search_service
 
 router = APIRouter(prefix="/api/v1/metrics", tags=["Metrics"])
 
@@ -66,7 +72,18 @@ async def detailed_health_check() -> dict[str, Any]:
                     "redis_hits": cache_stats["redis_hits"],
                     "memory_hits": cache_stats["memory_hits"],
                     "errors": cache_stats["errors"],
-                }
+                    "coalesced": cache_stats["coalesced"],
+                    "coalesced_remote": cache_stats["coalesced_remote"],
+                    "stale_hits": cache_stats["stale_hits"],
+                    "negative_hits": cache_stats["negative_hits"],
+                    "refresh_errors": cache_stats["refresh_errors"],
+                },
+                "embeddings": get_embedding_cache().get_stats(),
+                "semantic_answers": get_semantic_cache().get_stats(),
+                "multi_madhab_classifier": get_madhab_classifier().get_stats(),
+                "web_pages": get_web_search_service().get_stats(),
+                "gemini_executor": get_gemini_executor().get_stats(),
+                "llm_routing": get_llm_router().get_stats(),
             },
         }
     except Exception as e:
@@ -113,6 +130,30 @@ async def cache_statistics() -> dict[str, Any]:
         return JSONResponse(status_code=500, content={"status": "error", "error": str(e)})
 
 
+@router.get("/embeddings/stats", summary="Query embedding cache statistics")
+async def embedding_cache_statistics() -> dict[str, Any]:
+    """
+    Get query embedding cache statistics.
+
+    Returns:
+        Hit/miss counters for the in-process LRU and the optional Redis tier
+
+    Example:
+        >>> response = await client.get("/api/v1/metrics/embeddings/stats")
+        >>> print(response.json()["statistics"]["hit_rate_percent"])
+        62.5
+    """
+    try:
+        return {
+            "status": "success",
+            "timestamp": __import__("datetime").datetime.utcnow().isoformat(),
+            "statistics": get_embedding_cache().get_stats(),
+        }
+    except Exception as e:
+        logger.error(f"Failed to get embedding cache stats: {e}")
+        return JSONResponse(status_code=500, content={"status": "error", "error": str(e)})
+
+
 @router.post("/cache/clear", summary="Clear cache")
 async def clear_cache() -> dict[str, str]:
     """
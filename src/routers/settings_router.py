@@ -105,9 +105,9 @@ async def test_provider_connection(
     try:
         service = MultiLLMService(provider=provider, api_key=api_key)
 
-        # Get models if not specified
+        # Get models if not specified (live: a cached catalog would hide a revoked key)
         if not model:
-            models = await service.list_available_models()
+            models = await service.refresh_model_catalog()
             if not models:
                 raise HTTPException(status_code=404, detail="No models available")
             model = models[0]["id"]
@@ -203,6 +203,9 @@ async def pull_ollama_model(
         # This will stream the download
         client.pull(model_name)
 
+        # The installed-models list changed
+        await MultiLLMService(provider="ollama").invalidate_model_catalog()
+
         return {
             "status": "success",
             "model": model_name,
@@ -5,6 +5,7 @@ This router handles image and PDF uploads for OCR processing and
 adding to the Maliki fiqh RAG system.
 """
 
+import asyncio
 import shutil
 from pathlib import Path
 from typing import Any
@@ -13,7 +14,7 @@ from fastapi import APIRouter, File, Form, HTTPException, UploadFile
 from loguru import logger
 
 from ..services.ocr_service import OCRService
-from ..services.rag_service import MalikiFiqhRAG
+from ..services.rag_registry import get_rag_registry
 
 router = APIRouter(prefix="/api/v1/upload", tags=["Upload & OCR"])
 
@@ -67,7 +68,7 @@ async def upload_book_image(
         added_to_rag = False
         if add_to_knowledge_base:
             try:
-                rag = MalikiFiqhRAG()
+                rag = get_rag_registry().maliki_rag
                 success = rag.add_document(
                     text=extracted_text,
                     metadata={
@@ -150,7 +151,7 @@ async def upload_book_pdf(
         added_to_rag = False
         if add_to_knowledge_base and full_text:
             try:
-                rag = MalikiFiqhRAG()
+                rag = get_rag_registry().maliki_rag
                 success = rag.add_document(
                     text=full_text,
                     metadata={
@@ -211,7 +212,7 @@ async def add_text_directly(
             raise HTTPException(status_code=400, detail="Text must be at least 50 characters")
 
         # Add to knowledge base
-        rag = MalikiFiqhRAG()
+        rag = get_rag_registry().maliki_rag
         success = rag.add_document(
             text=text,
             metadata={
@@ -251,7 +252,7 @@ async def get_knowledge_base_stats() -> dict[str, Any]:
         Knowledge base statistics
     """
     try:
-        rag = MalikiFiqhRAG()
+        rag = get_rag_registry().maliki_rag
         stats = rag.get_statistics()
 
         return {
@@ -282,8 +283,10 @@ async def search_knowledge_base(
         Search results
     """
     try:
-        rag = MalikiFiqhRAG()
-        results = rag.search(
+        rag = get_rag_registry().maliki_rag
+        # Blocking (encoder, Qdrant, embedding cache Redis tier): run off the event loop
+        results = await asyncio.to_thread(
+            rag.search,
             query=query,
             n_results=n_results,
             category_filter=category,
@@ -13,6 +13,7 @@ __all__ = [
     "MultiLLMService",
     "FiqhRAG",
     "get_fiqh_rag",
+    "get_rag_registry",
 ]
 
 
@@ -41,4 +42,8 @@ def __getattr__(name: str) -> Any:
         from .fiqh_rag_service import get_fiqh_rag
 
         return get_fiqh_rag
+    if name == "get_rag_registry":
+        from .rag_registry import get_rag_registry
+
+        return get_rag_registry
     raise AttributeError(name)
@@ -0,0 +1,306 @@
+"""
+Serialization codecs for values stored in Redis by the CacheService.
+
+Every entry is written as a small envelope::
+
+    MAGIC (2 bytes) | format version | codec id | compression id | payload
+
+so codecs and compression can change without flushing Redis: the reader
+picks the decoder from the header. Entries without the header are legacy
+pickles written before the envelope existed; they are only read while
+``cache_pickle_migration`` is on.
+
+Codecs:
+- orjson (default) - fast JSON for the dict/list payloads we cache
+- msgpack (optional dependency) - compact binary
+- pickle - only as an opt-in fallback for values JSON cannot represent
+
+orjson and msgpack entries must survive an exact round-trip, so a Redis
+hit never differs from a memory-tier hit. Sets, models, dataclasses,
+datetimes, str/int subclasses and (for orjson) non-str dict keys are
+rejected by the encoders themselves at no extra cost. Tuples, enums,
+UUIDs and NaN are only caught by the full type walk of strict mode
+(``cache_codec_strict``), which is too slow for multi-megabyte values
+and meant for development and tests.
+
+Compression uses zstd when installed. zlib is opt-in
+(``cache_compress_zlib``): on typical entries it costs more time than
+the smaller payload saves.
+"""
+
+from __future__ import annotations
+
+import math
+import pickle
+import zlib
+from typing import Any
+
+import orjson
+from loguru import logger
+
+from ..config import settings
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+MAGIC = b"\xa1M"
+FORMAT_VERSION = 1
+
+CODEC_ORJSON = 1
+CODEC_MSGPACK = 2
+CODEC_PICKLE = 3
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+COMPRESSION_ZLIB = 2
+
+_HEADER_SIZE = len(MAGIC) + 3
+
+
+class CodecError(ValueError):
+    """Raised when a value cannot be encoded or an entry cannot be decoded."""
+
+
+_LEAF_TYPES = frozenset({str, int, float, bool, type(None)})
+_CONTAINER_TYPES = frozenset({dict, list})
+_KEY_TYPES = {CODEC_ORJSON: frozenset({str}), CODEC_MSGPACK: frozenset({str, int})}
+_EXTRA_LEAF_TYPES = {CODEC_ORJSON: frozenset(), CODEC_MSGPACK: frozenset({bytes})}
+
+
+def _check_types(value: Any, codec_id: int) -> None:
+    """
+    Reject values that would not decode to the same types (strict mode).
+
+    One walk over the value before encoding: only dicts, lists and exact
+    builtin scalars pass (no tuples, sets, models, enums or NaN). Lists of
+    scalars are checked with one type set instead of item by item.
+    """
+    key_types = _KEY_TYPES[codec_id]
+    leaf_types = _LEAF_TYPES | _EXTRA_LEAF_TYPES[codec_id]
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        kind = type(item)
+        if kind is dict:
+            if not key_types.issuperset(map(type, item)):
+                raise TypeError("dict keys must be strings")
+            children: Any = item.values()
+        elif kind is list:
+            children = item
+        else:
+            children = (item,)
+
+        types = set(map(type, children))
+        unsupported = types - leaf_types - _CONTAINER_TYPES
+        if unsupported:
+            name = next(iter(unsupported)).__name__
+            raise TypeError(f"{name} does not survive an exact round-trip")
+        if float in types and not all(
+            math.isfinite(child) for child in children if type(child) is float
+        ):
+            raise ValueError("NaN and infinity do not survive an exact round-trip")
+        if types & _CONTAINER_TYPES:
+            stack.extend(child for child in children if type(child) in _CONTAINER_TYPES)
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    # Without a default hook, passed-through types raise TypeError
+    return orjson.dumps(
+        value,
+        option=orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_SUBCLASS,
+    )
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+_CODECS: dict[str, int] = {"orjson": CODEC_ORJSON, "msgpack": CODEC_MSGPACK, "pickle": CODEC_PICKLE}
+
+
+class CacheCodec:
+    """
+    Encoder/decoder for cache entries with a versioned header.
+
+    Example:
+        >>> codec = CacheCodec("orjson")
+        >>> codec.decode(codec.encode({"surah": 1}))
+        {'surah': 1}
+    """
+
+    def __init__(
+        self,
+        codec: str | None = None,
+        compress_min_bytes: int | None = None,
+        allow_pickle: bool | None = None,
+        pickle_migration: bool | None = None,
+        strict: bool | None = None,
+    ) -> None:
+        """
+        Initialize the codec.
+
+        Args:
+            codec: "orjson", "msgpack" or "pickle" (defaults to settings)
+            compress_min_bytes: Compress payloads at least this large; 0 disables
+            allow_pickle: Fall back to pickle for values the codec cannot
+                encode, and read pickle entries (defaults to settings)
+            pickle_migration: Read legacy header-less pickle entries
+                (defaults to settings; temporary)
+            strict: Walk every value to reject tuples, enums, UUIDs and NaN
+                before encoding (defaults to settings)
+        """
+        name = (codec or settings.cache_codec).lower()
+        if name not in _CODECS:
+            raise ValueError(f"Unsupported cache codec: {name}")
+        if name == "msgpack" and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack not installed, using orjson cache codec")
+            name = "orjson"
+
+        self.name = name
+        self.codec_id = _CODECS[name]
+        self.compress_min_bytes = (
+            settings.cache_compress_min_bytes if compress_min_bytes is None else compress_min_bytes
+        )
+        self.allow_pickle = settings.cache_allow_pickle if allow_pickle is None else allow_pickle
+        self.pickle_migration = (
+            settings.cache_pickle_migration if pickle_migration is None else pickle_migration
+        )
+        self.strict = settings.cache_codec_strict if strict is None else strict
+        if name == "pickle" and not self.allow_pickle:
+            raise ValueError("The pickle cache codec requires cache_allow_pickle")
+        if ZSTD_AVAILABLE:
+            self.compression_id = COMPRESSION_ZSTD
+        elif settings.cache_compress_zlib:
+            self.compression_id = COMPRESSION_ZLIB
+        else:
+            self.compression_id = COMPRESSION_NONE
+
+    def _dumps(self, value: Any) -> tuple[int, bytes]:
+        """Serialize with the configured codec, falling back to pickle if allowed."""
+        try:
+            if self.codec_id == CODEC_ORJSON:
+                if self.strict:
+                    _check_types(value, CODEC_ORJSON)
+                return CODEC_ORJSON, _orjson_dumps(value)
+            if self.codec_id == CODEC_MSGPACK:
+                if self.strict:
+                    _check_types(value, CODEC_MSGPACK)
+                return CODEC_MSGPACK, _msgpack_dumps(value)
+        except (TypeError, ValueError, OverflowError) as e:
+            if not self.allow_pickle:
+                raise CodecError(f"{self.name} cannot encode value exactly: {e}") from e
+        return CODEC_PICKLE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def encode(self, value: Any) -> bytes:
+        """
+        Serialize a value into a cache entry.
+
+        Args:
+            value: Value to store
+
+        Returns:
+            Header plus (possibly compressed) payload
+
+        Raises:
+            CodecError: If the value cannot be encoded
+        """
+        codec_id, payload = self._dumps(value)
+
+        compression_id = COMPRESSION_NONE
+        if (
+            self.compression_id != COMPRESSION_NONE
+            and self.compress_min_bytes
+            and len(payload) >= self.compress_min_bytes
+        ):
+            compression_id = self.compression_id
+            payload = _compress(payload, compression_id)
+
+        return MAGIC + bytes((FORMAT_VERSION, codec_id, compression_id)) + payload
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Deserialize a cache entry written by :meth:`encode` (or a legacy pickle).
+
+        Args:
+            data: Raw bytes from Redis
+
+        Returns:
+            Stored value
+
+        Raises:
+            CodecError: If the entry is unreadable or uses a disallowed codec
+        """
+        if not data.startswith(MAGIC):
+            if self.pickle_migration:
+                return pickle.loads(data)
+            raise CodecError("Legacy pickle entry rejected (cache_pickle_migration is off)")
+
+        version, codec_id, compression_id = data[len(MAGIC) : _HEADER_SIZE]
+        if version != FORMAT_VERSION:
+            raise CodecError(f"Unsupported cache entry version: {version}")
+
+        payload = _decompress(data[_HEADER_SIZE:], compression_id)
+
+        if codec_id == CODEC_ORJSON:
+            return orjson.loads(payload)
+        if codec_id == CODEC_MSGPACK:
+            if not MSGPACK_AVAILABLE:
+                raise CodecError("Entry is msgpack-encoded but msgpack is not installed")
+            return _msgpack_loads(payload)
+        if codec_id == CODEC_PICKLE:
+            if not self.allow_pickle:
+                raise CodecError("Pickle entry rejected (cache_allow_pickle is off)")
+            return pickle.loads(payload)
+        raise CodecError(f"Unknown cache codec id: {codec_id}")
+
+
+def _compress(payload: bytes, compression_id: int) -> bytes:
+    if compression_id == COMPRESSION_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    return zlib.compress(payload, 6)
+
+
+def _decompress(payload: bytes, compression_id: int) -> bytes:
+    if compression_id == COMPRESSION_NONE:
+        return payload
+    if compression_id == COMPRESSION_ZLIB:
+        return zlib.decompress(payload)
+    if compression_id == COMPRESSION_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise CodecError("Entry is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise CodecError(f"Unknown compression id: {compression_id}")
+
+
+# Global codec instance
+_cache_codec: CacheCodec | None = None
+
+
+def get_cache_codec() -> CacheCodec:
+    """
+    Get or create the global cache codec.
+
+    Returns:
+        CacheCodec instance
+    """
+    global _cache_codec
+    if _cache_codec is None:
+        _cache_codec = CacheCodec()
+    return _cache_codec
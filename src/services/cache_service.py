@@ -8,10 +8,12 @@ Implements a dual-layer caching strategy:
 This service provides significant performance improvements for external API calls.
 """
 
+import asyncio
 import hashlib
+import inspect
 import json
-import pickle
-from collections.abc import Callable
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
 from functools import wraps
 from typing import Any, TypeVar, cast
 
@@ -26,13 +28,25 @@ except ImportError:
     REDIS_AVAILABLE = False
     logger.warning("redis.asyncio not available, falling back to in-memory cache")
 
-from cachetools import TTLCache
+from cachetools import TLRUCache
 
 from ..config import settings
+from ..utils.metrics import LatencyHistogram
+from .cache_codecs import CacheCodec, CodecError, get_cache_codec
 
 # Type variable for generic function decoration
 F = TypeVar("F", bound=Callable[..., Any])
 
+# Keys per MGET / pipeline round-trip in bulk operations
+BULK_CHUNK_SIZE = 500
+
+_MISSING = object()
+
+
+def _entry_expiry(_key: str, entry: tuple[float, Any], _now: float) -> float:
+    """Memory entries are (expires_at, value) tuples; expiry is per entry."""
+    return entry[0]
+
 
 class CacheService:
     """
@@ -40,8 +54,9 @@ class CacheService:
 
     Features:
     - Async Redis operations
-    - In-memory LRU cache with TTL
-    - Automatic serialization/deserialization
+    - In-memory LRU tier with per-entry TTL; Redis hits are promoted into it
+      with their remaining TTL, capped per key prefix
+    - Automatic serialization/deserialization (see cache_codecs)
     - Cache key generation with hashing
     - Statistics tracking
 
@@ -51,13 +66,21 @@ class CacheService:
         >>> result = await cache.get("prayer_times:cairo")
     """
 
-    def __init__(self) -> None:
-        """Initialize cache service with Redis and in-memory stores."""
+    def __init__(self, codec: CacheCodec | None = None) -> None:
+        """
+        Initialize cache service with Redis and in-memory stores.
+
+        Args:
+            codec: Serializer for Redis entries (defaults to the global codec)
+        """
         self.redis_client: Redis | None = None
         self.redis_enabled = False
+        self.codec = codec or get_cache_codec()
 
-        # In-memory cache: 1000 items, 1 hour default TTL
-        self.memory_cache: TTLCache = TTLCache(maxsize=1000, ttl=3600)
+        # In-memory LRU tier; entries are (expires_at, value) with per-entry TTL
+        self.memory_cache: TLRUCache = TLRUCache(
+            maxsize=settings.cache_memory_maxsize, ttu=_entry_expiry, timer=time.monotonic
+        )
 
         # Statistics
         self.stats = {
@@ -65,9 +88,20 @@ class CacheService:
             "misses": 0,
             "redis_hits": 0,
             "memory_hits": 0,
+            "promotions": 0,
+            "coalesced": 0,
+            "coalesced_remote": 0,
+            "stale_hits": 0,
+            "negative_hits": 0,
+            "refresh_errors": 0,
             "sets": 0,
             "errors": 0,
         }
+        self.latency = {"memory": LatencyHistogram(), "redis": LatencyHistogram()}
+
+        # In-flight loads per cache key (single-flight for @cached)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._background_tasks: set[asyncio.Future] = set()
 
         logger.info("🔧 Cache service initialized (in-memory mode)")
 
@@ -137,36 +171,77 @@ class CacheService:
 
         return f"{prefix}:{key_hash}"
 
-    async def get(self, key: str) -> Any | None:
+    def _memory_ttl(self, key: str, ttl: float) -> float:
+        """
+        TTL for the memory tier: the entry's TTL capped by its key prefix.
+
+        Without Redis the memory tier is the only copy, so no cap applies.
         """
-        Get value from cache (tries Redis first, then in-memory).
+        if not self.redis_enabled:
+            return ttl
+        cap = settings.cache_memory_ttl_by_prefix.get(key.split(":", 1)[0], settings.cache_memory_ttl)
+        return min(ttl, cap)
+
+    def _memory_get(self, key: str) -> Any:
+        """Return a memory-tier value or ``_MISSING``."""
+        entry = self.memory_cache.get(key)
+        return _MISSING if entry is None else entry[1]
+
+    def _memory_set(self, key: str, value: Any, ttl: float) -> bool:
+        """Store a value in the memory tier for ``ttl`` seconds (capped per prefix)."""
+        memory_ttl = self._memory_ttl(key, ttl)
+        if memory_ttl <= 0:
+            self.memory_cache.pop(key, None)
+            return False
+        self.memory_cache[key] = (time.monotonic() + memory_ttl, value)
+        return True
+
+    async def get(self, key: str, offload: bool = False) -> Any | None:
+        """
+        Get value from cache (in-memory tier first, then Redis).
+
+        Redis hits are promoted into the memory tier with the key's
+        remaining Redis TTL (capped per prefix), so hot keys stop costing
+        a network round-trip.
 
         Args:
             key: Cache key
+            offload: Decode in a worker thread (for multi-megabyte values)
 
         Returns:
             Cached value or None if not found
         """
         try:
-            # Try Redis first
+            start = time.perf_counter()
+            value = self._memory_get(key)
+            self.latency["memory"].observe(time.perf_counter() - start)
+            if value is not _MISSING:
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+                return value
+
             if self.redis_enabled and self.redis_client:
                 try:
-                    value = await self.redis_client.get(key)
-                    if value is not None:
+                    start = time.perf_counter()
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    pipe.get(key)
+                    pipe.pttl(key)
+                    raw, remaining_ms = await pipe.execute()
+                    self.latency["redis"].observe(time.perf_counter() - start)
+
+                    if raw is not None:
+                        if offload:
+                            value = await asyncio.to_thread(self.codec.decode, raw)
+                        else:
+                            value = self.codec.decode(raw)
                         self.stats["hits"] += 1
                         self.stats["redis_hits"] += 1
-                        # Deserialize from pickle
-                        return pickle.loads(value)
+                        self._promote(key, value, remaining_ms)
+                        return value
                 except Exception as e:
                     logger.error(f"Redis get error: {e}")
                     self.stats["errors"] += 1
 
-            # Fallback to in-memory cache
-            if key in self.memory_cache:
-                self.stats["hits"] += 1
-                self.stats["memory_hits"] += 1
-                return self.memory_cache[key]
-
             # Cache miss
             self.stats["misses"] += 1
             return None
@@ -176,11 +251,21 @@ class CacheService:
             self.stats["errors"] += 1
             return None
 
+    def _promote(self, key: str, value: Any, remaining_ms: int | None) -> None:
+        """Copy a Redis hit into the memory tier with its remaining TTL."""
+        # PTTL: -1 = no expiry, -2 = key vanished since GET
+        if remaining_ms is None or remaining_ms == -2:
+            return
+        ttl = settings.cache_ttl if remaining_ms == -1 else remaining_ms / 1000
+        if self._memory_set(key, value, ttl):
+            self.stats["promotions"] += 1
+
     async def set(
         self,
         key: str,
         value: Any,
         ttl: int | None = None,
+        offload: bool = False,
     ) -> bool:
         """
         Set value in cache (both Redis and in-memory).
@@ -189,6 +274,7 @@ class CacheService:
             key: Cache key
             value: Value to cache
             ttl: Time-to-live in seconds (default from settings)
+            offload: Encode in a worker thread (for multi-megabyte values)
 
         Returns:
             True if successful
@@ -200,18 +286,24 @@ class CacheService:
             # Store in Redis
             if self.redis_enabled and self.redis_client:
                 try:
-                    serialized = pickle.dumps(value)
+                    if offload:
+                        serialized = await asyncio.to_thread(self.codec.encode, value)
+                    else:
+                        serialized = self.codec.encode(value)
                     await self.redis_client.setex(
                         key,
                         ttl_seconds,
                         serialized,
                     )
+                except CodecError as e:
+                    # Not exactly representable in Redis: keep it in memory only
+                    logger.debug(f"Caching {key} in memory only: {e}")
                 except Exception as e:
                     logger.error(f"Redis set error: {e}")
                     self.stats["errors"] += 1
 
-            # Always store in memory cache as backup
-            self.memory_cache[key] = value
+            # Memory tier (TTL capped per prefix when Redis holds the primary copy)
+            self._memory_set(key, value, ttl_seconds)
 
             return True
 
@@ -220,6 +312,236 @@ class CacheService:
             self.stats["errors"] += 1
             return False
 
+    async def single_flight(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``load`` once for concurrent callers of the same key.
+
+        The first caller starts the load; callers arriving while it is in
+        flight await the same result (or exception) and are counted as
+        ``coalesced``. The load is shielded, so a cancelled caller does not
+        cancel it for the others.
+
+        Args:
+            key: Cache key identifying the load
+            load: Coroutine factory producing the value
+
+        Returns:
+            Result of the shared load
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None and not inflight.done():
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        task = asyncio.ensure_future(load())
+        self._inflight[key] = task
+
+        def _forget(done: asyncio.Future) -> None:
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+
+        task.add_done_callback(_forget)
+        return await asyncio.shield(task)
+
+    async def load_through(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[Any]],
+        ttl: int | Callable[[Any], int | None] | None = None,
+        distributed_lock: bool = False,
+    ) -> Any:
+        """
+        Compute a missing value and store it, optionally under a Redis lock.
+
+        With ``distributed_lock`` only one worker computes the value; the
+        others poll the cache for up to ``settings.cache_lock_wait`` seconds
+        and are counted as ``coalesced_remote``. If the wait expires they
+        compute the value themselves.
+
+        Args:
+            key: Cache key
+            load: Coroutine factory producing the value
+            ttl: Time-to-live in seconds, or a function of the loaded value
+            distributed_lock: Coalesce across workers with a Redis lock
+
+        Returns:
+            Loaded (or concurrently cached) value
+        """
+        if not (distributed_lock and self.redis_enabled and self.redis_client):
+            return await self._load_and_set(key, load, ttl)
+
+        lock = self.redis_client.lock(
+            f"lock:{key}", timeout=settings.cache_lock_timeout, blocking=False
+        )
+        try:
+            acquired = await lock.acquire()
+        except Exception as e:
+            logger.error(f"Redis lock error for {key}: {e}")
+            self.stats["errors"] += 1
+            return await self._load_and_set(key, load, ttl)
+
+        if not acquired:
+            value = await self._wait_for_value(key)
+            if value is not None:
+                self.stats["coalesced_remote"] += 1
+                return value
+            return await self._load_and_set(key, load, ttl)
+
+        try:
+            # Another worker may have stored it between our miss and the lock
+            value = await self.get(key)
+            if value is not None:
+                return value
+            return await self._load_and_set(key, load, ttl)
+        finally:
+            try:
+                await lock.release()
+            except Exception as e:  # Lock expired or connection lost
+                logger.warning(f"Redis lock release failed for {key}: {e}")
+
+    async def _load_and_set(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[Any]],
+        ttl: int | Callable[[Any], int | None] | None,
+    ) -> Any:
+        result = await load()
+        if result is not None:
+            await self.set(key, result, ttl=ttl(result) if callable(ttl) else ttl)
+        return result
+
+    def refresh_in_background(self, key: str, load: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Start a single-flight refresh of ``key`` without awaiting it.
+
+        ``load`` is responsible for storing the new value and for handling
+        its own errors; a refresh already in flight is not duplicated.
+        """
+        if key in self._inflight:
+            return
+        task = asyncio.ensure_future(self.single_flight(key, load))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _wait_for_value(self, key: str, interval: float = 0.05) -> Any | None:
+        """Poll the cache until another worker stores ``key`` or the wait expires."""
+        deadline = time.monotonic() + settings.cache_lock_wait
+        while time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+            value = await self.get(key)
+            if value is not None:
+                return value
+            interval = min(interval * 2, 0.5)
+        return None
+
+    async def get_many(
+        self,
+        keys: Iterable[str],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        promote: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Get many values with one MGET round-trip per chunk.
+
+        Keys found in the memory tier skip Redis; the rest are fetched with
+        MGET (plus PTTL for promotion) in one pipeline per chunk. Stats count
+        one hit or miss per key.
+
+        Args:
+            keys: Cache keys
+            chunk_size: Keys per MGET call
+            promote: Copy Redis hits into the memory tier with their remaining TTL
+
+        Returns:
+            Mapping of found keys to values (missing keys are omitted)
+        """
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, Any] = {}
+
+        for key in keys:
+            value = self._memory_get(key)
+            if value is not _MISSING:
+                found[key] = value
+                self.stats["memory_hits"] += 1
+
+        remote_keys = [key for key in keys if key not in found]
+        if remote_keys and self.redis_enabled and self.redis_client:
+            for start in range(0, len(remote_keys), chunk_size):
+                chunk = remote_keys[start : start + chunk_size]
+                try:
+                    started = time.perf_counter()
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    pipe.mget(chunk)
+                    if promote:
+                        for key in chunk:
+                            pipe.pttl(key)
+                    values, *remaining = await pipe.execute()
+                    self.latency["redis"].observe(time.perf_counter() - started)
+                except Exception as e:
+                    logger.error(f"Redis mget error: {e}")
+                    self.stats["errors"] += 1
+                    continue
+
+                for index, (key, value) in enumerate(zip(chunk, values)):
+                    if value is None:
+                        continue
+                    try:
+                        found[key] = self.codec.decode(value)
+                    except Exception as e:
+                        logger.error(f"Cache deserialize error for key {key}: {e}")
+                        self.stats["errors"] += 1
+                        continue
+                    self.stats["redis_hits"] += 1
+                    if promote:
+                        self._promote(key, found[key], remaining[index])
+
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(keys) - len(found)
+        return found
+
+    async def set_many(
+        self,
+        items: Mapping[str, Any],
+        ttl: int | None = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> bool:
+        """
+        Set many values with one pipelined round-trip per chunk.
+
+        Args:
+            items: Mapping of cache keys to values
+            ttl: Time-to-live in seconds (default from settings)
+            chunk_size: Keys per pipeline execution
+
+        Returns:
+            True if every chunk was stored
+        """
+        ttl_seconds = ttl or settings.cache_ttl
+        success = True
+        keys = list(items)
+        self.stats["sets"] += len(keys)
+
+        if self.redis_enabled and self.redis_client:
+            for start in range(0, len(keys), chunk_size):
+                chunk = keys[start : start + chunk_size]
+                try:
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    for key in chunk:
+                        try:
+                            pipe.setex(key, ttl_seconds, self.codec.encode(items[key]))
+                        except CodecError as e:
+                            logger.debug(f"Caching {key} in memory only: {e}")
+                    await pipe.execute()
+                except Exception as e:
+                    logger.error(f"Redis pipeline set error: {e}")
+                    self.stats["errors"] += 1
+                    success = False
+
+        # Memory tier (TTL capped per prefix when Redis holds the primary copy)
+        for key in keys:
+            self._memory_set(key, items[key], ttl_seconds)
+        return success
+
     async def delete(self, key: str) -> bool:
         """
         Delete key from cache.
@@ -300,6 +622,12 @@ class CacheService:
             "misses": self.stats["misses"],
             "redis_hits": self.stats["redis_hits"],
             "memory_hits": self.stats["memory_hits"],
+            "promotions": self.stats["promotions"],
+            "coalesced": self.stats["coalesced"],
+            "coalesced_remote": self.stats["coalesced_remote"],
+            "stale_hits": self.stats["stale_hits"],
+            "negative_hits": self.stats["negative_hits"],
+            "refresh_errors": self.stats["refresh_errors"],
             "sets": self.stats["sets"],
             "errors": self.stats["errors"],
             "total_requests": total_requests,
@@ -307,6 +635,7 @@ class CacheService:
             "redis_enabled": self.redis_enabled,
             "memory_cache_size": len(self.memory_cache),
             "memory_cache_maxsize": self.memory_cache.maxsize,
+            "latency": {tier: hist.snapshot() for tier, hist in self.latency.items()},
         }
 
     def reset_stats(self) -> None:
@@ -316,9 +645,17 @@ class CacheService:
             "misses": 0,
             "redis_hits": 0,
             "memory_hits": 0,
+            "promotions": 0,
+            "coalesced": 0,
+            "coalesced_remote": 0,
+            "stale_hits": 0,
+            "negative_hits": 0,
+            "refresh_errors": 0,
             "sets": 0,
             "errors": 0,
         }
+        for hist in self.latency.values():
+            hist.reset()
         logger.info("Cache statistics reset")
 
 
@@ -339,55 +676,192 @@ def get_cache_service() -> CacheService:
     return _cache_service
 
 
+# Marker key of the entries written by @cached with stale/negative TTLs
+_ENTRY_MARKER = "__cached_entry__"
+
+# Seconds before retrying a failed background refresh (when no negative_ttl is set)
+_REFRESH_RETRY_SECONDS = 30
+
+
+def _make_entry(value: Any, fresh_for: float, hard_ttl: float, negative: bool = False) -> dict:
+    """Wrap a value with its soft (fresh) and hard expiry times."""
+    now = time.time()
+    return {
+        _ENTRY_MARKER: 1,
+        "value": value,
+        "negative": negative,
+        "fresh_until": now + fresh_for,
+        "expires_at": now + hard_ttl,
+    }
+
+
+def _is_entry(value: Any) -> bool:
+    return isinstance(value, dict) and value.get(_ENTRY_MARKER) == 1
+
+
+def _skips_self(func: Callable[..., Any]) -> bool:
+    """Whether ``func`` is a method whose instance must not be part of the cache key."""
+    params = list(inspect.signature(func).parameters)
+    return bool(params) and params[0] in ("self", "cls")
+
+
 def cached(
     prefix: str,
     ttl: int | None = None,
     key_builder: Callable[..., str] | None = None,
+    distributed_lock: bool | None = None,
+    stale_ttl: int | None = None,
+    negative_ttl: int | None = None,
+    negative_if: Callable[[Any], bool] | None = None,
 ) -> Callable[[F], F]:
     """
     Decorator to cache async function results.
 
+    Concurrent misses for the same key share one call to the wrapped
+    function (single-flight); with ``distributed_lock`` a Redis lock also
+    coalesces misses across workers.
+
+    With ``stale_ttl`` a value is fresh for ``ttl`` seconds and then served
+    stale for up to ``stale_ttl`` more while one background call refreshes
+    it; if the refresh fails the stale value keeps being served. With
+    ``negative_ttl`` failed results (``None``, or whatever ``negative_if``
+    flags) are cached briefly so a failing upstream is not hammered.
+
+    For methods the instance is left out of the key, so every client
+    instance shares the cache. ``func.refresh(*args)`` calls the function
+    without reading the cache and stores the fresh result.
+
     Args:
         prefix: Cache key prefix
-        ttl: Time-to-live in seconds
+        ttl: Time-to-live in seconds (soft TTL when ``stale_ttl`` is set)
         key_builder: Optional custom key builder function
+        distributed_lock: Coalesce across workers (default from settings)
+        stale_ttl: Extra seconds a stale value may be served while refreshing
+        negative_ttl: Seconds to cache a failed (negative) result
+        negative_if: Predicate marking a result as failed (default: ``None``)
 
     Returns:
         Decorated function
 
     Example:
-        >>> @cached(prefix="quran", ttl=86400)
+        >>> @cached(prefix="quran", ttl=86400, stale_ttl=3600, negative_ttl=60)
         >>> async def get_surah(surah_number: int):
         ...     return await api.get(f"/surah/{surah_number}")
     """
+    use_entries = stale_ttl is not None or negative_ttl is not None
+    is_negative = negative_if or (lambda result: result is None)
 
     def decorator(func: F) -> F:
+        skip_self = _skips_self(func)
+
+        def key_for(args: tuple, kwargs: dict) -> str:
+            if key_builder:
+                return key_builder(*args, **kwargs)
+            key_args = args[1:] if skip_self else args
+            return get_cache_service()._generate_cache_key(prefix, *key_args, **kwargs)
+
+        fresh_for = ttl or settings.cache_ttl
+        hard_ttl = fresh_for + (stale_ttl or 0)
+
+        async def load_entry(args: tuple, kwargs: dict) -> dict | None:
+            result = await func(*args, **kwargs)
+            if not is_negative(result):
+                return _make_entry(result, fresh_for, hard_ttl)
+            if negative_ttl:
+                return _make_entry(result, negative_ttl, negative_ttl, negative=True)
+            return None
+
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             cache = get_cache_service()
+            cache_key = key_for(args, kwargs)
 
-            # Generate cache key
-            if key_builder:
-                cache_key = key_builder(*args, **kwargs)
-            else:
-                cache_key = cache._generate_cache_key(prefix, *args, **kwargs)
+            async def refresh_stale(stale: dict) -> None:
+                try:
+                    entry = await load_entry(args, kwargs)
+                except Exception as e:
+                    logger.warning(f"Background refresh failed for {cache_key}: {e}")
+                    entry = None
+
+                if entry is not None and not entry["negative"]:
+                    await cache.set(cache_key, entry, ttl=hard_ttl)
+                    return
+
+                # Keep serving the stale value; retry after a short pause
+                cache.stats["refresh_errors"] += 1
+                remaining = stale["expires_at"] - time.time()
+                if remaining > 1:
+                    retry = {
+                        **stale,
+                        "fresh_until": time.time() + (negative_ttl or _REFRESH_RETRY_SECONDS),
+                    }
+                    await cache.set(cache_key, retry, ttl=int(remaining))
 
             # Try to get from cache
             cached_value = await cache.get(cache_key)
+            if use_entries and _is_entry(cached_value):
+                if cached_value["negative"]:
+                    cache.stats["negative_hits"] += 1
+                    logger.debug(f"Cache NEGATIVE HIT: {cache_key}")
+                elif time.time() >= cached_value["fresh_until"]:
+                    cache.stats["stale_hits"] += 1
+                    logger.debug(f"Cache STALE HIT: {cache_key}")
+                    cache.refresh_in_background(cache_key, lambda: refresh_stale(cached_value))
+                else:
+                    logger.debug(f"Cache HIT: {cache_key}")
+                return cached_value["value"]
             if cached_value is not None:
                 logger.debug(f"Cache HIT: {cache_key}")
                 return cached_value
 
-            # Cache miss - call function
+            # Cache miss - one call per key, shared by concurrent callers
             logger.debug(f"Cache MISS: {cache_key}")
-            result = await func(*args, **kwargs)
+            use_lock = (
+                settings.cache_distributed_lock if distributed_lock is None else distributed_lock
+            )
+            if not use_entries:
+                return await cache.single_flight(
+                    cache_key,
+                    lambda: cache.load_through(
+                        cache_key, lambda: func(*args, **kwargs), ttl=ttl, distributed_lock=use_lock
+                    ),
+                )
 
-            # Store in cache
-            if result is not None:
-                await cache.set(cache_key, result, ttl=ttl)
+            entry = await cache.single_flight(
+                cache_key,
+                lambda: cache.load_through(
+                    cache_key,
+                    lambda: load_entry(args, kwargs),
+                    ttl=lambda e: negative_ttl if e["negative"] else hard_ttl,
+                    distributed_lock=use_lock,
+                ),
+            )
+            if _is_entry(entry):
+                return entry["value"]
+            return entry
 
-            return result
+        async def refresh(*args: Any, **kwargs: Any) -> Any:
+            """Call the function, bypassing the cache, and replace the cached result."""
+            cache = get_cache_service()
+            cache_key = key_for(args, kwargs)
+            if not use_entries:
+                result = await func(*args, **kwargs)
+                if result is None:
+                    await cache.delete(cache_key)
+                else:
+                    await cache.set(cache_key, result, ttl=ttl)
+                return result
+
+            entry = await load_entry(args, kwargs)
+            if entry is None:
+                await cache.delete(cache_key)
+                return None
+            await cache.set(
+                cache_key, entry, ttl=negative_ttl if entry["negative"] else hard_ttl
+            )
+            return entry["value"]
 
+        wrapper.refresh = refresh  # type: ignore[attr-defined]
         return cast(F, wrapper)
 
     return decorator
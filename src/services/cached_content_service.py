@@ -5,11 +5,32 @@ Retrieves Quran and Hadith content directly from Redis cache
 instead of making external API calls. Provides instant responses.
 """
 
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
 from typing import Any
 
 from loguru import logger
 
+from ..config import settings
 from .cache_service import get_cache_service
+from .search_index import InvertedIndex, build_hadith_index, build_quran_index
+
+SEARCH_INDEX_TTL = 31536000  # 365 days, same as the cached content
+
+# Complete collection sizes on api.hadith.gading.dev (see cache_hadith.py)
+HADITH_COLLECTION_SIZES = {
+    "bukhari": 6638,
+    "muslim": 4930,
+    "malik": 1587,
+    "abu-daud": 4419,
+    "tirmidzi": 3625,
+    "ibnu-majah": 4285,
+    "nasai": 5364,
+    "ahmad": 4305,
+    "darimi": 2949,
+}
+HADITH_RANGE_SIZE = 50  # Batch size used by cache_hadith.py for hadith_range keys
 
 
 class CachedContentService:
@@ -23,6 +44,8 @@ class CachedContentService:
     def __init__(self):
         """Initialize the cached content service."""
         self.cache = get_cache_service()
+        # key -> {"index": InvertedIndex | None, "built_at": float | None, "checked_at": float}
+        self._indexes: dict[str, dict[str, Any]] = {}
 
     async def get_surah_from_cache(
         self, surah_number: int, edition: str = "quran-uthmani"
@@ -79,8 +102,9 @@ class CachedContentService:
         """
         Search for Quranic verses in cache.
 
-        This performs a simple text search across all cached Surahs.
-        For better semantic search, use the RAG system.
+        Uses the inverted index over cached ayahs (built on first use and
+        persisted in the cache). Supports multi-word phrases and word
+        prefixes. For semantic search, use the RAG system.
 
         Args:
             query: Search term (Arabic or English)
@@ -88,41 +112,148 @@ class CachedContentService:
             limit: Maximum results
 
         Returns:
-            List of matching ayahs
+            List of matching ayahs, best match first
         """
-        query_lower = query.lower()
-        results = []
-
-        # Search through all 114 Surahs
-        for surah_num in range(1, 115):
-            if len(results) >= limit:
-                break
-
-            surah = await self.get_surah_from_cache(surah_num, edition)
-            if not surah:
-                continue
-
-            ayahs = surah.get("ayahs", [])
-            for ayah in ayahs:
-                text = ayah.get("text", "").lower()
-
-                if query_lower in text or query in text:
-                    results.append(
-                        {
-                            "surah_number": surah_num,
-                            "surah_name": surah.get("englishName", ""),
-                            "ayah_number": ayah.get("numberInSurah"),
-                            "text": ayah.get("text"),
-                            "ayah_data": ayah,
-                        }
-                    )
-
-                    if len(results) >= limit:
-                        break
+        index = await self.get_quran_index(edition)
+        results = index.search(query, limit=limit) if index else []
 
         logger.info(f"Found {len(results)} matching verses for '{query}'")
         return results
 
+    async def get_quran_index(self, edition: str = "quran-uthmani") -> InvertedIndex | None:
+        """
+        Get the ayah index for an edition (memory, then cache, then rebuild).
+
+        Args:
+            edition: Edition identifier
+
+        Returns:
+            InvertedIndex, or None if no surahs of the edition are cached
+        """
+        return await self._get_index(
+            self._quran_index_key(edition), lambda: self.build_quran_index(edition)
+        )
+
+    async def build_quran_index(
+        self, edition: str = "quran-uthmani", persist: bool = True
+    ) -> InvertedIndex | None:
+        """
+        Build the ayah index from cached surahs and optionally persist it.
+
+        Called by ``cache_quran.py`` after population and lazily on first search.
+
+        Args:
+            edition: Edition identifier
+            persist: Store the serialized index in the cache
+
+        Returns:
+            InvertedIndex, or None if no surahs of the edition are cached
+        """
+        start = time.perf_counter()
+        keys = {f"quran_surah:{surah_num}:{edition}": surah_num for surah_num in range(1, 115)}
+        fetched = await self.cache.get_many(keys, promote=False)
+        surahs = {keys[key]: surah for key, surah in fetched.items() if surah}
+        if not surahs:
+            logger.warning(f"No cached surahs for edition '{edition}'; Quran index not built")
+            return None
+
+        index = await asyncio.to_thread(build_quran_index, surahs)
+        await self._store_index(self._quran_index_key(edition), index, persist)
+
+        logger.info(
+            f"Built Quran index for {edition}: {len(surahs)} surahs, {len(index)} ayahs, "
+            f"{len(index.vocabulary)} terms in {time.perf_counter() - start:.2f}s"
+        )
+        return index
+
+    @staticmethod
+    def _quran_index_key(edition: str) -> str:
+        return f"quran_index:{edition}"
+
+    async def _get_index(
+        self,
+        key: str,
+        build: Callable[[], Awaitable[InvertedIndex | None]],
+    ) -> InvertedIndex | None:
+        """
+        Return an index from memory, the cache, or ``build()``.
+
+        Loads are single-flight per key. Every ``search_index_refresh_interval``
+        seconds a background refresh checks the persisted build time, so an
+        index rebuilt by ``cache_quran.py`` or ``cache_hadith.py`` (or another
+        worker) replaces a partial one held in memory; searches keep using
+        the current index meanwhile. A missing index is also only retried at
+        that interval.
+        """
+        flight_key = f"search_index_load:{key}"
+        entry = self._indexes.get(key)
+        if entry is None:
+            return await self.cache.single_flight(flight_key, lambda: self._load_index(key, build))
+
+        if self._refresh_due(entry):
+            self.cache.refresh_in_background(flight_key, lambda: self._refresh_index(key, build))
+        return entry["index"]
+
+    async def _refresh_index(
+        self, key: str, build: Callable[[], Awaitable[InvertedIndex | None]]
+    ) -> None:
+        """Background refresh: errors keep the current index in place."""
+        try:
+            await self._load_index(key, build)
+        except Exception as e:
+            logger.error(f"Search index refresh failed for {key}: {e}")
+            entry = self._indexes.get(key)
+            if entry is not None:
+                entry["checked_at"] = time.monotonic()
+
+    async def _load_index(
+        self, key: str, build: Callable[[], Awaitable[InvertedIndex | None]]
+    ) -> InvertedIndex | None:
+        """Adopt a newer persisted index, or build one when none is usable."""
+        entry = self._indexes.get(key)
+        built_at = await self.cache.get(self._index_version_key(key))
+        if entry is not None and entry["index"] is not None:
+            if built_at is None or (entry["built_at"] or 0) >= built_at:
+                entry["checked_at"] = time.monotonic()
+                return entry["index"]
+
+        data = await self.cache.get(key, offload=True)
+        index = await asyncio.to_thread(InvertedIndex.from_dict, data) if data else None
+        if index is not None:
+            logger.info(f"Loaded search index {key} from cache")
+            self._indexes[key] = {
+                "index": index,
+                "built_at": built_at,
+                "checked_at": time.monotonic(),
+            }
+            return index
+
+        index = await build()
+        if index is None:
+            self._indexes[key] = {
+                "index": None,
+                "built_at": None,
+                "checked_at": time.monotonic(),
+            }
+        return index
+
+    @staticmethod
+    def _refresh_due(entry: dict[str, Any]) -> bool:
+        return time.monotonic() - entry["checked_at"] >= settings.search_index_refresh_interval
+
+    @staticmethod
+    def _index_version_key(key: str) -> str:
+        return f"{key}:built_at"
+
+    async def _store_index(self, key: str, index: InvertedIndex, persist: bool) -> None:
+        """Keep an index in memory and optionally persist it with its build time."""
+        built_at = time.time()
+        self._indexes[key] = {"index": index, "built_at": built_at, "checked_at": time.monotonic()}
+        if persist:
+            payload = await asyncio.to_thread(index.to_dict)
+            await self.cache.set(key, payload, ttl=SEARCH_INDEX_TTL, offload=True)
+            await self.cache.set(self._index_version_key(key), built_at, ttl=SEARCH_INDEX_TTL)
+
     async def get_hadith_from_cache(
         self, collection: str, hadith_number: int
     ) -> dict[str, Any] | None:
@@ -157,13 +288,18 @@ class CachedContentService:
         """
         Search for Hadiths in cache across collections.
 
+        Each collection has an inverted index over its Arabic text and
+        translation (built by ``cache_hadith.py`` or lazily from the cached
+        ranges), so a query is a handful of in-memory lookups instead of a
+        cache round-trip per hadith.
+
         Args:
             query: Search term (Arabic or English)
             collections: List of collections to search (default: all)
             limit: Maximum results
 
         Returns:
-            List of matching hadiths
+            List of matching hadiths, best match first
         """
         if collections is None:
             collections = [
@@ -176,53 +312,118 @@ class CachedContentService:
                 "ibnu-majah",
             ]
 
-        query_lower = query.lower()
-        results = []
-
-        # Define reasonable search ranges for each collection
-        search_limits = {
-            "bukhari": 1000,
-            "muslim": 1000,
-            "malik": 1587,  # Complete
-            "abu-daud": 500,
-            "tirmidzi": 500,
-            "nasai": 500,
-            "ibnu-majah": 500,
-            "ahmad": 500,
-            "darimi": 500,
-        }
+        indexes = await asyncio.gather(
+            *(self.get_hadith_index(collection) for collection in collections)
+        )
 
-        for collection in collections:
-            if len(results) >= limit:
-                break
+        matches: list[dict[str, Any]] = []
+        for index in indexes:
+            if index is not None:
+                matches.extend(index.search(query, limit=limit))
+        matches.sort(key=lambda match: -match["score"])
+
+        results = [
+            {
+                **match,
+                "hadith_data": {
+                    "number": match["number"],
+                    "arab": match["arab"],
+                    "id": match["text"],
+                },
+            }
+            for match in matches[:limit]
+        ]
 
-            search_limit = search_limits.get(collection, 500)
+        logger.info(f"Found {len(results)} matching hadiths for '{query}' in cache")
+        return results
+
+    async def get_hadith_index(self, collection: str) -> InvertedIndex | None:
+        """
+        Get the search index for a hadith collection.
 
-            for hadith_num in range(1, search_limit + 1):
-                if len(results) >= limit:
-                    break
+        Args:
+            collection: Collection ID (bukhari, muslim, malik, etc.)
 
-                hadith = await self.get_hadith_from_cache(collection, hadith_num)
-                if not hadith:
-                    continue
+        Returns:
+            InvertedIndex, or None if nothing from the collection is cached
+        """
+        return await self._get_index(
+            self._hadith_index_key(collection), lambda: self.build_hadith_index(collection)
+        )
 
-                # Search in Arabic and English text
-                arab_text = hadith.get("arab", "").lower()
-                id_text = hadith.get("id", "").lower()  # Indonesian translation
+    async def build_hadith_index(
+        self,
+        collection: str,
+        hadiths: Iterable[dict[str, Any]] | None = None,
+        persist: bool = True,
+    ) -> InvertedIndex | None:
+        """
+        Build a collection's search index and optionally persist it.
 
-                if query_lower in arab_text or query_lower in id_text or query in arab_text:
-                    results.append(
-                        {
-                            "collection": collection,
-                            "number": hadith.get("number"),
-                            "arab": hadith.get("arab", ""),
-                            "text": hadith.get("id", ""),  # Translation
-                            "hadith_data": hadith,
-                        }
-                    )
+        Args:
+            collection: Collection ID
+            hadiths: Raw hadiths (``number``/``arab``/``id``); read from the
+                cached ``hadith_range`` batches when omitted
+            persist: Store the serialized index in the cache
 
-        logger.info(f"Found {len(results)} matching hadiths for '{query}' in cache")
-        return results
+        Returns:
+            InvertedIndex, or None if no hadiths are available
+        """
+        start = time.perf_counter()
+        if hadiths is None:
+            hadiths = await self._load_cached_hadiths(collection)
+
+        index = await asyncio.to_thread(build_hadith_index, collection, list(hadiths))
+        if not len(index):
+            logger.warning(f"No cached hadiths for '{collection}'; hadith index not built")
+            return None
+
+        await self._store_index(self._hadith_index_key(collection), index, persist)
+
+        logger.info(
+            f"Built hadith index for {collection}: {len(index)} hadiths, "
+            f"{len(index.vocabulary)} terms in {time.perf_counter() - start:.2f}s"
+        )
+        return index
+
+    async def _load_cached_hadiths(self, collection: str) -> list[dict[str, Any]]:
+        """Read every cached ``hadith_range`` batch of a collection."""
+        size = HADITH_COLLECTION_SIZES.get(collection, 0)
+        ranges = [
+            (begin, min(begin + HADITH_RANGE_SIZE - 1, size))
+            for begin in range(1, size + 1, HADITH_RANGE_SIZE)
+        ]
+        batches = await self.cache.get_many(
+            [f"hadith_range:{collection}:{begin}-{end}" for begin, end in ranges], promote=False
+        )
+        return [
+            hadith for batch in batches.values() if batch for hadith in batch.get("hadiths", [])
+        ]
+
+    @staticmethod
+    def _hadith_index_key(collection: str) -> str:
+        return f"hadith_index:{collection}"
+
+    async def warm_search_indexes(
+        self,
+        editions: Iterable[str] = ("quran-uthmani",),
+        collections: Iterable[str] = ("bukhari", "muslim", "malik"),
+    ) -> None:
+        """
+        Load (or build) the search indexes used by the ask endpoints.
+
+        Runs concurrently with request handling: heavy steps run in worker
+        threads and each key is loaded once even if a search asks for it
+        at the same time.
+
+        Args:
+            editions: Quran editions to load
+            collections: Hadith collections to load
+        """
+        await asyncio.gather(
+            *(self.get_quran_index(edition) for edition in editions),
+            *(self.get_hadith_index(collection) for collection in collections),
+        )
 
     async def get_maliki_hadiths_from_cache(self, limit: int = 100) -> list[dict[str, Any]]:
         """
@@ -234,12 +435,9 @@ class CachedContentService:
         Returns:
             List of hadiths from Muwatta Malik
         """
-        hadiths = []
-
-        for hadith_num in range(1, min(limit + 1, 1588)):
-            hadith = await self.get_hadith_from_cache("malik", hadith_num)
-            if hadith:
-                hadiths.append(hadith)
+        keys = [f"hadith_single:malik:{hadith_num}" for hadith_num in range(1, min(limit + 1, 1588))]
+        cached = await self.cache.get_many(keys)
+        hadiths = [cached[key] for key in keys if cached.get(key)]
 
         logger.info(f"Retrieved {len(hadiths)} hadiths from Muwatta Malik")
         return hadiths
@@ -21,6 +21,7 @@ except ImportError:
 
 from loguru import logger
 
+from .rag_registry import get_rag_registry
 from .rag_service import MalikiFiqhRAG
 
 
@@ -85,11 +86,11 @@ if DSPY_AVAILABLE:
             Initialize DSPy RAG system.
 
             Args:
-                rag_service: Existing Qdrant RAG service
+                rag_service: Existing Qdrant RAG service (defaults to the shared registry instance)
                 model_name: LiteLLM model identifier
                 num_passages: Number of context passages to retrieve
             """
-            self.rag = rag_service or MalikiFiqhRAG()
+            self.rag = rag_service or get_rag_registry().maliki_rag
             self.num_passages = num_passages
 
             # Configure DSPy with Gemini via LiteLLM
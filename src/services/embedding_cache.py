@@ -0,0 +1,214 @@
+"""
+Query Embedding Cache for the RAG services.
+
+Popular questions (and the repeated search/context calls inside one
+request) encode the same text over and over. This cache sits in front of
+the SentenceTransformer model:
+
+1. In-process LRU (always on) - keyed on a normalized query
+2. Redis (optional) - shared across workers, vectors stored as float16
+
+Normalization strips Arabic diacritics and tatweel, folds alef/ya
+variants, lowercases and collapses whitespace, so trivially different
+spellings of the same question share one vector.
+
+The cache is synchronous, like the encoder it fronts: a Redis lookup can
+block for up to its 2s socket timeout. Async code must reach it (via RAG
+``search``/``retrieve``/``get_relevant_context``) through
+``asyncio.to_thread``, never directly on the event loop.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from cachetools import LRUCache
+from loguru import logger
+
+from ..config import settings
+
+try:
+    import redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+_ALEF_VARIANTS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي"})
+_TATWEEL = "ـ"
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a query for cache lookups.
+
+    Args:
+        text: Raw query (Arabic or English)
+
+    Returns:
+        Diacritic-free, alef/ya-folded, lowercased text with single spaces
+    """
+    from .fiqh_rag_service import _strip_diacritics
+
+    folded = _strip_diacritics(text or "").replace(_TATWEEL, "").translate(_ALEF_VARIANTS)
+    return _WHITESPACE_RE.sub(" ", folded).strip().lower()
+
+
+def _pack_float16(vector: list[float]) -> bytes:
+    return struct.pack(f"<{len(vector)}e", *vector)
+
+
+def _unpack_float16(data: bytes) -> list[float]:
+    return list(struct.unpack(f"<{len(data) // 2}e", data))
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache of query embeddings.
+
+    Thread-safe: RAG searches run in worker threads (blocking; keep it off the
+    event loop).
+
+    Example:
+        >>> cache = get_embedding_cache()
+        >>> vec = cache.get_or_compute("model", "ما حكم الوضوء", model.encode)
+    """
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        redis_url: str | None = None,
+        ttl: int | None = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: In-process LRU capacity (defaults to settings)
+            redis_url: Redis URL for the shared tier (None disables it)
+            ttl: Redis expiry in seconds (defaults to settings)
+        """
+        self.memory_cache: LRUCache = LRUCache(maxsize=maxsize or settings.embedding_cache_size)
+        self.ttl = ttl or settings.embedding_cache_ttl
+        self._lock = threading.Lock()
+        self.redis_client: Any | None = None
+
+        if redis_url and REDIS_AVAILABLE:
+            try:
+                self.redis_client = redis.Redis.from_url(
+                    redis_url, socket_connect_timeout=2, socket_timeout=2
+                )
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis tier disabled: {e}")
+
+        self.stats = {"hits": 0, "misses": 0, "memory_hits": 0, "redis_hits": 0, "errors": 0}
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """Build the cache key for a model/query pair."""
+        digest = hashlib.md5(f"{model_name}\x00{normalize_query(text)}".encode()).hexdigest()
+        return f"emb:{digest}"
+
+    def get_or_compute(
+        self,
+        model_name: str,
+        text: str,
+        compute: Callable[[str], list[float]],
+    ) -> list[float]:
+        """
+        Return the cached embedding for ``text`` or compute and store it.
+
+        Args:
+            model_name: Embedding model identifier (part of the key)
+            text: Query text; the original text is encoded on a miss
+            compute: Function producing the embedding
+
+        Returns:
+            Embedding vector
+        """
+        key = self.make_key(model_name, text)
+
+        with self._lock:
+            vector = self.memory_cache.get(key)
+            if vector is not None:
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+                return vector
+
+        if self.redis_client is not None:
+            try:
+                data = self.redis_client.get(key)
+                if data:
+                    vector = _unpack_float16(data)
+                    with self._lock:
+                        self.memory_cache[key] = vector
+                        self.stats["hits"] += 1
+                        self.stats["redis_hits"] += 1
+                    return vector
+            except Exception as e:
+                logger.error(f"Embedding cache Redis get error: {e}")
+                self.stats["errors"] += 1
+
+        vector = compute(text)
+        with self._lock:
+            self.memory_cache[key] = vector
+            self.stats["misses"] += 1
+
+        if self.redis_client is not None:
+            try:
+                self.redis_client.setex(key, self.ttl, _pack_float16(vector))
+            except Exception as e:
+                logger.error(f"Embedding cache Redis set error: {e}")
+                self.stats["errors"] += 1
+
+        return vector
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get embedding cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counters and sizes
+        """
+        total_requests = self.stats["hits"] + self.stats["misses"]
+        hit_rate = (self.stats["hits"] / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            **self.stats,
+            "total_requests": total_requests,
+            "hit_rate_percent": round(hit_rate, 2),
+            "redis_enabled": self.redis_client is not None,
+            "memory_cache_size": len(self.memory_cache),
+            "memory_cache_maxsize": self.memory_cache.maxsize,
+        }
+
+    def clear(self) -> None:
+        """Drop all in-process entries and reset counters."""
+        with self._lock:
+            self.memory_cache.clear()
+            self.stats = {key: 0 for key in self.stats}
+
+
+# Global embedding cache instance
+_embedding_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Get or create the global embedding cache.
+
+    Returns:
+        EmbeddingCache instance
+    """
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            redis_url=settings.redis_url if settings.embedding_cache_use_redis else None,
+        )
+    return _embedding_cache
@@ -13,9 +13,11 @@ Design goals:
 
 from __future__ import annotations
 
+import time
 import unicodedata
 import uuid
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from loguru import logger
@@ -24,7 +26,16 @@ from ..config import settings
 # Optional heavy dependencies. Provide lightweight fallbacks for CI/tests.
 try:  # pragma: no cover - import path
     from qdrant_client import QdrantClient  # type: ignore
-    from qdrant_client.models import Distance, PointStruct, VectorParams  # type: ignore
+    from qdrant_client.models import (  # type: ignore
+        Distance,
+        FieldCondition,
+        Filter,
+        FilterSelector,
+        MatchValue,
+        PointStruct,
+        Range,
+        VectorParams,
+    )
 except Exception:  # pragma: no cover - fallback used in minimal CI
     from types import SimpleNamespace
     from math import sqrt
@@ -36,6 +47,49 @@ except Exception:  # pragma: no cover - fallback used in minimal CI
     class VectorParams(SimpleNamespace):  # type: ignore[no-redef]
         pass
 
+    class Filter(SimpleNamespace):  # type: ignore[no-redef]
+        def __init__(self, must: list | None = None) -> None:
+            super().__init__(must=must or [])
+
+    class FieldCondition(SimpleNamespace):  # type: ignore[no-redef]
+        def __init__(self, key: str, match: Any = None, range: Any = None) -> None:
+            super().__init__(key=key, match=match, range=range)
+
+    class MatchValue(SimpleNamespace):  # type: ignore[no-redef]
+        pass
+
+    class Range(SimpleNamespace):  # type: ignore[no-redef]
+        def __init__(self, gt=None, gte=None, lt=None, lte=None) -> None:
+            super().__init__(gt=gt, gte=gte, lt=lt, lte=lte)
+
+    class FilterSelector(SimpleNamespace):  # type: ignore[no-redef]
+        pass
+
+    def _matches(payload: dict, query_filter: Any) -> bool:
+        """Evaluate a ``must`` filter (Filter object or legacy dict) on a payload."""
+        if isinstance(query_filter, dict):
+            return all(
+                payload.get(cond.get("key")) == cond.get("match", {}).get("value")
+                for cond in query_filter.get("must", [])
+            )
+        for cond in query_filter.must:
+            value = payload.get(cond.key)
+            if cond.match is not None and value != cond.match.value:
+                return False
+            bounds = cond.range
+            if bounds is not None:
+                if value is None:
+                    return False
+                if bounds.gt is not None and not value > bounds.gt:
+                    return False
+                if bounds.gte is not None and not value >= bounds.gte:
+                    return False
+                if bounds.lt is not None and not value < bounds.lt:
+                    return False
+                if bounds.lte is not None and not value <= bounds.lte:
+                    return False
+        return True
+
     class _CollectionInfo(SimpleNamespace):
         points_count: int = 0
 
@@ -60,34 +114,31 @@ except Exception:  # pragma: no cover - fallback used in minimal CI
             self._collections.setdefault(collection_name, [])
 
         def upsert(self, collection_name: str, points: list[PointStruct]) -> None:
-            self._collections.setdefault(collection_name, []).extend(points)
+            new_ids = {p.id for p in points}
+            kept = [p for p in self._collections.get(collection_name, []) if p.id not in new_ids]
+            self._collections[collection_name] = kept + list(points)
+
+        def delete(self, collection_name: str, points_selector: FilterSelector) -> None:
+            self._collections[collection_name] = [
+                p
+                for p in self._collections.get(collection_name, [])
+                if not _matches(getattr(p, "payload", {}), points_selector.filter)
+            ]
 
         def search(
             self,
             collection_name: str,
             query_vector: list[float],
             limit: int = 3,
-            query_filter: dict | None = None,
+            query_filter: Any = None,
             score_threshold: float = 0.0,
         ) -> list[SimpleNamespace]:
             items = self._collections.get(collection_name, [])
             results: list[SimpleNamespace] = []
             for p in items:
                 payload = getattr(p, "payload", {})
-                if query_filter:
-                    try:
-                        must = query_filter.get("must", [])
-                        ok = True
-                        for cond in must:
-                            key = cond.get("key")
-                            val = cond.get("match", {}).get("value")
-                            if payload.get(key) != val:
-                                ok = False
-                                break
-                        if not ok:
-                            continue
-                    except Exception:
-                        pass
+                if query_filter and not _matches(payload, query_filter):
+                    continue
                 score = _cosine(query_vector, getattr(p, "vector", []))
                 if score >= score_threshold:
                     results.append(SimpleNamespace(id=p.id, payload=p.payload, score=score))
@@ -111,7 +162,14 @@ except Exception:  # pragma: no cover - lightweight embedder
             # Use a fixed dimensionality to keep stats stable
             self.embedding_dim: int = 256
 
-        def encode(self, text: str, convert_to_numpy: bool = False) -> list[float]:
+        def encode(
+            self, text: str | list[str], convert_to_numpy: bool = False, **_kwargs: Any
+        ) -> list[float] | list[list[float]]:
+            if isinstance(text, list):
+                return [self._encode_one(t) for t in text]
+            return self._encode_one(text)
+
+        def _encode_one(self, text: str) -> list[float]:
             text = (text or "").lower()
             dim = self.embedding_dim
             vec = [0.0] * dim
@@ -138,6 +196,11 @@ def _strip_diacritics(text: str) -> str:
     return "".join(ch for ch in normalized if unicodedata.category(ch) != "Mn")
 
 
+def _as_vector(embedding: Any) -> list[float]:
+    """Convert an encoder output (numpy array or list) to a plain float list."""
+    return embedding.tolist() if hasattr(embedding, "tolist") else list(embedding)
+
+
 def normalize_madhab_name(name: str) -> str | None:
     """Normalize various inputs (English/Arabic/Case) to canonical madhab key.
 
@@ -178,6 +241,84 @@ def collection_for_madhab(madhab_key: str) -> str:
     return f"{madhab_key}_fiqh"
 
 
+class RetrievalResult:
+    """Chunks from a single retrieval pass plus lazily built prompt context.
+
+    Callers that need both the raw chunks (for citations/headers) and the
+    formatted context get them from one embedding and one search round.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        chunks: list[dict[str, Any]],
+        by_madhab: dict[str, list[dict[str, Any]]] | None = None,
+    ) -> None:
+        self.query = query
+        self.chunks = chunks
+        self.by_madhab = by_madhab or {}
+        self._contexts: dict[tuple[int, float], str] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.chunks)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def context(self, max_context_length: int = 2000, min_score: float = 0.0) -> str:
+        """Format chunks as citation-ready context within a character budget.
+
+        Args:
+            max_context_length: Maximum number of characters of context
+            min_score: Skip chunks scoring below this value
+
+        Returns:
+            Formatted context ("" when nothing qualifies)
+        """
+        key = (max_context_length, min_score)
+        if key not in self._contexts:
+            self._contexts[key] = self._format(max_context_length, min_score)
+        return self._contexts[key]
+
+    def formatted_chunks(self, min_score: float = 0.0) -> list[tuple[dict[str, Any], str]]:
+        """Format each chunk scoring at least ``min_score`` as a citation block.
+
+        Args:
+            min_score: Skip chunks scoring below this value
+
+        Returns:
+            (chunk, formatted text) pairs in retrieval order
+        """
+        selected = [r for r in self.chunks if r.get("score", 0.0) >= min_score]
+        blocks = []
+        for i, r in enumerate(selected, 1):
+            meta = r.get("metadata", {})
+            blocks.append(
+                (
+                    r,
+                    f"---\n"
+                    f"**[Source {i}]** {meta.get('topic', 'Unknown')}\n"
+                    f"**Madhab**: {meta.get('madhab', '')} | **Category**: {meta.get('category', 'General')} | "
+                    f"**Relevance**: {r.get('score', 0.0):.2f}\n"
+                    f"**References**: {meta.get('references', '')}\n\n"
+                    f"{(r.get('text') or '').strip()}\n"
+                    f"---\n",
+                )
+            )
+        return blocks
+
+    def _format(self, max_context_length: int, min_score: float) -> str:
+        parts: list[str] = []
+        total_len = 0
+        for _, formatted in self.formatted_chunks(min_score):
+            if total_len + len(formatted) > max_context_length:
+                break
+            parts.append(formatted)
+            total_len += len(formatted)
+
+        return "\n".join(parts)
+
+
 class FiqhRAG:
     """Generic multi-collection RAG over the four Sunni madhabs.
 
@@ -189,6 +330,9 @@ class FiqhRAG:
         persist_directory: str = "./qdrant_db",
         embedding_model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
         create_all_collections: bool = True,
+        client: QdrantClient | None = None,
+        embedding_model: Any | None = None,
+        embedding_cache: Any | None = None,
     ) -> None:
         """Initialize Qdrant client and embedding model.
 
@@ -196,20 +340,31 @@ class FiqhRAG:
             persist_directory: Local Qdrant path
             embedding_model_name: Sentence-Transformers model name
             create_all_collections: Ensure all four collections exist
+            client: Existing Qdrant client to reuse instead of opening one
+            embedding_model: Already-loaded embedding model to reuse
+            embedding_cache: Optional EmbeddingCache used for query vectors
         """
         try:
+            if client is not None:
+                self.client = client
             # Prefer external Qdrant server if configured
-            if getattr(settings, "qdrant_url", None):
+            elif getattr(settings, "qdrant_url", None):
                 logger.info(f"Connecting to Qdrant server at {settings.qdrant_url}")
                 self.client = QdrantClient(url=settings.qdrant_url)
             else:
                 logger.info(f"Using embedded Qdrant at path {persist_directory}")
                 self.client = QdrantClient(path=persist_directory)
 
-            logger.info("Loading multilingual embedding model for FiqhRAG...")
-            self.embedding_model = SentenceTransformer(embedding_model_name)
+            if embedding_model is not None:
+                self.embedding_model = embedding_model
+            else:
+                logger.info("Loading multilingual embedding model for FiqhRAG...")
+                self.embedding_model = SentenceTransformer(embedding_model_name)
             # Use model-provided dimension if available; default to 384
             self.embedding_dim = getattr(self.embedding_model, "embedding_dim", 384)
+            self._search_pool: ThreadPoolExecutor | None = None
+            self.embedding_model_name = embedding_model_name
+            self.embedding_cache = embedding_cache
 
             if create_all_collections:
                 for key in MADHAB_KEYS:
@@ -234,6 +389,30 @@ class FiqhRAG:
             )
             logger.info(f"✅ Created collection: {collection_name}")
 
+    # ---------------------------
+    # Embeddings
+    # ---------------------------
+    def _embed(self, text: str) -> list[float]:
+        """Encode a single text into a plain float vector."""
+        return _as_vector(self.embedding_model.encode(text, convert_to_numpy=True))
+
+    def _embed_query(self, query: str) -> list[float]:
+        """Encode a search query, served from the embedding cache when configured."""
+        if self.embedding_cache is None:
+            return self._embed(query)
+        return self.embedding_cache.get_or_compute(
+            self.embedding_model_name, query, self._embed
+        )
+
+    def _embed_batch(self, texts: list[str], batch_size: int = 64) -> list[list[float]]:
+        """Encode many texts with one batched model call."""
+        if not texts:
+            return []
+        vectors = self.embedding_model.encode(
+            texts, batch_size=batch_size, convert_to_numpy=True
+        )
+        return [_as_vector(v) for v in vectors]
+
     # ---------------------------
     # Ingestion
     # ---------------------------
@@ -254,7 +433,7 @@ class FiqhRAG:
             self._ensure_collection(collection_name)
 
             # Embed (using original text; diacritics removal optional)
-            vector = self.embedding_model.encode(text, convert_to_numpy=True).tolist()
+            vector = self._embed(text)
 
             point = PointStruct(
                 id=str(uuid.uuid4()),
@@ -275,92 +454,232 @@ class FiqhRAG:
             logger.error(f"Error adding document: {exc}")
             return False
 
+    def add_documents(
+        self,
+        documents: Iterable[dict[str, Any]],
+        batch_size: int = 64,
+        log_every: int = 1000,
+    ) -> dict[str, Any]:
+        """Bulk-ingest documents, encoding and upserting in batches.
+
+        Documents are consumed lazily and buffered per madhab collection; a
+        buffer is encoded with one model call and upserted as one point batch
+        once it reaches ``batch_size``, so large JSONL exports can be streamed
+        without holding them in memory.
+
+        Args:
+            documents: Iterable of ``{"text": str, "metadata": dict}`` items
+                (the shape produced by ``to_ingestion_stream``)
+            batch_size: Texts per encode call and points per upsert
+            log_every: Log a progress/throughput line every N added documents
+
+        Returns:
+            Report with added/failed/skipped counts, per-madhab totals,
+            elapsed seconds and throughput in documents per second
+        """
+        batch_size = max(1, batch_size)
+        buffers: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+        ensured: set[str] = set()
+        report: dict[str, Any] = {"added": 0, "failed": 0, "skipped": 0, "collections": {}}
+        start = time.perf_counter()
+        next_log = log_every
+
+        def flush(madhab_key: str) -> None:
+            nonlocal next_log
+            items = buffers.pop(madhab_key, [])
+            if not items:
+                return
+            collection_name = collection_for_madhab(madhab_key)
+            try:
+                if collection_name not in ensured:
+                    self._ensure_collection(collection_name)
+                    ensured.add(collection_name)
+                vectors = self._embed_batch([text for text, _ in items], batch_size)
+                points = [
+                    PointStruct(
+                        id=str(uuid.uuid4()),
+                        vector=vector,
+                        payload={"text": text, **metadata, "madhab": madhab_key},
+                    )
+                    for (text, metadata), vector in zip(items, vectors, strict=True)
+                ]
+                self.client.upsert(collection_name=collection_name, points=points)
+                report["added"] += len(points)
+                report["collections"][madhab_key] = (
+                    report["collections"].get(madhab_key, 0) + len(points)
+                )
+            except Exception as exc:
+                logger.error(f"Batch upsert to {collection_name} failed: {exc}")
+                report["failed"] += len(items)
+                return
+
+            if log_every and report["added"] >= next_log:
+                elapsed = time.perf_counter() - start
+                logger.info(
+                    "Ingested {} documents ({:.1f} docs/s)",
+                    report["added"],
+                    report["added"] / elapsed if elapsed > 0 else 0.0,
+                )
+                next_log += log_every
+
+        for doc in documents:
+            text = doc.get("text") or ""
+            metadata = doc.get("metadata") or {}
+            madhab_raw = metadata.get("madhab")
+            madhab_key = normalize_madhab_name(str(madhab_raw)) if madhab_raw else None
+            if not text.strip() or not madhab_key:
+                report["skipped"] += 1
+                continue
+            buffer = buffers.setdefault(madhab_key, [])
+            buffer.append((text, metadata))
+            if len(buffer) >= batch_size:
+                flush(madhab_key)
+
+        for key in list(buffers):
+            flush(key)
+
+        elapsed = time.perf_counter() - start
+        report["seconds"] = round(elapsed, 3)
+        report["docs_per_second"] = round(report["added"] / elapsed, 1) if elapsed > 0 else 0.0
+        logger.info(
+            "✅ Bulk ingestion finished: {} added, {} failed, {} skipped in {}s ({} docs/s)",
+            report["added"],
+            report["failed"],
+            report["skipped"],
+            report["seconds"],
+            report["docs_per_second"],
+        )
+        return report
+
     # ---------------------------
     # Search
     # ---------------------------
-    def search(
+    def _get_search_pool(self) -> ThreadPoolExecutor:
+        """Thread pool used to fan a query out to several collections at once."""
+        if self._search_pool is None:
+            self._search_pool = ThreadPoolExecutor(
+                max_workers=len(MADHAB_KEYS), thread_name_prefix="fiqh-search"
+            )
+        return self._search_pool
+
+    def _search_collections(
+        self,
+        q_vec: list[float],
+        selected: list[str],
+        limit: int,
+        query_filter: Filter | None,
+        score_threshold: float,
+    ) -> dict[str, list[Any]]:
+        """Search the selected collections concurrently with one query vector.
+
+        Latency is bounded by the slowest collection rather than their sum. A
+        failing collection yields an empty list instead of failing the search.
+        """
+
+        def run(key: str) -> tuple[str, list[Any]]:
+            cname = collection_for_madhab(key)
+            try:
+                return key, self.client.search(
+                    collection_name=cname,
+                    query_vector=q_vec,
+                    limit=limit,
+                    query_filter=query_filter,
+                    score_threshold=score_threshold,
+                )
+            except Exception as exc:
+                logger.warning(f"Search failed for {cname}: {exc}")
+                return key, []
+
+        if len(selected) == 1:
+            return dict([run(selected[0])])
+        return dict(self._get_search_pool().map(run, selected))
+
+    @staticmethod
+    def _format_result(madhab_key: str, r: Any) -> dict[str, Any]:
+        """Convert a Qdrant scored point to the app's result dict."""
+        payload = r.payload or {}
+        return {
+            "text": payload.get("text", ""),
+            "metadata": {
+                "topic": payload.get("topic", ""),
+                "category": payload.get("category", ""),
+                "source": payload.get("source", ""),
+                "references": payload.get("references", ""),
+                "madhab": madhab_key,
+                "book_title": payload.get("book_title", ""),
+                "author": payload.get("author", ""),
+                "page": payload.get("page"),
+                "chunk_index": payload.get("chunk_index"),
+            },
+            "score": float(getattr(r, "score", 0.0) or 0.0),
+            "id": str(getattr(r, "id", "")),
+        }
+
+    def search_with_breakdown(
         self,
         query: str,
         n_results: int = 3,
         madhabs: Iterable[str] | None = None,
         category_filter: str | None = None,
         score_threshold: float = 0.5,
-    ) -> list[dict[str, Any]]:
-        """Search across one or more madhab collections and merge results.
+    ) -> dict[str, Any]:
+        """Search selected madhab collections concurrently in a single pass.
+
+        The query is encoded once and the same vector is sent to every
+        selected collection in parallel.
 
         Args:
             query: Search text (Arabic/English)
-            n_results: Total results to return globally
+            n_results: Results to keep globally and per madhab
             madhabs: Iterable of school names; default: all four
             category_filter: Optional category payload filter
             score_threshold: Minimum similarity score (0..1)
+
+        Returns:
+            ``{"merged": [...], "by_madhab": {madhab: [...]}}`` where ``merged``
+            holds the global top ``n_results`` and ``by_madhab`` the top
+            ``n_results`` of each selected school (empty list when none match)
         """
+        empty: dict[str, Any] = {"merged": [], "by_madhab": {}}
         try:
             if not query.strip():
-                return []
+                return empty
 
-            # Normalize selected madhabs (default all)
+            # Normalize selected madhabs (default all), preserving order without duplicates
             selected = [normalize_madhab_name(m) for m in (madhabs or MADHAB_KEYS)]
-            selected = [m for m in selected if m]
+            selected = list(dict.fromkeys(m for m in selected if m))
             if not selected:
                 selected = list(MADHAB_KEYS)
 
             # Single query embedding reused across collections
-            q_vec = self.embedding_model.encode(query, convert_to_numpy=True).tolist()
+            q_vec = self._embed_query(query)
 
             # Optional filter
             query_filter = None
             if category_filter:
-                query_filter = {"must": [{"key": "category", "match": {"value": category_filter}}]}
-
-            per_collection_results: list[tuple[str, Any]] = []
-            for key in selected:
-                cname = collection_for_madhab(key)
-                try:
-                    results = self.client.search(
-                        collection_name=cname,
-                        query_vector=q_vec,
-                        limit=n_results,  # fetch up to n per collection, merge later
-                        query_filter=query_filter,
-                        score_threshold=score_threshold,
-                    )
-                    for r in results:
-                        per_collection_results.append((key, r))
-                except Exception as exc:
-                    logger.warning(f"Search failed for {cname}: {exc}")
-                    continue
+                query_filter = Filter(
+                    must=[FieldCondition(key="category", match=MatchValue(value=category_filter))]
+                )
 
-            # Merge globally by score desc; stable tiebreak by (madhab, id)
-            merged: list[dict[str, Any]] = []
-            per_collection_results.sort(
-                key=lambda t: (
-                    float(getattr(t[1], "score", 0.0) or 0.0),
-                    t[0],
-                    str(getattr(t[1], "id", "")),
-                ),
-                reverse=True,
+            raw_by_madhab = self._search_collections(
+                q_vec,
+                selected,
+                limit=n_results,  # fetch up to n per collection, merge later
+                query_filter=query_filter,
+                score_threshold=score_threshold,
             )
 
-            for key, r in per_collection_results[:n_results]:
-                payload = r.payload or {}
-                merged.append(
-                    {
-                        "text": payload.get("text", ""),
-                        "metadata": {
-                            "topic": payload.get("topic", ""),
-                            "category": payload.get("category", ""),
-                            "source": payload.get("source", ""),
-                            "references": payload.get("references", ""),
-                            "madhab": key,
-                            "book_title": payload.get("book_title", ""),
-                            "author": payload.get("author", ""),
-                            "page": payload.get("page"),
-                            "chunk_index": payload.get("chunk_index"),
-                        },
-                        "score": float(getattr(r, "score", 0.0) or 0.0),
-                        "id": str(getattr(r, "id", "")),
-                    }
-                )
+            by_madhab = {
+                key: [self._format_result(key, r) for r in raw_by_madhab.get(key, [])]
+                for key in selected
+            }
+
+            # Merge globally by score desc; stable tiebreak by (madhab, id)
+            merged = sorted(
+                (item for items in by_madhab.values() for item in items),
+                key=lambda item: (item["score"], item["metadata"]["madhab"], item["id"]),
+                reverse=True,
+            )[:n_results]
 
             logger.info(
                 "Merged {} results across {} collections for query: {}...",
@@ -368,10 +687,64 @@ class FiqhRAG:
                 len(selected),
                 query[:60],
             )
-            return merged
+            return {"merged": merged, "by_madhab": by_madhab}
         except Exception as exc:
             logger.error(f"Error during multi-collection search: {exc}")
-            return []
+            return empty
+
+    def search(
+        self,
+        query: str,
+        n_results: int = 3,
+        madhabs: Iterable[str] | None = None,
+        category_filter: str | None = None,
+        score_threshold: float = 0.5,
+    ) -> list[dict[str, Any]]:
+        """Search across one or more madhab collections and merge results.
+
+        Args:
+            query: Search text (Arabic/English)
+            n_results: Total results to return globally
+            madhabs: Iterable of school names; default: all four
+            category_filter: Optional category payload filter
+            score_threshold: Minimum similarity score (0..1)
+        """
+        return self.search_with_breakdown(
+            query,
+            n_results=n_results,
+            madhabs=madhabs,
+            category_filter=category_filter,
+            score_threshold=score_threshold,
+        )["merged"]
+
+    def retrieve(
+        self,
+        query: str,
+        n_results: int = 5,
+        madhabs: Iterable[str] | None = None,
+        category_filter: str | None = None,
+        score_threshold: float = 0.25,
+    ) -> RetrievalResult:
+        """Run one search pass and wrap it for both chunks and context.
+
+        Args:
+            query: Search text (Arabic/English)
+            n_results: Total results to return globally
+            madhabs: Iterable of school names; default: all four
+            category_filter: Optional category payload filter
+            score_threshold: Minimum similarity score (0..1)
+
+        Returns:
+            RetrievalResult with raw chunks and a lazy ``context()`` formatter
+        """
+        breakdown = self.search_with_breakdown(
+            query,
+            n_results=n_results,
+            madhabs=madhabs,
+            category_filter=category_filter,
+            score_threshold=score_threshold,
+        )
+        return RetrievalResult(query, breakdown["merged"], breakdown["by_madhab"])
 
     def get_relevant_context(
         self,
@@ -380,29 +753,9 @@ class FiqhRAG:
         madhabs: Iterable[str] | None = None,
     ) -> str:
         """Build formatted, citation-ready context across selected madhabs."""
-        results = self.search(query, n_results=5, madhabs=madhabs, score_threshold=0.3)
-        if not results:
-            return ""
-
-        parts: list[str] = []
-        total_len = 0
-        for i, r in enumerate(results, 1):
-            meta = r.get("metadata", {})
-            formatted = (
-                f"---\n"
-                f"**[Source {i}]** {meta.get('topic', 'Unknown')}\n"
-                f"**Madhab**: {meta.get('madhab', '')} | **Category**: {meta.get('category', 'General')} | "
-                f"**Relevance**: {r.get('score', 0.0):.2f}\n"
-                f"**References**: {meta.get('references', '')}\n\n"
-                f"{(r.get('text') or '').strip()}\n"
-                f"---\n"
-            )
-            if total_len + len(formatted) > max_context_length:
-                break
-            parts.append(formatted)
-            total_len += len(formatted)
-
-        return "\n".join(parts)
+        return self.retrieve(
+            query, n_results=5, madhabs=madhabs, score_threshold=0.3
+        ).context(max_context_length)
 
     # ---------------------------
     # Monitoring/Stats
@@ -433,13 +786,18 @@ class FiqhRAG:
                 }
         return stats
 
-
-# Singleton convenience (optional)
-_fiqh_rag_singleton: FiqhRAG | None = None
+    def close(self) -> None:
+        """Shut down the search pool and release the Qdrant client."""
+        if self._search_pool is not None:
+            self._search_pool.shutdown(wait=False)
+            self._search_pool = None
+        close = getattr(self.client, "close", None)
+        if callable(close):
+            close()
 
 
 def get_fiqh_rag() -> FiqhRAG:
-    global _fiqh_rag_singleton
-    if _fiqh_rag_singleton is None:
-        _fiqh_rag_singleton = FiqhRAG()
-    return _fiqh_rag_singleton
+    """Return the process-wide FiqhRAG owned by the RAG registry."""
+    from .rag_registry import get_rag_registry
+
+    return get_rag_registry().fiqh_rag
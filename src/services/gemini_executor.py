@@ -0,0 +1,236 @@
+"""
+Bounded Executor for Gemini SDK Calls.
+
+The ``google.generativeai`` SDK is blocking, so Gemini calls run in worker
+threads. Sharing asyncio's default thread pool gave them no limit and no
+visibility: a burst of /ask requests could occupy every default worker
+and starve other ``to_thread`` users (RAG retrieval, classifiers).
+
+``GeminiExecutor`` runs them on a dedicated pool with a concurrency cap.
+Requests beyond the cap wait in a visible queue, every call has a
+deadline, and abandoned streams (client disconnects) stop pulling chunks
+from the SDK. A slot is only released when its worker thread finishes,
+so timed-out calls still count against the cap until Gemini returns.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from loguru import logger
+
+from ..config import settings
+from ..utils.metrics import LatencyHistogram
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _StreamError:
+    """Wraps an exception raised by a stream producer thread."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class GeminiExecutor:
+    """
+    Dedicated, bounded thread pool for blocking Gemini SDK calls.
+
+    Example:
+        >>> executor = get_gemini_executor()
+        >>> response = await executor.run(lambda: model.generate_content(prompt))
+        >>> async for text in executor.stream(lambda: iter_chunks(prompt)):
+        ...     print(text, end="")
+    """
+
+    def __init__(self, max_concurrency: int | None = None, timeout: float | None = None) -> None:
+        """
+        Initialize the executor.
+
+        Args:
+            max_concurrency: Concurrent Gemini calls (defaults to settings)
+            timeout: Per-request deadline in seconds (defaults to settings)
+        """
+        self.max_concurrency = max_concurrency or settings.gemini_max_concurrency
+        self.timeout = timeout or settings.gemini_request_timeout
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="gemini"
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.active = 0
+        self.queued = 0
+        self.stats = {"completed": 0, "errors": 0, "timeouts": 0, "cancelled": 0}
+        self.queue_wait = LatencyHistogram()
+
+    async def _acquire(self) -> None:
+        self.queued += 1
+        started = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.queue_wait.observe(time.perf_counter() - started)
+        self.active += 1
+
+    def _release(self, _future: Any = None) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+    async def run(self, fn: Callable[[], T], timeout: float | None = None) -> T:
+        """
+        Run a blocking call on the Gemini pool.
+
+        Args:
+            fn: Zero-argument callable doing the SDK call
+            timeout: Deadline in seconds (defaults to the executor's)
+
+        Returns:
+            The callable's result
+
+        Raises:
+            asyncio.TimeoutError: If the deadline passes (including queue time)
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        try:
+            await asyncio.wait_for(self._acquire(), timeout=timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+
+        future = asyncio.get_running_loop().run_in_executor(self._pool, fn)
+        # The slot is freed when the thread finishes, not when the caller gives up
+        future.add_done_callback(self._release)
+        try:
+            result = await asyncio.wait_for(
+                asyncio.shield(future), timeout=max(deadline - time.monotonic(), 0)
+            )
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        self.stats["completed"] += 1
+        return result
+
+    async def stream(
+        self, fn: Callable[[], Iterable[T]], timeout: float | None = None
+    ) -> AsyncIterator[T]:
+        """
+        Iterate a blocking SDK stream on the Gemini pool.
+
+        Closing the returned iterator early (e.g. the HTTP client
+        disconnected) stops the worker thread at the next chunk.
+
+        Args:
+            fn: Zero-argument callable returning a blocking iterator
+            timeout: Deadline in seconds for the whole stream
+
+        Yields:
+            Items produced by the blocking iterator
+
+        Raises:
+            asyncio.TimeoutError: If the deadline passes before the stream ends
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        try:
+            await asyncio.wait_for(self._acquire(), timeout=timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[Any] = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def produce() -> None:
+            iterator = None
+            try:
+                iterator = iter(fn())
+                for item in iterator:
+                    if cancelled.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            except BaseException as e:  # noqa: BLE001 - forwarded to the consumer
+                loop.call_soon_threadsafe(queue.put_nowait, _StreamError(e))
+            finally:
+                close = getattr(iterator, "close", None)
+                if cancelled.is_set() and close is not None:
+                    try:
+                        close()
+                    except Exception:
+                        pass
+                loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+        future = loop.run_in_executor(self._pool, produce)
+        future.add_done_callback(self._release)
+
+        outcome = None
+        try:
+            while True:
+                item = await asyncio.wait_for(
+                    queue.get(), timeout=max(deadline - time.monotonic(), 0)
+                )
+                if item is _DONE:
+                    outcome = "completed"
+                    break
+                if isinstance(item, _StreamError):
+                    outcome = "errors"
+                    raise item.error
+                yield item
+        except asyncio.TimeoutError:
+            outcome = "timeouts"
+            raise
+        finally:
+            if outcome not in ("completed", "errors"):
+                # Timed out, or the consumer stopped iterating: stop the producer
+                cancelled.set()
+                logger.debug("Gemini stream abandoned before completion, stopping producer")
+            self.stats[outcome or "cancelled"] += 1
+
+    def shutdown(self) -> None:
+        """Stop accepting work and drop queued calls."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get executor statistics.
+
+        Returns:
+            Dictionary with active/queued calls, outcome counters and queue wait
+        """
+        return {
+            **self.stats,
+            "active": self.active,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout,
+            "queue_wait": self.queue_wait.snapshot(),
+        }
+
+
+# Global Gemini executor instance
+_gemini_executor: GeminiExecutor | None = None
+
+
+def get_gemini_executor() -> GeminiExecutor:
+    """
+    Get or create the global Gemini executor.
+
+    Returns:
+        GeminiExecutor instance
+    """
+    global _gemini_executor
+    if _gemini_executor is None:
+        _gemini_executor = GeminiExecutor()
+    return _gemini_executor
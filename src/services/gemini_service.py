@@ -12,6 +12,7 @@ import google.generativeai as genai
 from loguru import logger
 
 from ..config import settings
+from ..utils.prompt_budget import ContextAssembler, prompt_token_report, split_markdown_sections
 from ..utils.question_classifier import (
     detect_arabic_dialect,
     get_response_instructions,
@@ -19,6 +20,7 @@ from ..utils.question_classifier import (
     is_fiqh_question,
     wants_sources,
 )
+from .gemini_executor import get_gemini_executor
 
 if TYPE_CHECKING:
     pass
@@ -27,12 +29,13 @@ if TYPE_CHECKING:
 class GeminiService:
     """Service for interacting with Google Gemini AI."""
 
-    def __init__(self, enable_rag: bool = True) -> None:
+    def __init__(self, enable_rag: bool = True, rag: Any | None = None) -> None:
         """
         Initialize the Gemini service with optional RAG.
 
         Args:
             enable_rag: Whether to enable Maliki fiqh RAG system
+            rag: RAG service to use (defaults to the shared registry instance)
 
         Configures the Gemini API with the provided API key and sets up
         the generative model with optional RAG enhancement.
@@ -48,14 +51,15 @@ class GeminiService:
                 logger.warning("Gemini API key not configured - Gemini provider will not be available")
 
             # Initialize RAG if enabled
-            self.rag = None
-            if enable_rag:
+            self.rag = rag
+            if self.rag is None and enable_rag:
                 try:
                     # Lazy import to avoid heavy deps at import time
-                    from .fiqh_rag_service import FiqhRAG  # type: ignore
+                    from .rag_registry import get_rag_registry
 
-                    self.rag = FiqhRAG()
-                    logger.info("✅ RAG system enabled for multi-madhab fiqh")
+                    # Shared, process-wide instance (model loaded once at startup)
+                    self.rag = get_rag_registry().fiqh_rag
+                    logger.debug("RAG system enabled for multi-madhab fiqh")
                 except Exception as rag_error:
                     logger.warning(
                         f"RAG initialization failed (will continue without RAG): {rag_error}"
@@ -114,7 +118,7 @@ class GeminiService:
                     generation_config=generation_config,
                 )
 
-            response = await asyncio.to_thread(_generate_sync)
+            response = await get_gemini_executor().run(_generate_sync)
 
             if response.text:
                 logger.info("Content generated successfully")
@@ -260,25 +264,22 @@ Provide:
         rag_chunks: list[dict[str, Any]] = []
         if is_fiqh and self.rag:
             try:
-                rag_results = self.rag.search(
+                retrieval = await asyncio.to_thread(
+                    self.rag.retrieve,
                     question,
                     n_results=5,
                     madhabs=madhabs,
                     score_threshold=0.25,
                 )
-                rag_chunks = rag_results
-                rag_context = self.rag.get_relevant_context(
-                    question,
-                    max_context_length=1500,
-                    madhabs=madhabs,
-                )
+                rag_chunks = retrieval.chunks
+                rag_context = retrieval.context(max_context_length=1500, min_score=0.3)
                 if rag_context:
                     logger.info(
                         "✅ RAG context retrieved for {} question with {} chunks",
                         question_category,
-                        len(rag_results),
+                        len(rag_chunks),
                     )
-                    logger.debug("RAG chunks: {}", rag_results)
+                    logger.debug("RAG chunks: {}", rag_chunks)
             except Exception as e:
                 logger.warning(f"RAG search failed: {e}")
 
@@ -389,16 +390,15 @@ Do NOT show source citations unless user explicitly requests them.
         rag_context = ""
         rag_chunks: list[dict[str, Any]] = []
         if self.rag:
-            rag_results = self.rag.search(
+            retrieval = await asyncio.to_thread(
+                self.rag.retrieve,
                 question,
                 n_results=5,
                 madhabs=madhabs,
                 score_threshold=0.25,
             )
-            rag_chunks = rag_results
-            rag_context = self.rag.get_relevant_context(
-                question, max_context_length=1500, madhabs=madhabs
-            )
+            rag_chunks = retrieval.chunks
+            rag_context = retrieval.context(max_context_length=1500, min_score=0.3)
         if not rag_context:
             raise RuntimeError("Maliki fiqh context unavailable")
 
@@ -457,27 +457,8 @@ Hide explicit reference citations unless asked. Answer with structured sections.
                 if text:
                     yield text
 
-        async def iterator():
-            loop = asyncio.get_running_loop()
-            queue: asyncio.Queue[str] = asyncio.Queue()
-
-            def producer():
-                try:
-                    for piece in _sync_stream():
-                        asyncio.run_coroutine_threadsafe(queue.put(piece), loop)
-                finally:
-                    asyncio.run_coroutine_threadsafe(queue.put(None), loop)
-
-            loop.run_in_executor(None, producer)
-
-            while True:
-                item = await queue.get()
-                if item is None:
-                    break
-                yield item
-
         return {
-            "stream": iterator(),
+            "stream": get_gemini_executor().stream(_sync_stream),
             "rag_chunks": rag_chunks,
         }
 
@@ -894,9 +875,10 @@ Be warm, understanding, and supportive. Return Quran and Hadith texts exactly as
             language: Response language
             madhab_results: Dictionary mapping madhab keys to their search results
             cached_quran_hadith: Dictionary with quran and hadith from cache
+            web_context: Scraped web context (packed into the prompt budget)
 
         Returns:
-            Response with orchestrated answer
+            Response with orchestrated answer and prompt token estimates
         """
         from ..utils.question_classifier import detect_arabic_dialect, is_arabic_text, get_response_instructions
 
@@ -914,38 +896,55 @@ Be warm, understanding, and supportive. Return Quran and Hadith texts exactly as
         is_fiqh, category = is_fiqh_question(question)
         scholar_role = get_response_instructions(is_fiqh, category, language)
 
-        # Format madhab results
-        madhab_contexts = []
+        # Offer every source to the budgeted assembler: verified Quran/Hadith
+        # texts first, then madhab results by relevance, then web sections
+        assembler = ContextAssembler(provider="gemini", model=settings.gemini_model)
         for madhab, results in (madhab_results or {}).items():
-            if results:
-                madhab_text = f"\n=== {madhab.upper()} MADHAB RESULTS ===\n"
-                for result in results[:3]:  # Top 3 per madhab
-                    text = result.get("text", "")
-                    metadata = result.get("metadata", {})
-                    ref = metadata.get("references", "")
-                    if text:
-                        madhab_text += f"{text}\n"
-                        if ref:
-                            madhab_text += f"Reference: {ref}\n"
-                madhab_contexts.append(madhab_text)
+            for result in (results or [])[:3]:  # Top 3 per madhab
+                text = result.get("text", "")
+                ref = result.get("metadata", {}).get("references", "")
+                if text:
+                    assembler.add(
+                        madhab,
+                        f"{text}\n" + (f"Reference: {ref}\n" if ref else ""),
+                        score=result.get("score", 0.0),
+                    )
 
         # Format Quran/Hadith from cache (DO NOT MODIFY)
-        quran_texts = []
-        for q in (cached_quran_hadith or {}).get("quran", []):
+        for rank, q in enumerate((cached_quran_hadith or {}).get("quran", [])):
             verse_key = q.get("surah", {}).get("number", "") if isinstance(q.get("surah"), dict) else ""
             verse_num = q.get("numberInSurah", "")
             text = q.get("text", "")
             if text:
-                quran_texts.append(f"[Quran {verse_key}:{verse_num}]\n{text}\n")
+                assembler.add(
+                    "quran", f"[Quran {verse_key}:{verse_num}]\n{text}\n", score=2.0 - rank * 0.01
+                )
 
-        hadith_texts = []
-        for h in (cached_quran_hadith or {}).get("hadith", []):
+        for rank, h in enumerate((cached_quran_hadith or {}).get("hadith", [])):
             collection = h.get("collection", "").title()
             number = h.get("number", "")
             arab = h.get("arab", "")
             text = h.get("text", "")
             if arab or text:
-                hadith_texts.append(f"[Hadith {collection} #{number}]\n{arab}\n{text}\n")
+                assembler.add(
+                    "hadith",
+                    f"[Hadith {collection} #{number}]\n{arab}\n{text}\n",
+                    score=1.5 - rank * 0.01,
+                )
+
+        for rank, section in enumerate(split_markdown_sections(web_context or "")):
+            assembler.add("web", section, score=-rank * 0.001)
+
+        packed = assembler.assemble()
+        sections = packed["sections"]
+        madhab_contexts = [
+            f"\n=== {madhab.upper()} MADHAB RESULTS ===\n" + "".join(sections[madhab])
+            for madhab in (madhab_results or {})
+            if sections.get(madhab)
+        ]
+        quran_texts = sections.get("quran", [])
+        hadith_texts = sections.get("hadith", [])
+        web_context = "\n\n".join(sections.get("web", []))
 
         web_section = f"\n\n### Web Context (scraped)\n\n{web_context}\n" if web_context else ""
 
@@ -995,4 +994,5 @@ IMPORTANT:
                 "web": web_context or "",
             },
             "rag_chunks": rag_chunks,
+            "prompt_tokens": prompt_token_report(prompt, packed, "gemini", settings.gemini_model),
         }
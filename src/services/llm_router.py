@@ -0,0 +1,323 @@
+"""
+Multi-Provider LLM Router.
+
+``MultiLLMService`` talks to exactly one provider and returns None on
+failure. The router sits above it and treats a request as an ordered list
+of routes (provider, model, API key): the user's choice first, then the
+backups from ``settings.llm_fallback_routes``.
+
+- Failover: a route that errors, times out or returns nothing immediately
+  hands the request to the next route.
+- Hedging: if the running route is slower than its own p95 latency, the
+  next route is started too and the first answer wins; the loser is
+  cancelled.
+- Health: per-provider latency histograms and a sliding window of
+  outcomes. Unhealthy providers (high recent error rate) are moved to the
+  back, and healthy backups are tried fastest (p50) first.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any
+
+from loguru import logger
+
+from ..config import settings
+from ..utils.metrics import LatencyHistogram
+from .multi_llm_service import MultiLLMService
+
+
+class ProviderHealth:
+    """Latency and recent outcomes of one provider."""
+
+    def __init__(self, window: int) -> None:
+        """
+        Initialize empty health data.
+
+        Args:
+            window: Number of recent outcomes used for the error rate
+        """
+        self.latency = LatencyHistogram()
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, ok: bool, seconds: float | None = None) -> None:
+        """Record a finished call (latency only for successful calls)."""
+        self.requests += 1
+        self.outcomes.append(ok)
+        if ok and seconds is not None:
+            self.latency.observe(seconds)
+        if not ok:
+            self.errors += 1
+
+    @property
+    def error_rate(self) -> float:
+        """Error rate over the recent window."""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def healthy(self) -> bool:
+        """Whether the recent error rate is acceptable (unknown counts as healthy)."""
+        if len(self.outcomes) < settings.llm_health_min_samples:
+            return True
+        return self.error_rate < settings.llm_unhealthy_error_rate
+
+
+class LLMRouter:
+    """
+    Route generations across providers with hedging and failover.
+
+    Example:
+        >>> router = get_llm_router()
+        >>> routes = router.routes_for("groq", api_key, "llama-3.1-8b-instant")
+        >>> result = await router.generate("ما حكم صلاة الوتر؟", routes)
+        >>> result["content"], result["provider"], result["hedged"]
+    """
+
+    def __init__(self) -> None:
+        """Initialize the router with empty health data."""
+        self.health: dict[str, ProviderHealth] = {}
+        self.stats = {"requests": 0, "hedges": 0, "hedge_wins": 0, "failovers": 0, "failed": 0}
+
+    def _health(self, provider: str) -> ProviderHealth:
+        if provider not in self.health:
+            self.health[provider] = ProviderHealth(settings.llm_health_window)
+        return self.health[provider]
+
+    def routes_for(
+        self, provider: str, api_key: str | None, model: str | None
+    ) -> list[dict[str, Any]]:
+        """
+        Build the candidate routes for a request.
+
+        Args:
+            provider: Provider requested by the user
+            api_key: User's API key for that provider
+            model: Requested model ('' for the provider default)
+
+        Returns:
+            Requested route followed by configured fallbacks (deduplicated)
+        """
+        if provider == "gemini" and not api_key:
+            api_key = settings.gemini_api_key
+        routes = [{"provider": provider, "model": model or "", "api_key": api_key}]
+        for fallback in settings.llm_fallback_routes:
+            route = {
+                "provider": fallback.get("provider", ""),
+                "model": fallback.get("model", ""),
+                "api_key": fallback.get("api_key"),
+            }
+            if all(
+                (r["provider"], r["model"]) != (route["provider"], route["model"]) for r in routes
+            ):
+                routes.append(route)
+        return routes
+
+    def order(self, routes: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Order routes: the requested route first while healthy, then healthy
+        backups by p50 latency, then unhealthy routes.
+
+        Args:
+            routes: Candidate routes, requested route first
+
+        Returns:
+            Routes in the order they should be tried
+        """
+        if not routes:
+            return []
+
+        def p50(route: dict[str, Any]) -> float:
+            value = self._health(route["provider"]).latency.percentile(50)
+            return value if value is not None else float("inf")
+
+        primary, backups = routes[0], routes[1:]
+        healthy = sorted(
+            (r for r in backups if self._health(r["provider"]).healthy()), key=p50
+        )
+        unhealthy = [r for r in backups if not self._health(r["provider"]).healthy()]
+        if self._health(primary["provider"]).healthy():
+            return [primary, *healthy, *unhealthy]
+        return [*healthy, primary, *unhealthy]
+
+    def hedge_delay(self, provider: str) -> float:
+        """
+        Seconds to wait for a provider before hedging to the next route.
+
+        Args:
+            provider: Provider of the running route
+
+        Returns:
+            The provider's latency percentile (``llm_hedge_percentile``), or
+            ``llm_hedge_default_delay`` until enough samples exist
+        """
+        latency = self._health(provider).latency
+        if latency.count < settings.llm_health_min_samples:
+            return settings.llm_hedge_default_delay
+        value_ms = latency.percentile(settings.llm_hedge_percentile) or 0
+        return max(value_ms / 1000, settings.llm_hedge_min_delay)
+
+    async def _call(
+        self, route: dict[str, Any], prompt: str, temperature: float, max_tokens: int
+    ) -> str:
+        provider = route["provider"]
+        try:
+            service = MultiLLMService(provider=provider, api_key=route["api_key"])
+        except ValueError as e:
+            # Misconfigured route (missing or invalid key), not a provider failure
+            raise RuntimeError(f"{provider}: {e}") from e
+
+        started = time.perf_counter()
+        try:
+            content = await service.generate(
+                prompt=prompt,
+                model=route["model"],
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._health(provider).record(False)
+            raise
+        if not content:
+            self._health(provider).record(False)
+            raise RuntimeError(f"{provider}: empty response")
+        self._health(provider).record(True, time.perf_counter() - started)
+        return content
+
+    async def generate(
+        self,
+        prompt: str,
+        routes: list[dict[str, Any]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        timeout: float | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Generate text through the best available route.
+
+        Args:
+            prompt: Input prompt
+            routes: Candidate routes (see ``routes_for``)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            timeout: Overall deadline in seconds (defaults to settings)
+
+        Returns:
+            Dictionary with content, provider, model, hedged and attempts,
+            or None when every route failed or the deadline passed
+        """
+        ordered = self.order(routes)
+        if not ordered:
+            return None
+
+        self.stats["requests"] += 1
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or settings.llm_route_timeout)
+        pending: dict[asyncio.Task, dict[str, Any]] = {}
+        attempts: list[dict[str, Any]] = []
+        next_index = 0
+
+        def launch(reason: str) -> None:
+            nonlocal next_index
+            route = ordered[next_index]
+            next_index += 1
+            attempt = {"provider": route["provider"], "model": route["model"], "reason": reason}
+            attempts.append(attempt)
+            task = asyncio.create_task(self._call(route, prompt, temperature, max_tokens))
+            pending[task] = attempt
+            if reason == "hedge":
+                self.stats["hedges"] += 1
+            elif reason == "failover":
+                self.stats["failovers"] += 1
+
+        launch("primary")
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                wait = remaining
+                if next_index < len(ordered):
+                    newest = ordered[next_index - 1]["provider"]
+                    wait = min(wait, self.hedge_delay(newest))
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Slower than its usual tail latency: race the next route
+                    if next_index < len(ordered) and deadline > loop.time():
+                        logger.info(f"Hedging LLM request to {ordered[next_index]['provider']}")
+                        launch("hedge")
+                    continue
+
+                for task in done:
+                    attempt = pending.pop(task)
+                    if task.exception() is None:
+                        if attempt["reason"] == "hedge":
+                            self.stats["hedge_wins"] += 1
+                        return {
+                            "content": task.result(),
+                            "provider": attempt["provider"],
+                            "model": attempt["model"],
+                            "hedged": any(a["reason"] == "hedge" for a in attempts),
+                            "attempts": attempts,
+                        }
+                    attempt["error"] = str(task.exception())
+                    logger.warning(f"LLM route {attempt['provider']} failed: {attempt['error']}")
+
+                if next_index < len(ordered):
+                    launch("failover")
+        finally:
+            for task in pending:
+                task.cancel()
+
+        self.stats["failed"] += 1
+        logger.error(f"All LLM routes failed: {attempts}")
+        return None
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get routing statistics.
+
+        Returns:
+            Dictionary with hedge/failover counters and per-provider health
+        """
+        return {
+            **self.stats,
+            "providers": {
+                provider: {
+                    "requests": health.requests,
+                    "errors": health.errors,
+                    "error_rate": round(health.error_rate, 4),
+                    "healthy": health.healthy(),
+                    "p50_ms": health.latency.percentile(50),
+                    "p95_ms": health.latency.percentile(95),
+                }
+                for provider, health in self.health.items()
+            },
+        }
+
+
+# Global router instance
+_llm_router: LLMRouter | None = None
+
+
+def get_llm_router() -> LLMRouter:
+    """
+    Get or create the global LLM router.
+
+    Returns:
+        LLMRouter instance
+    """
+    global _llm_router
+    if _llm_router is None:
+        _llm_router = LLMRouter()
+    return _llm_router
@@ -0,0 +1,311 @@
+"""
+Local Multi-Madhab Classifier.
+
+``OrchestratorService.should_use_multi_madhab`` asks Gemini whether a fiqh
+question deserves a comparative (four-madhab) answer. Most questions look
+alike, so this module learns from those LLM decisions: every decision is
+logged as an example, and a nearest-centroid classifier over the shared
+MiniLM query embeddings answers new questions locally when it is
+confident. Only uncertain questions go to the LLM.
+
+The model is two running centroids (sum vector + count per label),
+persisted as JSON so it survives restarts. New examples are buffered and
+flushed in batches; a flush merges them into the file under a file lock,
+so several uvicorn workers sharing the file add up instead of
+overwriting each other.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from ..config import settings
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from .fiqh_rag_service import FiqhRAG
+
+_LABELS = ("multi", "single")
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    na = math.sqrt(sum(x * x for x in a)) or 1.0
+    nb = math.sqrt(sum(y * y for y in b)) or 1.0
+    return dot / (na * nb)
+
+
+def _add(total: list[float] | None, vector: list[float] | None) -> list[float] | None:
+    if total is None:
+        return None if vector is None else list(vector)
+    if vector is None:
+        return total
+    return [a + b for a, b in zip(total, vector)]
+
+
+class _FileLock:
+    """Exclusive advisory lock on a side file (no-op where fcntl is unavailable)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._handle: Any = None
+
+    def __enter__(self) -> _FileLock:
+        self._handle = open(self.path, "a")
+        if FCNTL_AVAILABLE:
+            fcntl.flock(self._handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(self._handle, fcntl.LOCK_UN)
+        self._handle.close()
+
+
+class MultiMadhabClassifier:
+    """
+    Nearest-centroid classifier trained from logged LLM decisions.
+
+    Thread-safe: predictions run in worker threads.
+
+    Example:
+        >>> classifier = get_madhab_classifier()
+        >>> classifier.record("ما حكم القبض في الصلاة؟", True)
+        >>> classifier.predict("ما حكم السدل في الصلاة؟")
+        (True, 0.12)  # or None while uncertain / untrained
+    """
+
+    def __init__(
+        self,
+        rag: FiqhRAG | None = None,
+        path: str | None = None,
+        min_margin: float | None = None,
+        min_examples: int | None = None,
+        flush_every: int | None = None,
+        flush_interval: float | None = None,
+    ) -> None:
+        """
+        Initialize the classifier and load persisted centroids.
+
+        Args:
+            rag: RAG service providing the (cached) query encoder
+                (defaults to the registry's FiqhRAG, loaded on first use)
+            path: JSON file for the centroids; empty string disables persistence
+            min_margin: Similarity gap between centroids needed to answer locally
+            min_examples: Examples per label needed before answering locally
+            flush_every: Buffered examples that trigger a flush to the file
+            flush_interval: Seconds after which buffered examples are flushed
+        """
+        self._rag = rag
+        self.path = settings.madhab_classifier_path if path is None else path
+        self.min_margin = (
+            settings.madhab_classifier_min_margin if min_margin is None else min_margin
+        )
+        self.min_examples = (
+            settings.madhab_classifier_min_examples if min_examples is None else min_examples
+        )
+        self.flush_every = flush_every or settings.madhab_classifier_flush_every
+        self.flush_interval = (
+            settings.madhab_classifier_flush_interval if flush_interval is None else flush_interval
+        )
+        self._lock = threading.Lock()
+        self.sums: dict[str, list[float] | None] = {label: None for label in _LABELS}
+        self.counts: dict[str, int] = {label: 0 for label in _LABELS}
+        # Examples recorded by this process and not yet merged into the file
+        self._pending_sums: dict[str, list[float] | None] = {label: None for label in _LABELS}
+        self._pending_counts: dict[str, int] = {label: 0 for label in _LABELS}
+        self._last_flush = time.monotonic()
+
+        self.stats = {"local": 0, "uncertain": 0, "recorded": 0, "flushes": 0}
+        self._load()
+
+    @property
+    def rag(self) -> FiqhRAG:
+        """RAG service whose encoder embeds questions."""
+        if self._rag is None:
+            from .rag_registry import get_rag_registry
+
+            self._rag = get_rag_registry().fiqh_rag
+        return self._rag
+
+    @property
+    def trained(self) -> bool:
+        """Whether every label has enough examples to answer locally."""
+        return all(self.counts[label] >= self.min_examples for label in _LABELS)
+
+    def predict(self, question: str) -> tuple[bool, float] | None:
+        """
+        Classify a question if the local model is confident.
+
+        Args:
+            question: User's question (already known to be fiqh)
+
+        Returns:
+            (needs_multi_madhab, margin), or None when untrained or uncertain
+        """
+        if not self.trained:
+            return None
+
+        vector = self.rag._embed_query(question)
+        with self._lock:
+            scores = {
+                label: _cosine(vector, [x / self.counts[label] for x in self.sums[label]])
+                for label in _LABELS
+            }
+
+        margin = abs(scores["multi"] - scores["single"])
+        if margin < self.min_margin:
+            self.stats["uncertain"] += 1
+            return None
+
+        self.stats["local"] += 1
+        return scores["multi"] > scores["single"], round(margin, 4)
+
+    def record(self, question: str, needs_multi_madhab: bool) -> None:
+        """
+        Add a labelled decision (normally from the LLM) to the model.
+
+        Args:
+            question: Classified question
+            needs_multi_madhab: Decision to learn
+        """
+        vector = self.rag._embed_query(question)
+        label = "multi" if needs_multi_madhab else "single"
+        with self._lock:
+            self.sums[label] = _add(self.sums[label], vector)
+            self.counts[label] += 1
+            self._pending_sums[label] = _add(self._pending_sums[label], vector)
+            self._pending_counts[label] += 1
+            self.stats["recorded"] += 1
+            due = (
+                sum(self._pending_counts.values()) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Merge buffered examples into the persisted centroids.
+
+        Reads the file under an exclusive lock, adds this process's pending
+        sums and counts, and writes it back atomically. The in-memory model
+        then picks up examples flushed by other workers.
+
+        Returns:
+            True if the file now holds every example recorded here
+        """
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self.path or not any(self._pending_counts.values()):
+                return True
+            try:
+                with self._file_lock():
+                    disk = self._read() or {
+                        "sums": {label: None for label in _LABELS},
+                        "counts": {label: 0 for label in _LABELS},
+                    }
+                    sums = {
+                        label: _add(disk["sums"][label], self._pending_sums[label])
+                        for label in _LABELS
+                    }
+                    counts = {
+                        label: disk["counts"][label] + self._pending_counts[label]
+                        for label in _LABELS
+                    }
+                    self._write(sums, counts)
+            except Exception as e:
+                logger.error(f"Failed to save multi-madhab classifier: {e}")
+                return False
+
+            self.sums, self.counts = sums, counts
+            self._pending_sums = {label: None for label in _LABELS}
+            self._pending_counts = {label: 0 for label in _LABELS}
+            self.stats["flushes"] += 1
+            return True
+
+    def _file_lock(self) -> _FileLock:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return _FileLock(f"{self.path}.lock")
+
+    def _read(self) -> dict[str, Any] | None:
+        """Read persisted sums/counts, or None if missing or from another model."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("embedding_model") != settings.embedding_model_name:
+            logger.warning("Multi-madhab classifier was trained with another model, ignoring it")
+            return None
+        return {
+            "sums": {label: data["sums"].get(label) for label in _LABELS},
+            "counts": {label: int(data["counts"].get(label, 0)) for label in _LABELS},
+        }
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        try:
+            data = self._read()
+        except Exception as e:
+            logger.error(f"Failed to load multi-madhab classifier: {e}")
+            return
+        if data is not None:
+            self.sums, self.counts = data["sums"], data["counts"]
+            logger.info(f"Loaded multi-madhab classifier: {self.counts}")
+
+    def _write(self, sums: dict[str, Any], counts: dict[str, int]) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"embedding_model": settings.embedding_model_name, "sums": sums, "counts": counts},
+                f,
+            )
+        os.replace(tmp_path, self.path)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get classifier statistics.
+
+        Returns:
+            Dictionary with example counts and local/uncertain decisions
+        """
+        return {
+            **self.stats,
+            "examples": dict(self.counts),
+            "pending": sum(self._pending_counts.values()),
+            "trained": self.trained,
+            "min_margin": self.min_margin,
+        }
+
+
+# Global classifier instance
+_madhab_classifier: MultiMadhabClassifier | None = None
+
+
+def get_madhab_classifier() -> MultiMadhabClassifier:
+    """
+    Get or create the global multi-madhab classifier.
+
+    Returns:
+        MultiMadhabClassifier instance
+    """
+    global _madhab_classifier
+    if _madhab_classifier is None:
+        _madhab_classifier = MultiMadhabClassifier()
+    return _madhab_classifier
@@ -2,15 +2,25 @@
 Multi-Provider LLM Service.
 
 Supports: Ollama, OpenRouter, Groq, OpenAI, Claude, and Gemini.
-Automatically fetches available models from each provider.
+Automatically fetches available models from each provider, and generates
+either complete answers (``generate``) or token streams (``stream``).
+
+Model catalogs are cached per provider and API key (the key is hashed,
+never stored) and refreshed in the background once stale, so the settings
+UI does not re-download large lists such as OpenRouter's on every load.
 """
 
+import hashlib
+import json
+from collections.abc import AsyncIterator
 from typing import Any
 
 import httpx
 from loguru import logger
 
 from ..config import settings
+from .cache_service import cached, get_cache_service
+from .provider_clients import get_provider_client_pool
 
 
 def _safe_ascii(value: str | None, fallback: str) -> str:
@@ -63,6 +73,21 @@ def validate_api_key(provider: str, api_key: str | None) -> str | None:
     return sanitized_key
 
 
+def _catalog_key(service: "MultiLLMService") -> str:
+    """Cache key for a provider's model list, scoped to a hash of the API key."""
+    key_hash = hashlib.sha256((service.api_key or "").encode()).hexdigest()[:16]
+    return f"llm_models:{service.provider}:{key_hash}"
+
+
+async def _iter_sse_data(response: httpx.Response) -> AsyncIterator[str]:
+    """Yield the ``data:`` payloads of a server-sent events response."""
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            data = line[5:].strip()
+            if data:
+                yield data
+
+
 class MultiLLMService:
     """Unified service supporting multiple LLM providers."""
 
@@ -116,7 +141,10 @@ class MultiLLMService:
             raise ValueError(f"Unknown provider: {provider}")
 
         self.provider_info = self.PROVIDERS[self.provider]
-        self.base_url = self.provider_info["base_url"]
+        if self.provider == "ollama":
+            self.base_url = settings.ollama_base_url
+        else:
+            self.base_url = self.provider_info["base_url"]
 
         # Validate and sanitize API key if required
         if self.provider_info["requires_api_key"]:
@@ -134,9 +162,22 @@ class MultiLLMService:
 
         logger.info(f"✅ Initialized {self.provider_info['name']}")
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client for this provider (shared across instances)."""
+        return get_provider_client_pool().get(self.provider, self.base_url)
+
+    @cached(
+        prefix="llm_models",
+        ttl=settings.llm_catalog_ttl,
+        key_builder=_catalog_key,
+        stale_ttl=settings.llm_catalog_stale_ttl,
+        negative_ttl=60,
+        negative_if=lambda models: not models,
+    )
     async def list_available_models(self) -> list[dict[str, Any]]:
         """
-        Fetch all available models from the provider.
+        Fetch all available models from the provider (cached per API key).
 
         Returns:
             List of model dictionaries with name, size, description
@@ -161,13 +202,33 @@ class MultiLLMService:
             logger.error(f"Failed to list models from {self.provider}: {e}")
             return []
 
+    async def refresh_model_catalog(self) -> list[dict[str, Any]]:
+        """
+        Fetch the model list from the provider, bypassing the cache.
+
+        The cached catalog is replaced with the result, so a revoked or
+        rotated key does not keep serving its old model list.
+
+        Returns:
+            List of model dictionaries (empty if the provider call failed)
+        """
+        return await MultiLLMService.list_available_models.refresh(self)
+
+    async def invalidate_model_catalog(self) -> bool:
+        """
+        Drop the cached model list (e.g. after pulling an Ollama model).
+
+        Returns:
+            True if a cached catalog was removed
+        """
+        return await get_cache_service().delete(_catalog_key(self))
+
     async def _list_ollama_models(self) -> list[dict[str, Any]]:
         """List locally installed Ollama models."""
         try:
-            async with httpx.AsyncClient(base_url=self.base_url) as client:
-                response = await client.get("/api/tags")
-                response.raise_for_status()
-                data = response.json()
+            response = await self.client.get("/api/tags")
+            response.raise_for_status()
+            data = response.json()
 
             models: list[dict[str, Any]] = []
             for model in data.get("models", []):
@@ -194,34 +255,33 @@ class MultiLLMService:
     async def _list_openrouter_models(self) -> list[dict[str, Any]]:
         """Fetch OpenRouter available models."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/models", headers={"Authorization": f"Bearer {self.api_key}"}
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                models = []
-
-                for model in data.get("data", []):
-                    # Filter for good Arabic-friendly models
-                    model_id = model.get("id")
-                    if not model_id:
-                        continue
-
-                    if any(x in model_id.lower() for x in ["qwen", "llama", "mistral", "gemini"]):
-                        safe_name = _safe_ascii(model.get("name", model_id), model_id)
-                        models.append(
-                            {
-                                "id": model_id,
-                                "name": safe_name,
-                                "context_length": model.get("context_length", 0),
-                                "provider": "openrouter",
-                                "pricing": model.get("pricing", {}),
-                            }
-                        )
-
-                return models
+            response = await self.client.get(
+                "/models", headers={"Authorization": f"Bearer {self.api_key}"}
+            )
+            response.raise_for_status()
+
+            data = response.json()
+            models = []
+
+            for model in data.get("data", []):
+                # Filter for good Arabic-friendly models
+                model_id = model.get("id")
+                if not model_id:
+                    continue
+
+                if any(x in model_id.lower() for x in ["qwen", "llama", "mistral", "gemini"]):
+                    safe_name = _safe_ascii(model.get("name", model_id), model_id)
+                    models.append(
+                        {
+                            "id": model_id,
+                            "name": safe_name,
+                            "context_length": model.get("context_length", 0),
+                            "provider": "openrouter",
+                            "pricing": model.get("pricing", {}),
+                        }
+                    )
+
+            return models
 
         except Exception as e:
             logger.error(f"Failed to list OpenRouter models: {e}")
@@ -230,22 +290,21 @@ class MultiLLMService:
     async def _list_groq_models(self) -> list[dict[str, Any]]:
         """Fetch Groq available models."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/models", headers={"Authorization": f"Bearer {self.api_key}"}
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                return [
-                    {
-                        "id": model["id"],
-                        "name": model["id"],
-                        "provider": "groq",
-                        "context_length": model.get("context_window", 0),
-                    }
-                    for model in data.get("data", [])
-                ]
+            response = await self.client.get(
+                "/models", headers={"Authorization": f"Bearer {self.api_key}"}
+            )
+            response.raise_for_status()
+
+            data = response.json()
+            return [
+                {
+                    "id": model["id"],
+                    "name": model["id"],
+                    "provider": "groq",
+                    "context_length": model.get("context_window", 0),
+                }
+                for model in data.get("data", [])
+            ]
 
         except Exception as e:
             logger.error(f"Failed to list Groq models: {e}")
@@ -254,23 +313,22 @@ class MultiLLMService:
     async def _list_openai_models(self) -> list[dict[str, Any]]:
         """Fetch OpenAI available models."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/models", headers={"Authorization": f"Bearer {self.api_key}"}
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                # Filter for GPT models
-                return [
-                    {
-                        "id": model["id"],
-                        "name": model["id"],
-                        "provider": "openai",
-                    }
-                    for model in data.get("data", [])
-                    if "gpt" in model["id"].lower()
-                ]
+            response = await self.client.get(
+                "/models", headers={"Authorization": f"Bearer {self.api_key}"}
+            )
+            response.raise_for_status()
+
+            data = response.json()
+            # Filter for GPT models
+            return [
+                {
+                    "id": model["id"],
+                    "name": model["id"],
+                    "provider": "openai",
+                }
+                for model in data.get("data", [])
+                if "gpt" in model["id"].lower()
+            ]
 
         except Exception as e:
             logger.error(f"Failed to list OpenAI models: {e}")
@@ -340,25 +398,38 @@ class MultiLLMService:
     ) -> str | None:
         """Generate using Ollama."""
         try:
-            import ollama
-
-            client = ollama.Client()
+            from .ollama_service import get_ollama_backend
 
-            response = client.generate(
-                model=model,
-                prompt=prompt,
+            return await get_ollama_backend().generate(
+                model or settings.ollama_model,
+                prompt,
                 options={
                     "temperature": temperature,
                     "num_predict": max_tokens,
                 },
             )
 
-            return response.get("response", "")
-
         except Exception as e:
             logger.error(f"Ollama generation failed: {e}")
             return None
 
+    def _openai_headers(self) -> dict[str, str]:
+        """Request headers for OpenAI-compatible APIs."""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        if self.provider == "openrouter":
+            headers.setdefault(
+                "HTTP-Referer",
+                _safe_ascii(settings.app_base_url, "http://localhost"),
+            )
+            headers.setdefault(
+                "X-Title",
+                _safe_ascii(settings.app_name, "Al-Muwatta"),
+            )
+        return headers
+
     async def _generate_openai_compatible(
         self,
         prompt: str,
@@ -368,35 +439,20 @@ class MultiLLMService:
     ) -> str | None:
         """Generate using OpenAI-compatible APIs."""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-            if self.provider == "openrouter":
-                headers.setdefault(
-                    "HTTP-Referer",
-                    _safe_ascii(settings.app_base_url, "http://localhost"),
-                )
-                headers.setdefault(
-                    "X-Title",
-                    _safe_ascii(settings.app_name, "Al-Muwatta"),
-                )
-
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json={
-                        "model": model,
-                        "messages": [{"role": "user", "content": prompt}],
-                        "temperature": temperature,
-                        "max_tokens": max_tokens,
-                    },
-                )
-                response.raise_for_status()
+            response = await self.client.post(
+                "/chat/completions",
+                headers=self._openai_headers(),
+                json={
+                    "model": model,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": temperature,
+                    "max_tokens": max_tokens,
+                },
+            )
+            response.raise_for_status()
 
-                data = response.json()
-                return data["choices"][0]["message"]["content"]
+            data = response.json()
+            return data["choices"][0]["message"]["content"]
 
         except httpx.HTTPStatusError as exc:
             logger.error(
@@ -406,3 +462,155 @@ class MultiLLMService:
         except Exception as e:
             logger.error(f"API generation failed ({self.provider}): {e}")
             return None
+
+    async def stream(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text from the selected provider and model.
+
+        Unlike ``generate``, errors are raised rather than swallowed so the
+        caller can tell a failed stream from an empty one.
+
+        Args:
+            prompt: Input prompt
+            model: Model ID to use (provider default when empty)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+
+        Yields:
+            Text chunks as the provider produces them
+
+        Example:
+            >>> service = MultiLLMService(provider="groq", api_key=key)
+            >>> async for chunk in service.stream("ما هو الوضوء؟", model="llama-3.1-8b"):
+            ...     print(chunk, end="")
+        """
+        if self.provider == "ollama":
+            from .ollama_service import get_ollama_backend
+
+            chunks = get_ollama_backend().stream_generate(
+                model or settings.ollama_model,
+                prompt,
+                options={"temperature": temperature, "num_predict": max_tokens},
+            )
+        elif self.provider == "anthropic":
+            chunks = self._stream_anthropic(prompt, model, temperature, max_tokens)
+        elif self.provider == "gemini":
+            chunks = self._stream_gemini(
+                prompt, model or settings.gemini_model, temperature, max_tokens
+            )
+        else:
+            # OpenAI-compatible API (OpenRouter, Groq, OpenAI)
+            chunks = self._stream_openai_compatible(prompt, model, temperature, max_tokens)
+
+        try:
+            async for chunk in chunks:
+                yield chunk
+        except httpx.HTTPStatusError as exc:
+            logger.error(
+                f"Streaming failed ({self.provider}) - status {exc.response.status_code}"
+            )
+            raise
+        except Exception as e:
+            logger.error(f"Streaming failed ({self.provider}): {e}")
+            raise
+
+    async def _stream_openai_compatible(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> AsyncIterator[str]:
+        """Stream chat completion deltas from OpenAI-compatible APIs."""
+        async with self.client.stream(
+            "POST",
+            "/chat/completions",
+            headers=self._openai_headers(),
+            json={
+                "model": model,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "stream": True,
+            },
+        ) as response:
+            response.raise_for_status()
+            async for data in _iter_sse_data(response):
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                if event.get("error"):
+                    raise RuntimeError(event["error"])
+                for choice in event.get("choices") or []:
+                    content = (choice.get("delta") or {}).get("content")
+                    if content:
+                        yield content
+
+    async def _stream_anthropic(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> AsyncIterator[str]:
+        """Stream text deltas from the Anthropic Messages API."""
+        async with self.client.stream(
+            "POST",
+            "/messages",
+            headers={
+                "x-api-key": self.api_key,
+                "anthropic-version": "2023-06-01",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": model,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "stream": True,
+            },
+        ) as response:
+            response.raise_for_status()
+            async for data in _iter_sse_data(response):
+                event = json.loads(data)
+                event_type = event.get("type")
+                if event_type == "content_block_delta":
+                    text = (event.get("delta") or {}).get("text")
+                    if text:
+                        yield text
+                elif event_type == "message_stop":
+                    break
+                elif event_type == "error":
+                    raise RuntimeError(event.get("error"))
+
+    async def _stream_gemini(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> AsyncIterator[str]:
+        """Stream candidate text from the Gemini REST API."""
+        async with self.client.stream(
+            "POST",
+            f"/models/{model}:streamGenerateContent",
+            params={"alt": "sse"},
+            headers={"x-goog-api-key": self.api_key, "Content-Type": "application/json"},
+            json={
+                "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+                "generationConfig": {"temperature": temperature, "maxOutputTokens": max_tokens},
+            },
+        ) as response:
+            response.raise_for_status()
+            async for data in _iter_sse_data(response):
+                event = json.loads(data)
+                for candidate in event.get("candidates") or []:
+                    for part in (candidate.get("content") or {}).get("parts") or []:
+                        if part.get("text"):
+                            yield part["text"]
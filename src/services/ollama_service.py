@@ -2,10 +2,26 @@
 Ollama Service for Local LLM Inference.
 
 This service provides an alternative to Google Gemini using locally-run LLMs.
+
+Generation goes through ``AsyncOllamaBackend``, which talks to the Ollama
+HTTP API (``settings.ollama_base_url``) over the pooled async client, so a
+long local generation never blocks the event loop. A semaphore caps
+concurrent generations (``settings.ollama_max_concurrency``); extra
+requests wait their turn instead of overloading the local model.
 """
 
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
 from loguru import logger
 
+from ..config import settings
+from .provider_clients import get_provider_client_pool
+
 try:
     import ollama
 
@@ -15,6 +31,179 @@ except ImportError:
     logger.warning("Ollama not installed. Run: pip install ollama")
 
 
+class AsyncOllamaBackend:
+    """
+    Non-blocking client for the Ollama HTTP API with a concurrency cap.
+
+    Example:
+        >>> backend = get_ollama_backend()
+        >>> text = await backend.generate("qwen2.5:7b", "ما هو التوحيد؟")
+        >>> async for chunk in backend.stream_generate("qwen2.5:7b", "ما هو التوحيد؟"):
+        ...     print(chunk, end="")
+    """
+
+    def __init__(self, base_url: str | None = None, max_concurrency: int | None = None) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            base_url: Ollama server URL (defaults to settings)
+            max_concurrency: Concurrent generations allowed (defaults to settings)
+        """
+        self.base_url = base_url or settings.ollama_base_url
+        self.max_concurrency = max_concurrency or settings.ollama_max_concurrency
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.active = 0
+        self.waiting = 0
+
+    async def _acquire(self) -> None:
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+
+    def _release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+    async def _post(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
+        client = get_provider_client_pool().get("ollama", self.base_url)
+        await self._acquire()
+        try:
+            response = await client.post(path, json=payload, timeout=settings.ollama_timeout)
+            response.raise_for_status()
+            return response.json()
+        finally:
+            self._release()
+
+    async def _stream(self, path: str, payload: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
+        """Yield the NDJSON objects of a streaming Ollama response."""
+        client = get_provider_client_pool().get("ollama", self.base_url)
+        await self._acquire()
+        try:
+            async with client.stream(
+                "POST", path, json=payload, timeout=settings.ollama_timeout
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+                    yield chunk
+                    if chunk.get("done"):
+                        break
+        finally:
+            self._release()
+
+    async def generate(
+        self, model: str, prompt: str, options: dict[str, Any] | None = None
+    ) -> str:
+        """
+        Generate a completion.
+
+        Args:
+            model: Ollama model name
+            prompt: Input prompt
+            options: Ollama options (temperature, num_predict, ...)
+
+        Returns:
+            Generated text
+        """
+        data = await self._post(
+            "/api/generate",
+            {"model": model, "prompt": prompt, "options": options or {}, "stream": False},
+        )
+        return data.get("response", "")
+
+    async def stream_generate(
+        self, model: str, prompt: str, options: dict[str, Any] | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion as text chunks.
+
+        Args:
+            model: Ollama model name
+            prompt: Input prompt
+            options: Ollama options (temperature, num_predict, ...)
+
+        Yields:
+            Text chunks as the model produces them
+        """
+        payload = {"model": model, "prompt": prompt, "options": options or {}, "stream": True}
+        async for chunk in self._stream("/api/generate", payload):
+            if chunk.get("response"):
+                yield chunk["response"]
+
+    async def chat(
+        self, model: str, messages: list[dict[str, Any]], options: dict[str, Any] | None = None
+    ) -> str | None:
+        """
+        Run a chat completion.
+
+        Args:
+            model: Ollama model name
+            messages: Message dicts with 'role' and 'content'
+            options: Ollama options
+
+        Returns:
+            Assistant reply
+        """
+        data = await self._post(
+            "/api/chat",
+            {"model": model, "messages": messages, "options": options or {}, "stream": False},
+        )
+        return data.get("message", {}).get("content")
+
+    async def stream_chat(
+        self, model: str, messages: list[dict[str, Any]], options: dict[str, Any] | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion as text chunks.
+
+        Args:
+            model: Ollama model name
+            messages: Message dicts with 'role' and 'content'
+            options: Ollama options
+
+        Yields:
+            Text chunks of the assistant reply
+        """
+        payload = {"model": model, "messages": messages, "options": options or {}, "stream": True}
+        async for chunk in self._stream("/api/chat", payload):
+            content = chunk.get("message", {}).get("content")
+            if content:
+                yield content
+
+    def get_stats(self) -> dict[str, Any]:
+        """Current concurrency usage."""
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+        }
+
+
+# Global Ollama backend instance
+_ollama_backend: AsyncOllamaBackend | None = None
+
+
+def get_ollama_backend() -> AsyncOllamaBackend:
+    """
+    Get or create the global async Ollama backend.
+
+    Returns:
+        AsyncOllamaBackend instance
+    """
+    global _ollama_backend
+    if _ollama_backend is None:
+        _ollama_backend = AsyncOllamaBackend()
+    return _ollama_backend
+
+
 class OllamaService:
     """Service for local LLM inference using Ollama."""
 
@@ -29,7 +218,8 @@ class OllamaService:
             raise ImportError("Ollama is not installed. Run: pip install ollama")
 
         self.model = model
-        self.client = ollama.Client()
+        self.client = ollama.Client(host=settings.ollama_base_url)
+        self.backend = get_ollama_backend()
 
         try:
             # Test if model exists
@@ -62,16 +252,15 @@ class OllamaService:
             >>> print(response)
         """
         try:
-            response = self.client.generate(
-                model=self.model,
-                prompt=prompt,
+            content = await self.backend.generate(
+                self.model,
+                prompt,
                 options={
                     "temperature": temperature,
                     "num_predict": max_tokens,
                 },
             )
 
-            content = response.get("response", "")
             if content:
                 logger.info("✅ Content generated with Ollama")
                 return content
@@ -83,6 +272,34 @@ class OllamaService:
             logger.error(f"Ollama generation failed: {e}")
             return None
 
+    async def stream_content(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated content chunk by chunk.
+
+        Args:
+            prompt: Input prompt
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens to generate
+
+        Yields:
+            Text chunks as the model produces them
+
+        Example:
+            >>> async for chunk in service.stream_content("What is Tawheed?"):
+            ...     print(chunk, end="")
+        """
+        async for chunk in self.backend.stream_generate(
+            self.model,
+            prompt,
+            options={"temperature": temperature, "num_predict": max_tokens},
+        ):
+            yield chunk
+
     async def chat(
         self,
         messages: list,
@@ -105,12 +322,10 @@ class OllamaService:
             >>> response = await service.chat(messages)
         """
         try:
-            response = self.client.chat(
-                model=self.model, messages=messages, options={"temperature": temperature}
+            return await self.backend.chat(
+                self.model, messages, options={"temperature": temperature}
             )
 
-            return response.get("message", {}).get("content")
-
         except Exception as e:
             logger.error(f"Ollama chat failed: {e}")
             return None
@@ -10,29 +10,49 @@ This service orchestrates responses by:
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import time
+from collections.abc import Awaitable
 from typing import Any
 
 from loguru import logger
 from ..config import settings
 
+from ..services.cache_service import cached
 from ..services.cached_content_service import get_cached_content_service
+from ..services.embedding_cache import normalize_query
 from ..services.fiqh_rag_service import FiqhRAG, get_fiqh_rag
-from ..services.web_search_service import WebSearchService
+from ..services.madhab_classifier import get_madhab_classifier
+from ..services.web_search_service import get_web_search_service
+from ..utils.prompt_budget import ContextAssembler
 from ..utils.question_classifier import is_fiqh_question
 
 MADHAB_KEYS = ["maliki", "hanafi", "shafii", "hanbali"]
 
 
+def _classification_key(_self: Any, question: str) -> str:
+    """Cache key for a question's classification, shared by spelling variants."""
+    digest = hashlib.md5(normalize_query(question).encode()).hexdigest()[:16]
+    return f"ai_classification:{digest}"
+
+
 class OrchestratorService:
     """Orchestrates multi-madhab search and response generation."""
 
-    def __init__(self) -> None:
-        """Initialize orchestrator with RAG and cache services."""
-        self.rag = get_fiqh_rag()
+    def __init__(self, rag: FiqhRAG | None = None) -> None:
+        """
+        Initialize orchestrator with RAG and cache services.
+
+        Args:
+            rag: RAG service to use (defaults to the shared registry instance)
+        """
+        self.rag = rag or get_fiqh_rag()
         self.cache_service = get_cached_content_service()
         # Lazy import to avoid circular dependency
         self._gemini_service = None
-        self.web_search = WebSearchService()
+        self.web_search = get_web_search_service()
 
     async def search_madhabs_separately(
         self,
@@ -65,24 +85,24 @@ class OrchestratorService:
         if not normalized:
             normalized = MADHAB_KEYS
 
-        results_by_madhab: dict[str, list[dict[str, Any]]] = {}
+        # One query embedding, all collections searched concurrently off the event loop
+        try:
+            breakdown = await asyncio.to_thread(
+                self.rag.search_with_breakdown,
+                query,
+                n_results=n_results_per_madhab,
+                madhabs=normalized,
+                score_threshold=0.3,
+            )
+        except Exception as e:
+            logger.error(f"Failed to search madhabs: {e}")
+            breakdown = {"by_madhab": {}}
 
-        # Search each madhab separately
-        for madhab in normalized:
-            try:
-                madhab_results = self.rag.search(
-                    query,
-                    n_results=n_results_per_madhab,
-                    madhabs=[madhab],
-                    score_threshold=0.3,
-                )
-                results_by_madhab[madhab] = madhab_results
-                logger.info(
-                    f"✅ Searched {madhab} madhab: found {len(madhab_results)} results"
-                )
-            except Exception as e:
-                logger.error(f"Failed to search {madhab} madhab: {e}")
-                results_by_madhab[madhab] = []
+        results_by_madhab: dict[str, list[dict[str, Any]]] = {
+            madhab: breakdown["by_madhab"].get(madhab, []) for madhab in normalized
+        }
+        for madhab, madhab_results in results_by_madhab.items():
+            logger.info(f"✅ Searched {madhab} madhab: found {len(madhab_results)} results")
 
         return results_by_madhab
 
@@ -101,11 +121,9 @@ class OrchestratorService:
         Returns:
             Dictionary with quran_results and hadith_results
         """
-        quran_results = await self.cache_service.search_quran_in_cache(
-            query, limit=limit
-        )
-        hadith_results = await self.cache_service.search_hadith_in_cache(
-            query, limit=limit
+        quran_results, hadith_results = await asyncio.gather(
+            self.cache_service.search_quran_in_cache(query, limit=limit),
+            self.cache_service.search_hadith_in_cache(query, limit=limit),
         )
 
         return {
@@ -113,6 +131,101 @@ class OrchestratorService:
             "hadith": hadith_results,
         }
 
+    async def _timed_fetch(
+        self,
+        source: str,
+        fetch: Awaitable[Any],
+        default: Any,
+        timings: dict[str, dict[str, Any]],
+    ) -> Any:
+        """
+        Await one retrieval source with its timeout, recording its latency.
+
+        Failures and timeouts yield ``default`` so the other sources still
+        contribute to the answer.
+        """
+        timeout = settings.retrieval_timeouts.get(source)
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            result = await asyncio.wait_for(fetch, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Retrieval source '{source}' timed out after {timeout}s")
+            status, result = "timeout", default
+        except Exception as e:
+            logger.error(f"Retrieval source '{source}' failed: {e}")
+            status, result = "error", default
+        timings[source] = {
+            "ms": round((time.perf_counter() - start) * 1000, 1),
+            "status": status,
+        }
+        return result
+
+    async def gather_context(
+        self,
+        question: str,
+        madhabs: list[str] | None = None,
+        web_search: bool = False,
+        web_attempts: int = 2,
+        n_results_per_madhab: int = 5,
+        limit: int = 5,
+    ) -> dict[str, Any]:
+        """
+        Run the independent retrieval sources of the AS-mode pipeline concurrently.
+
+        Per-madhab fiqh search, cached Quran/Hadith search and (optionally)
+        web search run in parallel, each bounded by its entry in
+        ``settings.retrieval_timeouts``.
+
+        Args:
+            question: User's question
+            madhabs: Madhabs to search (default: all four)
+            web_search: Whether to include web search
+            web_attempts: Number of web search queries (1-3)
+            n_results_per_madhab: Fiqh results per madhab
+            limit: Maximum Quran/Hadith results per type
+
+        Returns:
+            Dictionary with madhab_results, cached_content, web_context and
+            per-source timings ({"ms", "status"})
+        """
+        timings: dict[str, dict[str, Any]] = {}
+        fetches = [
+            self._timed_fetch(
+                "fiqh",
+                self.search_madhabs_separately(
+                    question, madhabs=madhabs, n_results_per_madhab=n_results_per_madhab
+                ),
+                {},
+                timings,
+            ),
+            self._timed_fetch(
+                "quran_hadith",
+                self.get_quran_hadith_from_cache(question, limit=limit),
+                {"quran": [], "hadith": []},
+                timings,
+            ),
+        ]
+        if web_search:
+            # Ensure at least two different queries; cap at 3 attempts
+            attempts = min(3, max(1, web_attempts or 2))
+            if madhabs:
+                web_fetch = self.perform_web_search_by_madhab(question, madhabs, attempts=attempts)
+            else:
+                web_fetch = self.perform_web_search(question, attempts=attempts)
+            fetches.append(self._timed_fetch("web", web_fetch, "", timings))
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*fetches)
+        timings["total"] = {"ms": round((time.perf_counter() - start) * 1000, 1), "status": "ok"}
+
+        return {
+            "madhab_results": results[0],
+            "cached_content": results[1],
+            "web_context": results[2] if web_search else "",
+            "timings": timings,
+        }
+
     async def get_quran_healing_content(
         self,
         user_state: str | None = None,
@@ -182,9 +295,38 @@ class OrchestratorService:
             "hadith": unique_hadith[:10],
         }
 
+    @cached(
+        prefix="ai_classification",
+        ttl=604800,
+        key_builder=_classification_key,
+        # Keyword fallbacks (LLM down or unconfigured) are retried after 5 minutes
+        negative_ttl=300,
+        negative_if=lambda result: result.get("source") == "keyword_fallback",
+    )
+    async def classify_question(self, question: str) -> dict[str, Any]:
+        """
+        Classify a question for the /ask pipeline (cached per normalized question).
+
+        Args:
+            question: User's question
+
+        Returns:
+            Dict with is_fiqh, category, multi_madhab, reason and source
+            ('rule', 'local', 'llm' or 'keyword_fallback')
+        """
+        is_fiqh, category = is_fiqh_question(question)
+        multi_madhab, reason, source = await self._multi_madhab_decision(question)
+        return {
+            "is_fiqh": is_fiqh,
+            "category": category,
+            "multi_madhab": multi_madhab,
+            "reason": reason,
+            "source": source,
+        }
+
     async def should_use_multi_madhab(self, question: str) -> tuple[bool, str]:
         """
-        Determine if question requires multi-madhab response using LLM analysis.
+        Determine if question requires multi-madhab response.
 
         Args:
             question: User's question
@@ -192,15 +334,27 @@ class OrchestratorService:
         Returns:
             Tuple of (should_use_multi_madhab: bool, reason: str)
         """
-        # If Gemini is not configured, skip LLM analysis and fallback immediately
-        if not (getattr(settings, "gemini_api_key", None)):
-            return self._fallback_keyword_check(question)
+        needs_multi, reason, _source = await self._multi_madhab_decision(question)
+        return (needs_multi, reason)
 
-        # Lazy load Gemini service only when API key is configured
-        if self._gemini_service is None:
-            from ..services.gemini_service import GeminiService
+    async def _multi_madhab_decision(self, question: str) -> tuple[bool, str, str]:
+        """
+        Decide whether a question needs a multi-madhab answer, and how.
+
+        Tiered: the local classifier answers confidently-classified questions
+        from the query embedding; the rest go to LLM analysis, whose
+        decisions are recorded to train the local classifier.
+
+        Args:
+            question: User's question
 
-            self._gemini_service = GeminiService()
+        Returns:
+            Tuple of (needs_multi_madhab, reason, source), where source is
+            'rule', 'local', 'llm' or 'keyword_fallback'
+        """
+        # If Gemini is not configured, skip LLM analysis and fallback immediately
+        if not (getattr(settings, "gemini_api_key", None)):
+            return (*self._fallback_keyword_check(question), "keyword_fallback")
 
         # First check if it's a fiqh question at all
         is_fiqh, category = is_fiqh_question(question)
@@ -208,10 +362,32 @@ class OrchestratorService:
             return (
                 False,
                 f"Question is about {category}, not fiqh. Multi-madhab only for fiqh questions.",
+                "rule",
             )
 
-        # Use LLM to analyze if multi-madhab perspective is needed
-        analysis_prompt = f"""
+        classifier = get_madhab_classifier() if settings.madhab_classifier_enabled else None
+        if classifier is not None:
+            try:
+                local = await asyncio.to_thread(classifier.predict, question)
+            except Exception as e:
+                logger.error(f"Local multi-madhab classifier failed: {e}")
+                local = None
+            if local is not None:
+                needs_multi, margin = local
+                logger.info(
+                    f"Orchestrator local classifier: needs_multi_madhab={needs_multi}, margin={margin}"
+                )
+                return (needs_multi, f"Local classifier decision (margin={margin})", "local")
+
+        # Lazy load Gemini service only when the LLM is needed
+        if self._gemini_service is None:
+            from ..services.gemini_service import GeminiService
+
+            self._gemini_service = GeminiService(rag=self.rag)
+
+        try:
+            # Use LLM to analyze if multi-madhab perspective is needed
+            analysis_prompt = f"""
 You are an expert Islamic scholar and orchestration planner. Decide how to answer the user's query safely and comprehensively.
 
 Question: "{question}"
@@ -237,78 +413,93 @@ Web search enrichment (browser-like crawler):
 - Attempt at least 2 distinct queries; at most 3 regenerated queries
 
 Return ONLY JSON in this exact format:
-{
+{{
   "needs_multi_madhab": true/false,
   "needs_web_search": true/false,
   "reason": "1-2 concise sentences explaining the decision"
-}
+}}
 """
 
-        try:
             # Get LLM classification
             response_text = await self._gemini_service.generate_content(
                 analysis_prompt, temperature=0.3, max_tokens=200
             )
+            if not response_text:
+                raise RuntimeError("empty LLM response")
+            result = self._parse_llm_decision(response_text)
+        except Exception as e:
+            logger.error(f"LLM classification failed: {e}, falling back to keyword check")
+            # Fallback to keyword-based check if LLM fails
+            return (*self._fallback_keyword_check(question), "keyword_fallback")
 
-            # Parse JSON response
-            import json
+        if result is not None:
+            needs_multi = bool(result.get("needs_multi_madhab", False))
+            reason = result.get("reason", "LLM analysis completed")
+            logger.info(
+                f"Orchestrator LLM analysis: needs_multi_madhab={needs_multi}, reason={reason}"
+            )
+            if classifier is not None:
+                try:
+                    await asyncio.to_thread(classifier.record, question, needs_multi)
+                except Exception as e:
+                    logger.error(f"Failed to record multi-madhab decision: {e}")
+            return (needs_multi, reason, "llm")
+
+        # Fallback: try to infer from response text
+        response_lower = response_text.lower()
+        if "true" in response_lower or '"needs_multi_madhab": true' in response_lower:
+            return (
+                True,
+                "LLM determined multi-madhab response is needed",
+                "llm",
+            )
+        return (
+            False,
+            "LLM determined single response is sufficient",
+            "llm",
+        )
 
-            # Try to parse entire response as JSON first
-            try:
-                result = json.loads(response_text.strip())
-                needs_multi = result.get("needs_multi_madhab", False)
-                reason = result.get("reason", "LLM analysis completed")
-                logger.info(
-                    f"Orchestrator LLM analysis: needs_multi_madhab={needs_multi}, reason={reason}"
-                )
-                return (needs_multi, reason)
-            except json.JSONDecodeError:
-                # Try to extract JSON object from response
-                import re
-                # Find JSON object with proper brace matching
-                brace_count = 0
-                start_idx = -1
-                json_match = None
-                for i, char in enumerate(response_text):
-                    if char == '{':
-                        if brace_count == 0:
-                            start_idx = i
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0 and start_idx != -1:
-                            json_match = response_text[start_idx:i+1]
-                            break
-                
-                if json_match:
+    @staticmethod
+    def _parse_llm_decision(response_text: str | None) -> dict[str, Any] | None:
+        """
+        Parse the JSON decision from an LLM response.
+
+        Args:
+            response_text: Raw LLM output (None when generation failed)
+
+        Returns:
+            Decoded JSON object, or None if none could be parsed
+        """
+        if not response_text:
+            return None
+
+        # Try to parse entire response as JSON first
+        try:
+            result = json.loads(response_text.strip())
+            if isinstance(result, dict):
+                return result
+        except json.JSONDecodeError:
+            pass
+
+        # Find JSON object with proper brace matching
+        brace_count = 0
+        start_idx = -1
+        for i, char in enumerate(response_text):
+            if char == "{":
+                if brace_count == 0:
+                    start_idx = i
+                brace_count += 1
+            elif char == "}":
+                brace_count -= 1
+                if brace_count == 0 and start_idx != -1:
+                    json_match = response_text[start_idx : i + 1]
                     try:
                         result = json.loads(json_match)
-                        needs_multi = result.get("needs_multi_madhab", False)
-                        reason = result.get("reason", "LLM analysis completed")
-                        logger.info(
-                            f"Orchestrator LLM analysis: needs_multi_madhab={needs_multi}, reason={reason}"
-                        )
-                        return (needs_multi, reason)
+                        return result if isinstance(result, dict) else None
                     except json.JSONDecodeError:
                         logger.warning(f"Failed to parse extracted JSON: {json_match[:100]}")
-                
-                # Fallback: try to infer from response text
-                response_lower = response_text.lower()
-                if "true" in response_lower or '"needs_multi_madhab": true' in response_lower:
-                    return (
-                        True,
-                        "LLM determined multi-madhab response is needed",
-                    )
-                else:
-                    return (
-                        False,
-                        "LLM determined single response is sufficient",
-                    )
-
-        except Exception as e:
-            logger.error(f"LLM classification failed: {e}, falling back to keyword check")
-            # Fallback to keyword-based check if LLM fails
-            return self._fallback_keyword_check(question)
+                        return None
+        return None
 
     def _fallback_keyword_check(self, question: str) -> tuple[bool, str]:
         """
@@ -376,7 +567,7 @@ Return ONLY JSON in this exact format:
         if self._gemini_service is None:
             from ..services.gemini_service import GeminiService
 
-            self._gemini_service = GeminiService()
+            self._gemini_service = GeminiService(rag=self.rag)
 
         scope = (
             f" within the {madhab.capitalize()} madhab only"
@@ -413,27 +604,63 @@ Return ONLY a JSON array of strings, e.g. ["query 1", "query 2"].
             logger.warning(f"Failed to generate search queries: {exc}")
             return [question]
 
+    async def _scrape_query(self, query: str) -> list[tuple[str, str]]:
+        """Search one query (curated sources as fallback) and scrape its pages."""
+        # Wide web search via Firecrawl search, fallback to curated sources
+        urls = await self.web_search.search(query, max_results=5)
+        if not urls:
+            urls = self.web_search.build_source_urls(query)
+        scraped = await self.web_search.scrape_urls(urls, limit=4)
+        pages = []
+        for item in scraped:
+            md = item.get("markdown") or item.get("html") or ""
+            if md:
+                pages.append((item.get("url", ""), md[:4000]))
+        return pages
+
+    async def _scrape_queries(self, queries: list[str]) -> list[tuple[int, str, str]]:
+        """Scrape queries concurrently; returns (rank within its query, url, markdown)."""
+        per_query = await asyncio.gather(*(self._scrape_query(q) for q in queries))
+        return [(rank, url, md) for pages in per_query for rank, (url, md) in enumerate(pages)]
+
+    @staticmethod
+    def _pack_web_pages(groups: dict[str, list[tuple[int, str, str]]]) -> dict[str, Any]:
+        """Deduplicate scraped pages and keep the best ones within the web budget."""
+        assembler = ContextAssembler(budget_tokens=settings.web_context_budget)
+        for group, pages in groups.items():
+            for rank, url, md in pages:
+                # Every query's (and madhab's) best page is packed before any second page
+                assembler.add(group, f"\n### Source: {url}\n\n{md}", score=-rank)
+        packed = assembler.assemble()
+        if packed["dropped"] or packed["duplicates"]:
+            logger.info(
+                f"Web context packed to ~{packed['tokens']} tokens: "
+                f"{packed['dropped']} pages over budget, {packed['duplicates']} duplicates"
+            )
+        return packed
+
     async def perform_web_search(self, question: str, attempts: int = 2) -> str:
         """
         Perform web enrichment by scraping authoritative sources using Firecrawl.
         Ensures at least two different queries are used when available.
+        Queries are searched and scraped concurrently; duplicate pages are
+        dropped and the rest packed into ``settings.web_context_budget``.
         """
         attempts = max(1, min(3, attempts))
         queries = await self.generate_search_queries(question, max_attempts=attempts)
 
-        aggregated_markdown: list[str] = []
-        for q in queries[:attempts]:
-            # Wide web search via Firecrawl search, fallback to curated sources
-            urls = await self.web_search.search(q, max_results=5)
-            if not urls:
-                urls = self.web_search.build_source_urls(q)
-            scraped = await self.web_search.scrape_urls(urls, limit=4)
-            for item in scraped:
-                md = item.get("markdown") or item.get("html") or ""
-                if md:
-                    aggregated_markdown.append(f"\n\n### Source: {item.get('url','')}\n\n{md[:4000]}")
+        pages = await self._scrape_queries(queries[:attempts])
+        packed = self._pack_web_pages({"web": pages})
+        return "\n".join(f"\n{section}" for section in packed["sections"].get("web", []))
 
-        return "\n".join(aggregated_markdown)
+    async def _madhab_web_pages(
+        self, question: str, madhab: str, attempts: int
+    ) -> list[tuple[int, str, str]]:
+        """Scrape the web pages of one madhab."""
+        queries = await self.generate_search_queries(
+            question, max_attempts=attempts, madhab=madhab
+        )
+        return await self._scrape_queries(queries[:attempts])
 
     async def perform_web_search_by_madhab(
         self, question: str, madhabs: list[str], attempts: int = 2
@@ -441,7 +668,9 @@ Return ONLY a JSON array of strings, e.g. ["query 1", "query 2"].
         """
         Perform web enrichment per selected madhab, generating separate
         search queries and scraped context for each school. This avoids
-        mixing sources and improves accuracy.
+        mixing sources and improves accuracy. Madhabs are processed
+        concurrently; sections keep the requested madhab order and share
+        one web token budget.
         """
         if not madhabs:
             return await self.perform_web_search(question, attempts)
@@ -458,28 +687,16 @@ Return ONLY a JSON array of strings, e.g. ["query 1", "query 2"].
             if nm:
                 normalized.append(nm)
 
-        aggregated_sections: list[str] = []
-        for m in normalized:
-            queries = await self.generate_search_queries(
-                question, max_attempts=attempts, madhab=m
-            )
-
-            section_md: list[str] = [f"\n\n## {m.upper()} Madhab - Web Context\n"]
-            for q in queries[:attempts]:
-                urls = await self.web_search.search(q, max_results=5)
-                if not urls:
-                    urls = self.web_search.build_source_urls(q)
-
-                scraped = await self.web_search.scrape_urls(urls, limit=4)
-                for item in scraped:
-                    md = item.get("markdown") or item.get("html") or ""
-                    if md:
-                        section_md.append(
-                            f"\n### Source: {item.get('url','')}\n\n{md[:4000]}"
-                        )
+        per_madhab = await asyncio.gather(
+            *(self._madhab_web_pages(question, m, attempts) for m in normalized)
+        )
+        packed = self._pack_web_pages(dict(zip(normalized, per_madhab)))
 
+        aggregated_sections = []
+        for madhab in normalized:
+            section_md = [f"\n\n## {madhab.upper()} Madhab - Web Context\n"]
+            section_md.extend(packed["sections"].get(madhab, []))
             aggregated_sections.append("\n".join(section_md))
-
         return "\n".join(aggregated_sections)
 
 
@@ -0,0 +1,96 @@
+"""
+Shared HTTP clients for LLM providers.
+
+Opening an ``httpx.AsyncClient`` per call pays a TCP + TLS handshake on
+every generation and model listing. The pool keeps one keep-alive client
+per provider base URL for the life of the process, with per-provider
+connection limits, configurable timeouts and HTTP/2 when the ``h2``
+package is installed. Clients carry no credentials: API keys are sent per
+request, since users bring their own keys.
+"""
+
+from __future__ import annotations
+
+import httpx
+from loguru import logger
+
+from ..config import settings
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class ProviderClientPool:
+    """
+    Process-wide pool of provider HTTP clients.
+
+    Example:
+        >>> pool = get_provider_client_pool()
+        >>> client = pool.get("openai", "https://api.openai.com/v1")
+        >>> response = await client.get("/models", headers=auth_headers)
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty pool."""
+        self._clients: dict[tuple[str, str], httpx.AsyncClient] = {}
+
+    def get(self, provider: str, base_url: str) -> httpx.AsyncClient:
+        """
+        Get (or create) the shared client for a provider.
+
+        Args:
+            provider: Provider name (used for logging and limits)
+            base_url: Provider API base URL
+
+        Returns:
+            Pooled AsyncClient with ``base_url`` set
+        """
+        key = (provider, base_url)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            # HTTP/2 needs TLS in practice; local Ollama speaks plain HTTP/1.1
+            use_http2 = HTTP2_AVAILABLE and settings.llm_http2 and base_url.startswith("https://")
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                http2=use_http2,
+                timeout=httpx.Timeout(
+                    settings.llm_http_timeout, connect=settings.llm_http_connect_timeout
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.llm_http_max_connections,
+                    max_keepalive_connections=settings.llm_http_max_keepalive,
+                ),
+            )
+            self._clients[key] = client
+            logger.debug(f"Opened HTTP client for {provider} ({base_url}, http2={use_http2})")
+        return client
+
+    async def aclose(self) -> None:
+        """Close every pooled client."""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            if not client.is_closed:
+                await client.aclose()
+        if clients:
+            logger.info(f"Closed {len(clients)} LLM provider HTTP client(s)")
+
+
+# Global pool instance
+_provider_client_pool: ProviderClientPool | None = None
+
+
+def get_provider_client_pool() -> ProviderClientPool:
+    """
+    Get or create the global provider client pool.
+
+    Returns:
+        ProviderClientPool instance
+    """
+    global _provider_client_pool
+    if _provider_client_pool is None:
+        _provider_client_pool = ProviderClientPool()
+    return _provider_client_pool
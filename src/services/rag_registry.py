@@ -0,0 +1,157 @@
+"""
+Process-wide registry for the embedding model and RAG services.
+
+Loading the SentenceTransformer model and opening the Qdrant database is
+expensive, so the registry builds them once (normally during application
+startup) and hands the same instances to every request path: Gemini,
+the orchestrator, the upload router and the DSPy pipeline.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from ..config import settings
+
+if TYPE_CHECKING:
+    from .fiqh_rag_service import FiqhRAG
+    from .rag_service import MalikiFiqhRAG
+
+
+class RAGRegistry:
+    """
+    Owner of the shared embedding model, Qdrant client and RAG services.
+
+    Instances are created lazily and exactly once; the embedded Qdrant
+    database only allows a single client per path, so `MalikiFiqhRAG`
+    reuses the client and model loaded for `FiqhRAG`.
+
+    Example:
+        >>> registry = get_rag_registry()
+        >>> registry.warm_up()
+        >>> results = registry.fiqh_rag.search("حكم القبض في الصلاة")
+    """
+
+    def __init__(
+        self,
+        persist_directory: str | None = None,
+        embedding_model_name: str | None = None,
+    ) -> None:
+        """
+        Initialize an empty registry.
+
+        Args:
+            persist_directory: Embedded Qdrant path (defaults to settings)
+            embedding_model_name: Sentence-Transformers model (defaults to settings)
+        """
+        self.persist_directory = persist_directory or settings.qdrant_path
+        self.embedding_model_name = embedding_model_name or settings.embedding_model_name
+
+        self._lock = threading.Lock()
+        self._fiqh_rag: FiqhRAG | None = None
+        self._maliki_rag: MalikiFiqhRAG | None = None
+
+        self.warmup_seconds: float | None = None
+        self.last_error: str | None = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the shared embedding model and collections are loaded."""
+        return self._fiqh_rag is not None
+
+    @property
+    def fiqh_rag(self) -> FiqhRAG:
+        """Shared multi-madhab RAG service (created on first access)."""
+        if self._fiqh_rag is None:
+            with self._lock:
+                if self._fiqh_rag is None:
+                    from .embedding_cache import get_embedding_cache
+                    from .fiqh_rag_service import FiqhRAG
+
+                    self._fiqh_rag = FiqhRAG(
+                        persist_directory=self.persist_directory,
+                        embedding_model_name=self.embedding_model_name,
+                        embedding_cache=get_embedding_cache(),
+                    )
+        return self._fiqh_rag
+
+    @property
+    def maliki_rag(self) -> MalikiFiqhRAG:
+        """Shared Maliki-only RAG service reusing the FiqhRAG client and model."""
+        if self._maliki_rag is None:
+            fiqh_rag = self.fiqh_rag
+            with self._lock:
+                if self._maliki_rag is None:
+                    from .rag_service import MalikiFiqhRAG
+
+                    self._maliki_rag = MalikiFiqhRAG(
+                        client=fiqh_rag.client,
+                        embedding_model=fiqh_rag.embedding_model,
+                        embedding_cache=fiqh_rag.embedding_cache,
+                    )
+        return self._maliki_rag
+
+    def warm_up(self) -> bool:
+        """
+        Load the model, ensure collections and run one encode pass.
+
+        Blocking; call it from a worker thread inside async code.
+
+        Returns:
+            True if the registry is ready to serve requests
+        """
+        start = time.perf_counter()
+        try:
+            rag = self.fiqh_rag
+            rag.embedding_model.encode("warm-up", convert_to_numpy=True)
+            self.last_error = None
+        except Exception as exc:
+            self.last_error = str(exc)
+            logger.error(f"RAG warm-up failed: {exc}")
+            return False
+
+        self.warmup_seconds = round(time.perf_counter() - start, 3)
+        logger.info(f"✅ RAG registry warmed up in {self.warmup_seconds}s")
+        return True
+
+    def status(self) -> dict[str, Any]:
+        """Readiness details for health and readiness probes."""
+        return {
+            "ready": self.ready,
+            "embedding_model": self.embedding_model_name,
+            "fiqh_rag_loaded": self._fiqh_rag is not None,
+            "maliki_rag_loaded": self._maliki_rag is not None,
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.last_error,
+        }
+
+    def close(self) -> None:
+        """Release the shared search pool and Qdrant client."""
+        if self._fiqh_rag is None:
+            return
+        try:
+            self._fiqh_rag.close()
+            logger.info("Qdrant client closed")
+        except Exception as exc:
+            logger.error(f"Error closing Qdrant client: {exc}")
+
+
+# Global registry instance
+_rag_registry: RAGRegistry | None = None
+
+
+def get_rag_registry() -> RAGRegistry:
+    """
+    Get or create the global RAG registry.
+
+    Returns:
+        RAGRegistry instance
+    """
+    global _rag_registry
+    if _rag_registry is None:
+        _rag_registry = RAGRegistry()
+    return _rag_registry
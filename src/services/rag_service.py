@@ -5,7 +5,9 @@ This service implements vector search and retrieval for Islamic jurisprudence
 using Qdrant and sentence transformers.
 """
 
+import time
 import uuid
+from collections.abc import Iterable
 from typing import Any
 
 from loguru import logger
@@ -23,6 +25,9 @@ class MalikiFiqhRAG:
         self,
         persist_directory: str = "./qdrant_db",
         collection_name: str = "maliki_fiqh",
+        client: QdrantClient | None = None,
+        embedding_model: SentenceTransformer | None = None,
+        embedding_cache: Any | None = None,
     ) -> None:
         """
         Initialize the RAG system with Qdrant.
@@ -30,19 +35,26 @@ class MalikiFiqhRAG:
         Args:
             persist_directory: Directory to persist Qdrant database
             collection_name: Name of the Qdrant collection
+            client: Existing Qdrant client to reuse (see RAGRegistry)
+            embedding_model: Already-loaded embedding model to reuse
+            embedding_cache: Optional EmbeddingCache used for query vectors
         """
         try:
-            # Initialize Qdrant client (local mode)
-            self.client = QdrantClient(path=persist_directory)
-
-            # Initialize small multilingual embedding model
-            logger.info("Loading multilingual embedding model...")
-            # paraphrase-multilingual-MiniLM-L12-v2 - small, fast, supports 50+ languages including Arabic
-            self.embedding_model = SentenceTransformer(
-                "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
-            )
+            # Initialize Qdrant client (local mode) unless a shared one is given
+            self.client = client or QdrantClient(path=persist_directory)
+
+            if embedding_model is not None:
+                self.embedding_model = embedding_model
+            else:
+                # Initialize small multilingual embedding model
+                logger.info("Loading multilingual embedding model...")
+                # paraphrase-multilingual-MiniLM-L12-v2 - small, fast, supports 50+ languages including Arabic
+                self.embedding_model = SentenceTransformer(
+                    "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+                )
+                logger.info("✅ Embedding model loaded (384 dimensions, multilingual)")
             self.embedding_dim = 384  # Dimension for this model
-            logger.info("✅ Embedding model loaded (384 dimensions, multilingual)")
+            self.embedding_cache = embedding_cache
 
             self.collection_name = collection_name
 
@@ -85,16 +97,16 @@ class MalikiFiqhRAG:
             scraper = MalikiFiqhScraper()
             fiqh_texts = scraper.get_predefined_maliki_texts()
 
+            # Generate all embeddings with one batched model call
+            embeddings = self.embedding_model.encode(
+                [text_data["text"] for text_data in fiqh_texts],
+                convert_to_numpy=True,
+            ).tolist()
+
             # Prepare points for Qdrant
             points = []
 
-            for text_data in fiqh_texts:
-                # Generate embedding
-                embedding = self.embedding_model.encode(
-                    text_data["text"],
-                    convert_to_numpy=True,
-                ).tolist()
-
+            for text_data, embedding in zip(fiqh_texts, embeddings, strict=True):
                 # Create point
                 point = PointStruct(
                     id=str(uuid.uuid4()),
@@ -110,8 +122,6 @@ class MalikiFiqhRAG:
                 )
                 points.append(point)
 
-                logger.info(f"✅ Processed: {text_data['topic']}")
-
             # Upload to Qdrant
             self.client.upsert(
                 collection_name=self.collection_name,
@@ -150,11 +160,8 @@ class MalikiFiqhRAG:
             ...     print(result['payload']['topic'])
         """
         try:
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode(
-                query,
-                convert_to_numpy=True,
-            ).tolist()
+            # Generate query embedding (cached when an embedding cache is configured)
+            query_embedding = self._embed_query(query)
 
             # Build filter
             query_filter = None
@@ -194,6 +201,18 @@ class MalikiFiqhRAG:
             logger.error(f"Error searching knowledge base: {e}")
             return []
 
+    def _embed_query(self, query: str) -> list[float]:
+        """Encode a search query, served from the embedding cache when configured."""
+
+        def compute(text: str) -> list[float]:
+            return self.embedding_model.encode(text, convert_to_numpy=True).tolist()
+
+        if self.embedding_cache is None:
+            return compute(query)
+        return self.embedding_cache.get_or_compute(
+            "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2", query, compute
+        )
+
     def get_relevant_context(
         self,
         query: str,
@@ -319,3 +338,83 @@ class MalikiFiqhRAG:
         except Exception as e:
             logger.error(f"Error adding document: {e}")
             return False
+
+    def add_documents(
+        self,
+        documents: Iterable[dict[str, Any]],
+        batch_size: int = 64,
+        log_every: int = 1000,
+    ) -> dict[str, Any]:
+        """
+        Bulk-add documents, encoding and upserting them in batches.
+
+        Documents are consumed lazily, so large JSONL exports (e.g. Shamela
+        chunks) can be streamed without loading them into memory.
+
+        Args:
+            documents: Iterable of ``{"text": str, "metadata": dict}`` items
+            batch_size: Texts per encode call and points per upsert
+            log_every: Log a progress/throughput line every N added documents
+
+        Returns:
+            Report with added/failed/skipped counts, elapsed seconds and
+            throughput in documents per second
+        """
+        batch_size = max(1, batch_size)
+        report: dict[str, Any] = {"added": 0, "failed": 0, "skipped": 0}
+        buffer: list[tuple[str, dict[str, Any]]] = []
+        start = time.perf_counter()
+        next_log = log_every
+
+        def flush() -> None:
+            nonlocal next_log
+            if not buffer:
+                return
+            try:
+                embeddings = self.embedding_model.encode(
+                    [text for text, _ in buffer],
+                    batch_size=batch_size,
+                    convert_to_numpy=True,
+                ).tolist()
+                points = [
+                    PointStruct(
+                        id=str(uuid.uuid4()),
+                        vector=embedding,
+                        payload={"text": text, **metadata},
+                    )
+                    for (text, metadata), embedding in zip(buffer, embeddings, strict=True)
+                ]
+                self.client.upsert(collection_name=self.collection_name, points=points)
+                report["added"] += len(points)
+            except Exception as e:
+                logger.error(f"Batch upsert failed: {e}")
+                report["failed"] += len(buffer)
+            buffer.clear()
+
+            if log_every and report["added"] >= next_log:
+                elapsed = time.perf_counter() - start
+                logger.info(
+                    f"Ingested {report['added']} documents "
+                    f"({report['added'] / elapsed if elapsed > 0 else 0.0:.1f} docs/s)"
+                )
+                next_log += log_every
+
+        for doc in documents:
+            text = doc.get("text") or ""
+            if not text.strip():
+                report["skipped"] += 1
+                continue
+            buffer.append((text, doc.get("metadata") or {}))
+            if len(buffer) >= batch_size:
+                flush()
+        flush()
+
+        elapsed = time.perf_counter() - start
+        report["seconds"] = round(elapsed, 3)
+        report["docs_per_second"] = round(report["added"] / elapsed, 1) if elapsed > 0 else 0.0
+        logger.info(
+            f"✅ Bulk ingestion finished: {report['added']} added, {report['failed']} failed, "
+            f"{report['skipped']} skipped in {report['seconds']}s "
+            f"({report['docs_per_second']} docs/s)"
+        )
+        return report
@@ -0,0 +1,263 @@
+"""
+In-memory inverted indexes for cached Quran and Hadith text search.
+
+Searching the cache used to mean loading every cached document and
+substring-scanning it for every query. The index is built once from the
+cached content, kept in memory, and persisted back into the cache so
+other workers and restarts can load it instead of rebuilding.
+
+Features:
+- Tokens normalized like query embeddings (diacritics, alef/ya folding)
+- Prefix expansion through a sorted vocabulary (bisect)
+- Phrase matching through token positions
+- TF-IDF style ranking with a phrase bonus
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import math
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from .embedding_cache import normalize_query
+
+INDEX_FORMAT_VERSION = 2
+
+# Quranic annotation marks (small high letters, stop signs) that are not
+# combining characters and therefore survive diacritic stripping.
+_QURANIC_MARKS_RE = re.compile("[\u06d6-\u06ed]")
+_TOKEN_RE = re.compile(r"\w+")
+
+_PREFIX_WEIGHT = 0.5
+_PHRASE_BONUS = 2.0
+_MAX_PREFIX_EXPANSIONS = 64
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into normalized search tokens.
+
+    Args:
+        text: Arabic or English text
+
+    Returns:
+        Normalized tokens in their original order
+    """
+    return _TOKEN_RE.findall(_QURANIC_MARKS_RE.sub("", normalize_query(text)))
+
+
+class InvertedIndex:
+    """
+    Positional inverted index over a fixed set of documents.
+
+    Documents are plain dicts returned as-is in search results; ``text``
+    selects which field gets indexed.
+
+    Example:
+        >>> index = InvertedIndex()
+        >>> index.add({"text": "In the name of Allah"})
+        >>> index.finalize()
+        >>> index.search("name of all")
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.documents: list[dict[str, Any]] = []
+        self.postings: dict[str, dict[int, list[int]]] = defaultdict(dict)
+        self.vocabulary: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, document: dict[str, Any], text: str | None = None) -> int:
+        """
+        Index one document.
+
+        Args:
+            document: Result payload returned on match
+            text: Text to index (defaults to ``document["text"]``)
+
+        Returns:
+            Internal document id
+        """
+        doc_id = len(self.documents)
+        self.documents.append(document)
+        indexed_text = text if text is not None else document.get("text") or ""
+        for position, token in enumerate(tokenize(indexed_text)):
+            self.postings[token].setdefault(doc_id, []).append(position)
+        return doc_id
+
+    def finalize(self) -> InvertedIndex:
+        """Rebuild the sorted vocabulary used for prefix lookups."""
+        self.vocabulary = sorted(self.postings)
+        return self
+
+    def _expand(self, token: str, prefix: bool) -> list[tuple[str, float]]:
+        """Return indexed terms matching ``token`` with their match weight."""
+        terms: list[tuple[str, float]] = []
+        if token in self.postings:
+            terms.append((token, 1.0))
+        if prefix:
+            start = bisect.bisect_left(self.vocabulary, token)
+            for term in self.vocabulary[start : start + _MAX_PREFIX_EXPANSIONS + 1]:
+                if not term.startswith(token):
+                    break
+                if term != token:
+                    terms.append((term, _PREFIX_WEIGHT))
+        return terms
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        prefix: bool = True,
+        match_all: bool = True,
+    ) -> list[dict[str, Any]]:
+        """
+        Rank documents matching the query.
+
+        Args:
+            query: Words or phrase to look up
+            limit: Maximum results
+            prefix: Also match indexed words starting with each query token
+            match_all: Require every query token (False ranks partial matches)
+
+        Returns:
+            Matching documents, best first, each with a ``score`` field
+        """
+        tokens = tokenize(query)
+        if not tokens or not self.documents:
+            return []
+
+        total_docs = len(self.documents)
+        scores: dict[int, float] = defaultdict(float)
+        matched: dict[int, int] = defaultdict(int)
+        positions: list[dict[int, set[int]]] = []
+
+        for token in tokens:
+            token_scores: dict[int, float] = {}
+            token_positions: dict[int, set[int]] = defaultdict(set)
+            for term, weight in self._expand(token, prefix):
+                docs = self.postings[term]
+                idf = math.log(1 + total_docs / len(docs))
+                for doc_id, term_positions in docs.items():
+                    score = weight * idf * (1 + math.log(len(term_positions)))
+                    if score > token_scores.get(doc_id, 0.0):
+                        token_scores[doc_id] = score
+                    token_positions[doc_id].update(term_positions)
+            for doc_id, score in token_scores.items():
+                scores[doc_id] += score
+                matched[doc_id] += 1
+            positions.append(token_positions)
+
+        required = len(tokens) if match_all else 1
+        candidates = [doc_id for doc_id, count in matched.items() if count >= required]
+
+        if len(tokens) > 1:
+            for doc_id in candidates:
+                if self._has_phrase(doc_id, positions):
+                    scores[doc_id] += _PHRASE_BONUS * len(tokens)
+
+        best = heapq.nsmallest(limit, candidates, key=lambda doc_id: (-scores[doc_id], doc_id))
+        return [{**self.documents[doc_id], "score": round(scores[doc_id], 4)} for doc_id in best]
+
+    @staticmethod
+    def _has_phrase(doc_id: int, positions: list[dict[int, set[int]]]) -> bool:
+        """Check whether query tokens appear consecutively in the document."""
+        if any(doc_id not in token_positions for token_positions in positions):
+            return False
+        return any(
+            all(start + offset in positions[offset][doc_id] for offset in range(1, len(positions)))
+            for start in positions[0][doc_id]
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the index for storage in the cache."""
+        return {
+            "version": INDEX_FORMAT_VERSION,
+            "documents": self.documents,
+            # [doc_id, positions] pairs: JSON codecs cannot store int keys exactly
+            "postings": {
+                term: [[doc_id, positions] for doc_id, positions in docs.items()]
+                for term, docs in self.postings.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> InvertedIndex | None:
+        """
+        Restore an index produced by :meth:`to_dict`.
+
+        Returns:
+            InvertedIndex, or None if the payload is from another format version
+        """
+        if not data or data.get("version") != INDEX_FORMAT_VERSION:
+            return None
+        index = cls()
+        index.documents = data["documents"]
+        index.postings = defaultdict(
+            dict,
+            {
+                term: {doc_id: positions for doc_id, positions in docs}
+                for term, docs in data["postings"].items()
+            },
+        )
+        return index.finalize()
+
+
+def build_quran_index(surahs: dict[int, dict[str, Any]]) -> InvertedIndex:
+    """
+    Build an ayah-level index from cached surah payloads.
+
+    Args:
+        surahs: Mapping of surah number to AlQuran Cloud surah data
+
+    Returns:
+        Finalized InvertedIndex whose documents match the shape returned by
+        ``CachedContentService.search_quran_in_cache``
+    """
+    index = InvertedIndex()
+    for surah_num in sorted(surahs):
+        surah = surahs[surah_num]
+        for ayah in surah.get("ayahs", []):
+            index.add(
+                {
+                    "surah_number": surah_num,
+                    "surah_name": surah.get("englishName", ""),
+                    "ayah_number": ayah.get("numberInSurah"),
+                    "text": ayah.get("text"),
+                    "ayah_data": ayah,
+                }
+            )
+    return index.finalize()
+
+
+def build_hadith_index(collection: str, hadiths: Iterable[dict[str, Any]]) -> InvertedIndex:
+    """
+    Build a hadith index over Arabic text and translation.
+
+    Args:
+        collection: Collection ID stored on every document
+        hadiths: Raw hadiths from api.hadith.gading.dev (``number``/``arab``/``id``)
+
+    Returns:
+        Finalized InvertedIndex; documents hold collection, number, arab and text
+    """
+    index = InvertedIndex()
+    seen: set[Any] = set()
+    for hadith in hadiths:
+        number = hadith.get("number")
+        if number is None or number in seen:
+            continue
+        seen.add(number)
+        arab = hadith.get("arab") or ""
+        translation = hadith.get("id") or ""
+        index.add(
+            {"collection": collection, "number": number, "arab": arab, "text": translation},
+            text=f"{arab} {translation}",
+        )
+    return index.finalize()
@@ -0,0 +1,256 @@
+"""
+Semantic Answer Cache for /api/v1/ai/ask.
+
+The exact answer cache only matches a byte-identical question, so a
+rephrased question ("ما حكم المسح على الجوربين" vs "هل يجوز المسح على
+الجوارب") pays for a full retrieval + LLM round trip. This cache stores
+the question embedding next to the final AIResponse in a dedicated Qdrant
+collection and serves the nearest cached answer when it is similar enough.
+
+Answers are only reused within the same scope: provider, model, madhabs,
+language and answer mode must all match, so a Hanafi answer is never
+served for a Maliki question. Expired answers are filtered out in the
+search and periodically deleted when new answers are stored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from ..config import settings
+
+if TYPE_CHECKING:
+    from .fiqh_rag_service import FiqhRAG
+
+
+class SemanticAnswerCache:
+    """
+    Nearest-neighbour cache of final answers keyed on question embeddings.
+
+    Reuses the shared Qdrant client and embedding model from the RAG
+    registry. Methods are synchronous (Qdrant and the encoder are); call
+    them from a worker thread inside async code.
+
+    Example:
+        >>> cache = get_semantic_cache()
+        >>> scope = cache.scope_key(provider="ollama", language="ar", madhabs=["maliki"])
+        >>> hit = cache.lookup("ما حكم المسح على الجوربين؟", scope)
+        >>> if hit:
+        ...     print(hit["similarity"], hit["response"]["content"])
+    """
+
+    def __init__(
+        self,
+        rag: FiqhRAG | None = None,
+        collection_name: str | None = None,
+        threshold: float | None = None,
+        ttl: int | None = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            rag: RAG service providing the Qdrant client and encoder
+                (defaults to the registry's FiqhRAG, loaded on first use)
+            collection_name: Qdrant collection for cached answers
+            threshold: Minimum cosine similarity for a hit
+            ttl: Seconds a cached answer stays servable
+        """
+        self._rag = rag
+        self.collection_name = collection_name or settings.semantic_cache_collection
+        self.threshold = settings.semantic_cache_threshold if threshold is None else threshold
+        self.ttl = ttl or settings.semantic_cache_ttl
+        self.sweep_interval = settings.semantic_cache_sweep_interval
+        self._lock = threading.Lock()
+        self._collection_ready = False
+        self._last_sweep = 0.0
+
+        self.stats = {"lookups": 0, "hits": 0, "stores": 0, "sweeps": 0, "errors": 0}
+
+    @property
+    def rag(self) -> FiqhRAG:
+        """RAG service whose client and encoder back the cache."""
+        if self._rag is None:
+            from .rag_registry import get_rag_registry
+
+            self._rag = get_rag_registry().fiqh_rag
+        return self._rag
+
+    @staticmethod
+    def scope_key(**constraints: Any) -> str:
+        """
+        Build the scope identifier answers must share to be reused.
+
+        Args:
+            **constraints: Provider, model, madhabs, language and mode flags
+
+        Returns:
+            Short hash of the normalized constraints
+        """
+        normalized = {
+            key: sorted(value) if isinstance(value, (list, tuple, set)) else value
+            for key, value in sorted(constraints.items())
+        }
+        return hashlib.md5(repr(normalized).encode()).hexdigest()[:16]
+
+    def _ensure_collection(self) -> None:
+        if self._collection_ready:
+            return
+        with self._lock:
+            if not self._collection_ready:
+                self.rag._ensure_collection(self.collection_name)
+                self._collection_ready = True
+
+    def lookup(self, question: str, scope: str) -> dict[str, Any] | None:
+        """
+        Find a cached answer for a semantically similar question.
+
+        Args:
+            question: Incoming question
+            scope: Value from :meth:`scope_key` for the request
+
+        Returns:
+            Dict with response, similarity and matched_question, or None
+        """
+        from .fiqh_rag_service import FieldCondition, Filter, MatchValue, Range
+
+        self.stats["lookups"] += 1
+        try:
+            self._ensure_collection()
+            vector = self.rag._embed_query(question)
+            results = self.rag.client.search(
+                collection_name=self.collection_name,
+                query_vector=vector,
+                limit=5,
+                query_filter=Filter(
+                    must=[
+                        FieldCondition(key="scope", match=MatchValue(value=scope)),
+                        FieldCondition(key="expires_at", range=Range(gte=time.time())),
+                    ]
+                ),
+                score_threshold=self.threshold,
+            )
+        except Exception as e:
+            logger.error(f"Semantic cache lookup failed: {e}")
+            self.stats["errors"] += 1
+            return None
+
+        if not results:
+            return None
+        best = results[0]
+        payload = best.payload or {}
+        self.stats["hits"] += 1
+        similarity = round(float(best.score), 4)
+        logger.info(
+            f"Semantic cache HIT (similarity={similarity}): "
+            f"{question[:50]}... ≈ {payload.get('question', '')[:50]}..."
+        )
+        return {
+            "response": payload["response"],
+            "similarity": similarity,
+            "matched_question": payload.get("question"),
+        }
+
+    def store(self, question: str, scope: str, response: dict[str, Any]) -> bool:
+        """
+        Store a final answer under the question's embedding.
+
+        Args:
+            question: Question the answer was generated for
+            scope: Value from :meth:`scope_key` for the request
+            response: Serialized AIResponse
+
+        Returns:
+            True if stored successfully
+        """
+        from .fiqh_rag_service import PointStruct
+
+        try:
+            self._ensure_collection()
+            point = PointStruct(
+                # One point per (scope, question) so re-asking overwrites it
+                id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"{scope}:{question}")),
+                vector=self.rag._embed_query(question),
+                payload={
+                    "scope": scope,
+                    "question": question,
+                    "response": response,
+                    "expires_at": time.time() + self.ttl,
+                },
+            )
+            self.rag.client.upsert(collection_name=self.collection_name, points=[point])
+            self.stats["stores"] += 1
+            return True
+        except Exception as e:
+            logger.error(f"Semantic cache store failed: {e}")
+            self.stats["errors"] += 1
+            return False
+        finally:
+            if time.time() - self._last_sweep >= self.sweep_interval:
+                self.sweep_expired()
+
+    def sweep_expired(self) -> bool:
+        """
+        Delete answers whose TTL has passed so the collection stays bounded.
+
+        Returns:
+            True if the delete request succeeded
+        """
+        from .fiqh_rag_service import FieldCondition, Filter, FilterSelector, Range
+
+        self._last_sweep = time.time()
+        try:
+            self._ensure_collection()
+            self.rag.client.delete(
+                collection_name=self.collection_name,
+                points_selector=FilterSelector(
+                    filter=Filter(
+                        must=[FieldCondition(key="expires_at", range=Range(lt=self._last_sweep))]
+                    )
+                ),
+            )
+            self.stats["sweeps"] += 1
+            return True
+        except Exception as e:
+            logger.error(f"Semantic cache sweep failed: {e}")
+            self.stats["errors"] += 1
+            return False
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get semantic cache statistics.
+
+        Returns:
+            Dictionary with counters, hit rate and threshold
+        """
+        lookups = self.stats["lookups"]
+        hit_rate = (self.stats["hits"] / lookups * 100) if lookups > 0 else 0
+        return {
+            **self.stats,
+            "hit_rate_percent": round(hit_rate, 2),
+            "threshold": self.threshold,
+            "collection": self.collection_name,
+        }
+
+
+# Global semantic cache instance
+_semantic_cache: SemanticAnswerCache | None = None
+
+
+def get_semantic_cache() -> SemanticAnswerCache:
+    """
+    Get or create the global semantic answer cache.
+
+    Returns:
+        SemanticAnswerCache instance
+    """
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticAnswerCache()
+    return _semantic_cache
@@ -4,17 +4,32 @@ Web Search Service using Firecrawl.
 This service enriches answers by scraping authoritative Islamic resources
 via Firecrawl's /scrape endpoint.
 
+Scrapes run concurrently over one pooled HTTP client, bounded by a global
+and a per-target-host limit. ``scrape_urls`` keeps the first N successful
+pages within a deadline and cancels the rest.
+
+Scraped pages and search results are cached in the CacheService: a URL
+entry (fetch time, ETag/Last-Modified) points at a content-addressed body,
+and stale pages are revalidated with a conditional HEAD before paying for
+another Firecrawl scrape.
+
 Reference: https://docs.firecrawl.dev/features/scrape
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import time
 from typing import Any, Iterable
+from urllib.parse import urlsplit
 
 import httpx
 from loguru import logger
 
 from ..config import settings
+from .cache_service import cached, get_cache_service
 
 
 FIRECRAWL_API_BASE = "https://api.firecrawl.dev/v2"
@@ -28,75 +43,253 @@ class WebSearchService:
         if not self.api_key:
             logger.warning("Firecrawl API key not configured; web search disabled")
 
+        self._client: httpx.AsyncClient | None = None
+        self._site_client: httpx.AsyncClient | None = None
+        self._semaphore = asyncio.Semaphore(settings.web_search_max_concurrency)
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+        self.stats = {"page_hits": 0, "page_misses": 0, "page_revalidated": 0}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared Firecrawl client (connection pool reused across scrapes)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=FIRECRAWL_API_BASE,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=httpx.Timeout(settings.web_search_request_timeout, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=settings.web_search_max_concurrency,
+                    max_keepalive_connections=settings.web_search_max_concurrency,
+                ),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the pooled HTTP clients."""
+        for client in (self._client, self._site_client):
+            if client is not None and not client.is_closed:
+                await client.aclose()
+        self._client = None
+        self._site_client = None
+
+    async def _post(self, path: str, payload: dict[str, Any]) -> Any:
+        resp = await self._get_client().post(path, json=payload)
+        resp.raise_for_status()
+        return resp.json()
+
+    @staticmethod
+    def _page_key(url: str, formats: list[str]) -> str:
+        digest = hashlib.md5(f"{url}|{','.join(formats)}".encode()).hexdigest()
+        return f"web_page:{digest}"
+
+    async def _revalidate(self, url: str, entry: dict[str, Any]) -> bool:
+        """
+        Ask the origin whether a cached page changed (conditional HEAD).
+
+        Returns:
+            True if the origin answered 304 Not Modified
+        """
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        if not headers:
+            return False
+
+        # Separate client: the Firecrawl bearer token must not reach other hosts
+        if self._site_client is None or self._site_client.is_closed:
+            self._site_client = httpx.AsyncClient(timeout=10.0, follow_redirects=True)
+        try:
+            resp = await self._site_client.head(url, headers=headers)
+            return resp.status_code == 304
+        except Exception as exc:
+            logger.debug(f"Revalidation failed for {url}: {exc}")
+            return False
+
+    async def _store_page(
+        self, key: str, url: str, data: dict[str, Any], formats: list[str]
+    ) -> None:
+        """Store a scraped page: URL entry plus content-addressed body."""
+        metadata = data.get("metadata") if isinstance(data.get("metadata"), dict) else {}
+        headers = {str(k).lower(): v for k, v in metadata.items()}
+        body = {fmt: data.get(fmt) for fmt in formats if data.get(fmt)}
+        content_hash = hashlib.sha256(
+            json.dumps(body, sort_keys=True, ensure_ascii=False).encode()
+        ).hexdigest()
+
+        ttl = settings.web_page_cache_ttl * 2  # fresh for one TTL, revalidatable for another
+        cache = get_cache_service()
+        await cache.set(f"web_page_body:{content_hash}", body, ttl=ttl)
+        await cache.set(
+            key,
+            {
+                "url": url,
+                "content_hash": content_hash,
+                "etag": headers.get("etag"),
+                "last_modified": headers.get("last-modified") or headers.get("lastmodified"),
+                "fetched_at": time.time(),
+                "metadata": metadata,
+            },
+            ttl=ttl,
+        )
+
+    async def _cached_page(self, key: str, url: str) -> dict[str, Any] | None:
+        """Return a cached page if fresh, or stale but confirmed unchanged by the origin."""
+        cache = get_cache_service()
+        entry = await cache.get(key)
+        if not entry:
+            return None
+
+        age = time.time() - entry["fetched_at"]
+        if age > settings.web_page_cache_ttl:
+            if not await self._revalidate(url, entry):
+                return None
+            self.stats["page_revalidated"] += 1
+            # Copy: the memory tier hands out the stored dict itself
+            entry = {**entry, "fetched_at": time.time()}
+            await cache.set(key, entry, ttl=settings.web_page_cache_ttl * 2)
+
+        body = await cache.get(f"web_page_body:{entry['content_hash']}")
+        if not body:
+            return None
+        return {**body, "metadata": entry.get("metadata", {})}
+
     async def scrape_url(self, url: str, formats: list[str] | None = None) -> dict[str, Any]:
         """
         Scrape a single URL and return data payload with markdown/html.
 
+        Pages are served from the page cache while fresh (or unchanged per
+        ETag/Last-Modified); only misses go to Firecrawl.
+
         Returns empty dict if API key missing or request fails.
         """
         if not self.api_key:
             return {}
 
+        formats = formats or ["markdown"]
+        key = self._page_key(url, formats)
+        cached_page = await self._cached_page(key, url)
+        if cached_page is not None:
+            self.stats["page_hits"] += 1
+            return cached_page
+        self.stats["page_misses"] += 1
+
         try:
-            payload: dict[str, Any] = {"url": url, "formats": formats or ["markdown"]}
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                resp = await client.post(
-                    f"{FIRECRAWL_API_BASE}/scrape",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                    json=payload,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                if isinstance(data, dict) and data.get("success") and isinstance(
-                    data.get("data"), dict
-                ):
-                    return data["data"]
-                return {}
+            payload: dict[str, Any] = {"url": url, "formats": formats}
+            data = await self._post("/scrape", payload)
+            if isinstance(data, dict) and data.get("success") and isinstance(
+                data.get("data"), dict
+            ):
+                await self._store_page(key, url, data["data"], formats)
+                return data["data"]
+            return {}
         except Exception as exc:
             logger.error(f"Firecrawl scrape failed for {url}: {exc}")
             return {}
 
-    async def scrape_urls(self, urls: Iterable[str], limit: int = 4) -> list[dict[str, Any]]:
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get page cache statistics.
+
+        Returns:
+            Dictionary with page hits, misses and revalidations
+        """
+        lookups = self.stats["page_hits"] + self.stats["page_misses"]
+        hit_rate = (self.stats["page_hits"] / lookups * 100) if lookups > 0 else 0
+        return {**self.stats, "page_hit_rate_percent": round(hit_rate, 2)}
+
+    async def _scrape_limited(self, url: str) -> dict[str, Any]:
+        """Scrape one URL within the global and per-host concurrency limits."""
+        host = urlsplit(url).hostname or ""
+        host_semaphore = self._host_semaphores.setdefault(
+            host, asyncio.Semaphore(settings.web_search_per_host_limit)
+        )
+        async with self._semaphore, host_semaphore:
+            return await self.scrape_url(url)
+
+    async def scrape_urls(
+        self,
+        urls: Iterable[str],
+        limit: int = 4,
+        deadline: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Scrape URLs concurrently and keep the first ``limit`` successful pages.
+
+        Remaining scrapes are cancelled once enough pages arrived or the
+        deadline passed.
+
+        Args:
+            urls: Candidate URLs (duplicates ignored)
+            limit: Number of pages wanted
+            deadline: Seconds to wait overall (defaults to settings)
+
+        Returns:
+            Scraped pages ({"url", "markdown", ...}) in completion order
+        """
+        candidates = list(dict.fromkeys(urls))
+        if not self.api_key or not candidates or limit <= 0:
+            return []
+
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + (settings.web_search_deadline if deadline is None else deadline)
+        tasks = {asyncio.create_task(self._scrape_limited(url)): url for url in candidates}
+        pending = set(tasks)
         results: list[dict[str, Any]] = []
-        for idx, url in enumerate(urls):
-            if idx >= limit:
-                break
-            data = await self.scrape_url(url)
-            if data:
-                results.append({"url": url, **data})
+
+        try:
+            while pending and len(results) < limit:
+                remaining = expires_at - loop.time()
+                if remaining <= 0:
+                    logger.warning(
+                        f"Web scrape deadline reached with {len(results)}/{limit} pages"
+                    )
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    data = task.result()
+                    if data and len(results) < limit:
+                        results.append({"url": tasks[task], **data})
+        finally:
+            for task in pending:
+                task.cancel()
+
         return results
 
+    @cached(
+        prefix="web_search",
+        ttl=settings.web_search_cache_ttl,
+        negative_ttl=300,
+        negative_if=lambda urls: not urls,
+    )
     async def search(self, query: str, max_results: int = 5) -> list[str]:
         """Use Firecrawl search to get a wide set of URLs for a query.
 
+        Results are cached per query, so repeated enrichment skips the call.
         Falls back to returning an empty list if search is unavailable.
         """
         if not self.api_key:
             return []
         try:
             payload: dict[str, Any] = {"query": query, "limit": max_results}
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                resp = await client.post(
-                    f"{FIRECRAWL_API_BASE}/search",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                    json=payload,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                urls: list[str] = []
-                # Try common shapes
-                if isinstance(data, dict):
-                    d = data.get("data") if isinstance(data.get("data"), dict) else data
-                    # results: [{url:...}]
-                    for item in d.get("results", []) if isinstance(d.get("results"), list) else []:
-                        u = item.get("url")
-                        if isinstance(u, str):
-                            urls.append(u)
-                    # links: [str]
-                    for u in d.get("links", []) if isinstance(d.get("links"), list) else []:
-                        if isinstance(u, str):
-                            urls.append(u)
-                return urls[:max_results]
+            data = await self._post("/search", payload)
+            urls: list[str] = []
+            # Try common shapes
+            if isinstance(data, dict):
+                d = data.get("data") if isinstance(data.get("data"), dict) else data
+                # results: [{url:...}]
+                for item in d.get("results", []) if isinstance(d.get("results"), list) else []:
+                    u = item.get("url")
+                    if isinstance(u, str):
+                        urls.append(u)
+                # links: [str]
+                for u in d.get("links", []) if isinstance(d.get("links"), list) else []:
+                    if isinstance(u, str):
+                        urls.append(u)
+            return urls[:max_results]
         except Exception as exc:
             logger.error(f"Firecrawl search failed: {exc}")
             return []
@@ -115,3 +308,18 @@ class WebSearchService:
         ]
 
 
+# Global web search service instance
+_web_search_service: WebSearchService | None = None
+
+
+def get_web_search_service() -> WebSearchService:
+    """
+    Get or create the global web search service.
+
+    Returns:
+        WebSearchService instance
+    """
+    global _web_search_service
+    if _web_search_service is None:
+        _web_search_service = WebSearchService()
+    return _web_search_service
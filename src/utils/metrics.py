@@ -0,0 +1,103 @@
+"""
+Lightweight in-process metrics.
+
+Fixed-bucket latency histograms for hot paths (cache tiers, providers)
+without pulling in a metrics client library. Snapshots are plain dicts
+so they can be returned from the /api/v1/metrics endpoints.
+"""
+
+import bisect
+import threading
+from typing import Any
+
+# Upper bounds in milliseconds; the last bucket is open-ended
+DEFAULT_BUCKETS_MS: tuple[float, ...] = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000,
+)
+
+
+class LatencyHistogram:
+    """
+    Thread-safe latency histogram with approximate percentiles.
+
+    Example:
+        >>> hist = LatencyHistogram()
+        >>> hist.observe(0.0042)  # seconds
+        >>> hist.snapshot()["p50_ms"]
+        5
+    """
+
+    def __init__(self, buckets_ms: tuple[float, ...] = DEFAULT_BUCKETS_MS) -> None:
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets_ms: Sorted bucket upper bounds in milliseconds
+        """
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration in seconds."""
+        ms = seconds * 1000
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Approximate a percentile as the upper bound of its bucket.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Milliseconds, or None when nothing was recorded
+        """
+        with self._lock:
+            if not self.count:
+                return None
+            rank = q / 100 * self.count
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank and bucket_count:
+                    if index < len(self.buckets_ms):
+                        return min(self.buckets_ms[index], self.max_ms)
+                    return self.max_ms
+            return self.max_ms
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return count, mean, max, p50/p95/p99 and non-empty buckets."""
+        with self._lock:
+            count = self.count
+            mean = self.total_ms / count if count else None
+            max_ms = self.max_ms
+            buckets = {
+                (f"le_{bound}" if i < len(self.buckets_ms) else "inf"): n
+                for i, (bound, n) in enumerate(zip((*self.buckets_ms, None), self.counts))
+                if n
+            }
+        return {
+            "count": count,
+            "mean_ms": round(mean, 3) if mean is not None else None,
+            "max_ms": round(max_ms, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": buckets,
+        }
+
+    def reset(self) -> None:
+        """Clear all recorded observations."""
+        with self._lock:
+            self.counts = [0] * (len(self.buckets_ms) + 1)
+            self.count = 0
+            self.total_ms = 0.0
+            self.max_ms = 0.0
@@ -0,0 +1,237 @@
+"""
+Prompt-size budgeting for LLM calls.
+
+Prompts concatenate RAG chunks, Quran/Hadith texts and scraped web pages.
+``ContextAssembler`` collects those pieces as scored evidence, drops
+near-duplicates (the same page scraped by two queries, overlapping
+chunks) and greedily packs the highest-scoring pieces into a token
+budget. The packed sections keep their original order.
+
+Token counts are estimates: ``tiktoken`` is used for OpenAI-family
+models when installed, otherwise a script-aware characters-per-token
+heuristic (Arabic text splits into more tokens than English).
+"""
+
+import math
+import re
+from typing import Any
+
+from ..config import settings
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+_ARABIC_CHARS = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]")
+_WORDS = re.compile(r"\w+", re.UNICODE)
+_MARKDOWN_HEADING = re.compile(r"\n+(?=#{2,3} )")
+
+# Average characters per token of non-Arabic text, by provider
+_CHARS_PER_TOKEN = {
+    "openai": 4.0,
+    "openrouter": 3.8,
+    "groq": 3.8,
+    "gemini": 4.0,
+    "anthropic": 3.5,
+    "ollama": 3.5,
+}
+_DEFAULT_CHARS_PER_TOKEN = 3.8
+_ARABIC_CHARS_PER_TOKEN = 2.5
+
+_TIKTOKEN_PROVIDERS = ("openai", "openrouter", "groq")
+
+
+def _tiktoken_count(text: str, model: str | None) -> int:
+    try:
+        encoding = tiktoken.encoding_for_model(model or "")
+    except Exception:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    return len(encoding.encode(text))
+
+
+def estimate_tokens(text: str, provider: str | None = None, model: str | None = None) -> int:
+    """
+    Estimate how many tokens a text costs for a provider/model.
+
+    Args:
+        text: Text to measure
+        provider: Provider name (selects the tokenizer heuristic)
+        model: Model ID (used by tiktoken when available)
+
+    Returns:
+        Estimated token count
+
+    Example:
+        >>> estimate_tokens("What is the ruling on wiping over socks?", "openai")
+        10
+    """
+    if not text:
+        return 0
+    if TIKTOKEN_AVAILABLE and provider in _TIKTOKEN_PROVIDERS:
+        return _tiktoken_count(text, model)
+
+    arabic = len(_ARABIC_CHARS.findall(text))
+    other = len(text) - arabic
+    chars_per_token = _CHARS_PER_TOKEN.get(provider or "", _DEFAULT_CHARS_PER_TOKEN)
+    return math.ceil(arabic / _ARABIC_CHARS_PER_TOKEN + other / chars_per_token)
+
+
+def context_budget(provider: str | None = None) -> int:
+    """
+    Token budget for retrieved context sent to a provider.
+
+    Args:
+        provider: Provider name
+
+    Returns:
+        Budget from ``prompt_context_budget_by_provider`` or the default
+    """
+    return settings.prompt_context_budget_by_provider.get(
+        provider or "", settings.prompt_context_budget
+    )
+
+
+def _shingles(text: str, size: int = 3) -> set[tuple[str, ...]]:
+    words = _WORDS.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+class ContextAssembler:
+    """
+    Deduplicate scored evidence and pack it into a token budget.
+
+    Example:
+        >>> assembler = ContextAssembler(budget_tokens=2000, provider="groq")
+        >>> assembler.add("fiqh", chunk_text, score=0.82)
+        >>> assembler.add("web", page_markdown, score=0.4)
+        >>> packed = assembler.assemble()
+        >>> "\\n".join(packed["sections"]["fiqh"]), packed["tokens"]
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int | None = None,
+        provider: str | None = None,
+        model: str | None = None,
+        dedup_threshold: float | None = None,
+    ) -> None:
+        """
+        Initialize an empty assembler.
+
+        Args:
+            budget_tokens: Context budget (defaults to the provider's budget)
+            provider: Provider the prompt is for (token estimation)
+            model: Model the prompt is for (token estimation)
+            dedup_threshold: Shingle overlap at which a piece counts as a
+                duplicate of a higher-scoring one
+        """
+        self.provider = provider
+        self.model = model
+        self.budget_tokens = budget_tokens or context_budget(provider)
+        self.dedup_threshold = (
+            settings.prompt_dedup_threshold if dedup_threshold is None else dedup_threshold
+        )
+        self._pieces: list[dict[str, Any]] = []
+
+    def add(self, kind: str, text: str, score: float = 0.0) -> None:
+        """
+        Offer a piece of evidence.
+
+        Args:
+            kind: Section the piece belongs to (e.g. 'quran', 'fiqh', 'web')
+            text: Formatted text of the piece
+            score: Relevance; higher-scoring pieces are packed first
+        """
+        if text and text.strip():
+            self._pieces.append(
+                {"index": len(self._pieces), "kind": kind, "text": text, "score": score}
+            )
+
+    def assemble(self) -> dict[str, Any]:
+        """
+        Pack the best non-duplicate pieces into the budget.
+
+        Returns:
+            Dictionary with sections (kind -> texts in original order),
+            tokens, budget, included, dropped and duplicates counts
+        """
+        ranked = sorted(self._pieces, key=lambda p: (-p["score"], p["index"]))
+        kept: list[dict[str, Any]] = []
+        kept_shingles: list[set[tuple[str, ...]]] = []
+        duplicates = dropped = tokens = 0
+
+        for piece in ranked:
+            shingles = _shingles(piece["text"])
+            if any(
+                shingles
+                and other
+                and len(shingles & other) / min(len(shingles), len(other)) >= self.dedup_threshold
+                for other in kept_shingles
+            ):
+                duplicates += 1
+                continue
+
+            cost = estimate_tokens(piece["text"], self.provider, self.model)
+            if tokens + cost > self.budget_tokens:
+                # Keep trying: a smaller, lower-scoring piece may still fit
+                dropped += 1
+                continue
+            tokens += cost
+            kept.append(piece)
+            kept_shingles.append(shingles)
+
+        sections: dict[str, list[str]] = {}
+        for piece in sorted(kept, key=lambda p: p["index"]):
+            sections.setdefault(piece["kind"], []).append(piece["text"])
+
+        return {
+            "sections": sections,
+            "tokens": tokens,
+            "budget": self.budget_tokens,
+            "included": len(kept),
+            "dropped": dropped,
+            "duplicates": duplicates,
+        }
+
+
+def split_markdown_sections(text: str) -> list[str]:
+    """
+    Split assembled web context into its ``##``/``###`` sections.
+
+    Args:
+        text: Markdown built from scraped pages
+
+    Returns:
+        Non-empty sections, each starting with its heading
+    """
+    return [section for section in _MARKDOWN_HEADING.split(text or "") if section.strip()]
+
+
+def prompt_token_report(
+    prompt: str, packed: dict[str, Any], provider: str | None = None, model: str | None = None
+) -> dict[str, Any]:
+    """
+    Summarize a packed prompt for response metadata.
+
+    Args:
+        prompt: Final prompt sent to the model
+        packed: Result of ``ContextAssembler.assemble``
+        provider: Provider the prompt was sent to
+        model: Model the prompt was sent to
+
+    Returns:
+        Dictionary with prompt and context token estimates and packing counts
+    """
+    return {
+        "prompt": estimate_tokens(prompt, provider, model),
+        "context": packed["tokens"],
+        "budget": packed["budget"],
+        "included": packed["included"],
+        "dropped": packed["dropped"],
+        "duplicates": packed["duplicates"],
+    }
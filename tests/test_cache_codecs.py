@@ -0,0 +1,114 @@
+"""Tests for CacheService value codecs."""
+
+from __future__ import annotations
+
+import enum
+import pickle
+from datetime import datetime
+
+import pytest
+
+from src.config import settings
+from src.services.cache_codecs import (
+    COMPRESSION_NONE,
+    FORMAT_VERSION,
+    MAGIC,
+    CacheCodec,
+    CodecError,
+)
+
+
+class Madhab(enum.Enum):
+    MALIKI = "maliki"
+
+
+SURAH = {
+    "number": 112,
+    "englishName": "Al-Ikhlaas",
+    "ayahs": [
+        {"numberInSurah": i, "text": "قُلْ هُوَ ٱللَّهُ أَحَدٌ", "juz": 30, "sajda": False}
+        for i in range(1, 200)
+    ],
+}
+
+
+class TestCacheCodec:
+    """Test envelope encoding, compression and pickle policy."""
+
+    def test_orjson_roundtrip_with_header(self):
+        codec = CacheCodec("orjson", compress_min_bytes=0, allow_pickle=False)
+        data = codec.encode(SURAH)
+
+        assert data.startswith(MAGIC)
+        assert data[len(MAGIC)] == FORMAT_VERSION
+        assert data[len(MAGIC) + 2] == COMPRESSION_NONE
+        assert codec.decode(data) == SURAH
+
+    def test_large_payload_is_compressed(self, monkeypatch):
+        monkeypatch.setattr(settings, "cache_compress_zlib", True)
+        plain = CacheCodec("orjson", compress_min_bytes=0).encode(SURAH)
+        compressed = CacheCodec("orjson", compress_min_bytes=1024).encode(SURAH)
+
+        assert len(compressed) < len(plain)
+        assert CacheCodec("orjson").decode(compressed) == SURAH
+
+    def test_zlib_is_opt_in(self, monkeypatch):
+        monkeypatch.setattr(settings, "cache_compress_zlib", False)
+        monkeypatch.setattr("src.services.cache_codecs.ZSTD_AVAILABLE", False)
+        data = CacheCodec("orjson", compress_min_bytes=1024).encode(SURAH)
+
+        assert data[len(MAGIC) + 2] == COMPRESSION_NONE
+
+    @pytest.mark.parametrize(
+        "value",
+        [{"ids": {3, 1, 2}}, {1: "al-fatiha"}, {"when": datetime(2026, 1, 1)}],
+    )
+    def test_encoder_rejects_types_it_would_convert(self, value):
+        with pytest.raises(CodecError):
+            CacheCodec("orjson", allow_pickle=False, strict=False).encode(value)
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            {"pair": (1, 2)},
+            [{"nested": ("a",)}],
+            {"score": float("nan")},
+            {"madhab": Madhab.MALIKI},
+        ],
+    )
+    def test_strict_mode_rejects_remaining_conversions(self, value):
+        with pytest.raises(CodecError):
+            CacheCodec("orjson", allow_pickle=False, strict=True).encode(value)
+
+    def test_strict_mode_accepts_plain_payloads(self):
+        codec = CacheCodec("orjson", allow_pickle=False, strict=True)
+        assert codec.decode(codec.encode(SURAH)) == SURAH
+
+    def test_unencodable_value_uses_pickle_only_when_allowed(self):
+        value = {"when": object, "pair": (1, 2)}
+
+        with pytest.raises(CodecError):
+            CacheCodec("orjson", allow_pickle=False).encode(value)
+        codec = CacheCodec("orjson", allow_pickle=True)
+        assert codec.decode(codec.encode(value)) == value
+
+    def test_pickle_entries_rejected_by_default(self):
+        data = CacheCodec("orjson", allow_pickle=True).encode({"when": object})
+
+        with pytest.raises(CodecError):
+            CacheCodec("orjson", allow_pickle=False).decode(data)
+
+    def test_legacy_pickle_entries_need_migration_flag(self):
+        legacy = pickle.dumps({"surah": 1})
+
+        assert CacheCodec("orjson", pickle_migration=True).decode(legacy) == {"surah": 1}
+        with pytest.raises(CodecError):
+            CacheCodec("orjson", allow_pickle=True, pickle_migration=False).decode(legacy)
+
+    def test_pickle_codec_requires_opt_in(self):
+        with pytest.raises(ValueError):
+            CacheCodec("pickle", allow_pickle=False)
+
+    def test_unknown_codec_rejected(self):
+        with pytest.raises(ValueError):
+            CacheCodec("yaml")
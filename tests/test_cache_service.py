@@ -4,6 +4,8 @@ Comprehensive tests for Cache Service.
 Tests both in-memory and Redis caching functionality.
 """
 
+import asyncio
+import time
 from typing import Any
 
 import pytest
@@ -146,6 +148,28 @@ class TestCacheService:
             else:
                 assert retrieved == value
 
+    @pytest.mark.asyncio
+    async def test_set_many_and_get_many(self, cache: CacheService):
+        """Test bulk set/get with per-key statistics."""
+        items = {f"bulk:{i}": {"n": i} for i in range(5)}
+
+        assert await cache.set_many(items, ttl=60, chunk_size=2) is True
+        found = await cache.get_many([*items, "bulk:missing"], chunk_size=2)
+
+        assert found == items
+        assert cache.stats["sets"] == 5
+        assert cache.stats["hits"] == 5
+        assert cache.stats["memory_hits"] == 5
+        assert cache.stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_many_deduplicates_keys(self, cache: CacheService):
+        """Test repeated keys are looked up once."""
+        await cache.set("dup", 1)
+
+        assert await cache.get_many(["dup", "dup"]) == {"dup": 1}
+        assert cache.stats["hits"] == 1
+
     @pytest.mark.asyncio
     async def test_get_cache_service_singleton(self):
         """Test that get_cache_service returns singleton instance."""
@@ -154,6 +178,148 @@ class TestCacheService:
         assert cache1 is cache2
 
 
+class _FakePipeline:
+    """Minimal pipeline recording GET/PTTL/MGET/SETEX calls."""
+
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self.redis = redis
+        self.calls: list[tuple[str, tuple]] = []
+
+    def __getattr__(self, name: str):
+        def record(*args):
+            self.calls.append((name, args))
+            return self
+
+        return record
+
+    async def execute(self) -> list[Any]:
+        self.redis.round_trips += 1
+        return [getattr(self.redis, f"_{name}")(*args) for name, args in self.calls]
+
+
+class _FakeRedis:
+    """In-process stand-in for redis.asyncio.Redis with TTL bookkeeping."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.ttl_ms: dict[str, int] = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+    async def setex(self, key: str, ttl: int, value: bytes) -> None:
+        self.round_trips += 1
+        self._setex(key, ttl, value)
+
+    def _setex(self, key: str, ttl: int, value: bytes) -> bool:
+        self.data[key] = value
+        self.ttl_ms[key] = ttl * 1000
+        return True
+
+    def _get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    def _mget(self, keys: list[str]) -> list[bytes | None]:
+        return [self.data.get(key) for key in keys]
+
+    def _pttl(self, key: str) -> int:
+        return self.ttl_ms.get(key, -2)
+
+    def lock(self, name: str, timeout: float, blocking: bool) -> "_FakeLock":
+        return _FakeLock(self, name)
+
+
+class _FakeLock:
+    """Non-blocking lock over the fake Redis keyspace."""
+
+    def __init__(self, redis: _FakeRedis, name: str) -> None:
+        self.redis = redis
+        self.name = name
+
+    async def acquire(self) -> bool:
+        if self.name in self.redis.data:
+            return False
+        self.redis.data[self.name] = b"token"
+        return True
+
+    async def release(self) -> None:
+        self.redis.data.pop(self.name, None)
+
+
+class TestTwoTierPromotion:
+    """Test read-through promotion from Redis into the memory tier."""
+
+    @pytest.fixture
+    def cache(self) -> CacheService:
+        cache = CacheService()
+        cache.redis_client = _FakeRedis()
+        cache.redis_enabled = True
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_is_promoted_with_remaining_ttl(self, cache: CacheService):
+        await cache.redis_client.setex("prayer_times:cairo", 30, cache.codec.encode({"fajr": "04:12"}))
+
+        assert await cache.get("prayer_times:cairo") == {"fajr": "04:12"}
+        assert await cache.get("prayer_times:cairo") == {"fajr": "04:12"}
+
+        assert cache.stats["redis_hits"] == 1
+        assert cache.stats["memory_hits"] == 1
+        assert cache.stats["promotions"] == 1
+        assert cache.redis_client.round_trips == 2  # setex + one pipelined GET/PTTL
+        expires_at, _ = cache.memory_cache["prayer_times:cairo"]
+        assert expires_at - time.monotonic() <= 30
+
+    @pytest.mark.asyncio
+    async def test_prefix_with_zero_ttl_stays_out_of_memory(self, cache: CacheService):
+        await cache.set("quran_index:quran-uthmani", {"version": 2})
+
+        assert "quran_index:quran-uthmani" not in cache.memory_cache
+        assert await cache.get("quran_index:quran-uthmani") == {"version": 2}
+        assert cache.stats["promotions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_many_skips_redis_for_memory_hits(self, cache: CacheService):
+        await cache.set_many({"quran_surah:1:x": 1, "quran_surah:2:x": 2})
+        cache.memory_cache.pop("quran_surah:2:x")
+        trips = cache.redis_client.round_trips
+
+        assert await cache.get_many(["quran_surah:1:x", "quran_surah:2:x"]) == {
+            "quran_surah:1:x": 1,
+            "quran_surah:2:x": 2,
+        }
+        assert cache.redis_client.round_trips == trips + 1
+        assert "quran_surah:2:x" in cache.memory_cache
+
+    @pytest.mark.asyncio
+    async def test_distributed_lock_waits_for_other_worker(self, cache: CacheService):
+        await cache.redis_client.lock("lock:quran_surah:9", 30, False).acquire()
+
+        async def other_worker_finishes() -> None:
+            await asyncio.sleep(0.05)
+            await cache.redis_client.setex("quran_surah:9", 60, cache.codec.encode("tawbah"))
+
+        async def load() -> str:
+            raise AssertionError("must not compute while another worker holds the lock")
+
+        _, value = await asyncio.gather(
+            other_worker_finishes(),
+            cache.load_through("quran_surah:9", load, distributed_lock=True),
+        )
+
+        assert value == "tawbah"
+        assert cache.stats["coalesced_remote"] == 1
+
+    @pytest.mark.asyncio
+    async def test_latency_histograms_in_stats(self, cache: CacheService):
+        await cache.get("missing")
+
+        latency = cache.get_stats()["latency"]
+        assert latency["memory"]["count"] == 1
+        assert latency["redis"]["count"] == 1
+
+
 class TestCachedDecorator:
     """Test suite for @cached decorator."""
 
@@ -183,6 +349,48 @@ class TestCachedDecorator:
         assert result3 == 20
         assert call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_cached_decorator_coalesces_concurrent_misses(self):
+        """Test concurrent misses for one key share a single upstream call."""
+        cache = get_cache_service()
+        coalesced_before = cache.stats["coalesced"]
+        call_count = 0
+
+        @cached(prefix="test_single_flight", ttl=60)
+        async def slow_function(x: int) -> int:
+            nonlocal call_count
+            call_count += 1
+            await asyncio.sleep(0.05)
+            return x * 3
+
+        results = await asyncio.gather(*(slow_function(7) for _ in range(5)))
+
+        assert results == [21] * 5
+        assert call_count == 1
+        assert cache.stats["coalesced"] - coalesced_before == 4
+
+    @pytest.mark.asyncio
+    async def test_cached_decorator_shares_errors_without_caching(self):
+        """Test a failing load is reported to every waiter and retried later."""
+        call_count = 0
+
+        @cached(prefix="test_single_flight_error", ttl=60)
+        async def failing_function() -> int:
+            nonlocal call_count
+            call_count += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            failing_function(), failing_function(), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert call_count == 1
+
+        with pytest.raises(RuntimeError):
+            await failing_function()
+        assert call_count == 2
+
     @pytest.mark.asyncio
     async def test_cached_decorator_with_kwargs(self):
         """Test cached decorator with keyword arguments."""
@@ -286,6 +494,107 @@ class TestCachedDecorator:
         assert call_count == 2
 
 
+class TestStaleAndNegativeCaching:
+    """Test stale-while-revalidate and negative caching in @cached."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Controllable wall clock for soft/hard expiry."""
+        now = [time.time()]
+        monkeypatch.setattr("src.services.cache_service.time.time", lambda: now[0])
+        return now
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self, clock):
+        """Test a stale hit returns immediately and refreshes in the background."""
+        cache = get_cache_service()
+        stale_before = cache.stats["stale_hits"]
+        version = 0
+
+        @cached(prefix="test_swr", ttl=60, stale_ttl=600)
+        async def get_version() -> int:
+            nonlocal version
+            version += 1
+            return version
+
+        assert await get_version() == 1
+        clock[0] += 120  # past the soft TTL
+
+        assert await get_version() == 1
+        assert cache.stats["stale_hits"] - stale_before == 1
+        await asyncio.gather(*cache._background_tasks)
+
+        assert await get_version() == 2
+        assert version == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_value(self, clock):
+        """Test an upstream failure during refresh keeps serving the stale value."""
+        cache = get_cache_service()
+        errors_before = cache.stats["refresh_errors"]
+        healthy = True
+        call_count = 0
+
+        @cached(prefix="test_swr_error", ttl=60, stale_ttl=600, negative_ttl=30)
+        async def get_surah() -> dict | None:
+            nonlocal call_count
+            call_count += 1
+            if not healthy:
+                raise RuntimeError("upstream down")
+            return {"number": 1}
+
+        await get_surah()
+        healthy = False
+        clock[0] += 120
+
+        assert await get_surah() == {"number": 1}
+        await asyncio.gather(*cache._background_tasks)
+        assert cache.stats["refresh_errors"] - errors_before == 1
+
+        # Retry is deferred by negative_ttl, so no new upstream call yet
+        assert await get_surah() == {"number": 1}
+        await asyncio.gather(*cache._background_tasks)
+        assert call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_negative_result_cached_briefly(self, clock):
+        """Test failed results are cached for negative_ttl only."""
+        cache = get_cache_service()
+        negative_before = cache.stats["negative_hits"]
+        call_count = 0
+
+        @cached(prefix="test_negative", ttl=60, negative_ttl=1, negative_if=lambda r: not r)
+        async def get_names() -> list[str]:
+            nonlocal call_count
+            call_count += 1
+            return []
+
+        assert await get_names() == []
+        assert await get_names() == []
+        assert call_count == 1
+        assert cache.stats["negative_hits"] - negative_before == 1
+
+        await asyncio.sleep(1.1)  # memory tier expiry runs on the monotonic clock
+        await get_names()
+        assert call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_method_cache_shared_across_instances(self):
+        """Test the instance is not part of a method's cache key."""
+        call_count = 0
+
+        class Client:
+            @cached(prefix="test_method_key", ttl=60)
+            async def fetch(self, n: int) -> int:
+                nonlocal call_count
+                call_count += 1
+                return n
+
+        assert await Client().fetch(3) == 3
+        assert await Client().fetch(3) == 3
+        assert call_count == 1
+
+
 class TestCacheIntegration:
     """Integration tests for cache with API clients."""
 
@@ -373,3 +682,22 @@ class TestRedisIntegration:
                 # Other key should still exist (may be None if only in Redis)
         finally:
             await cache.disconnect_redis()
+
+    @pytest.mark.asyncio
+    async def test_redis_bulk_operations(self):
+        """Test MGET/pipeline bulk operations (Redis only)."""
+        cache = CacheService()
+        try:
+            await cache.connect_redis()
+            if cache.redis_enabled:
+                items = {f"bulk_test:{i}": i for i in range(10)}
+                await cache.set_many(items, chunk_size=3)
+                cache.memory_cache.clear()
+
+                found = await cache.get_many(items, chunk_size=4)
+                assert found == items
+                assert cache.stats["redis_hits"] == 10
+                assert "bulk_test:0" in cache.memory_cache
+                await cache.clear_pattern("bulk_test:*")
+        finally:
+            await cache.disconnect_redis()
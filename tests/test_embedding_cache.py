@@ -0,0 +1,71 @@
+"""Tests for the query embedding cache."""
+
+from __future__ import annotations
+
+from src.services.embedding_cache import (
+    EmbeddingCache,
+    _pack_float16,
+    _unpack_float16,
+    normalize_query,
+)
+from src.services.fiqh_rag_service import FiqhRAG
+
+
+class TestNormalizeQuery:
+    """Test query normalization used for cache keys."""
+
+    def test_strips_diacritics_and_folds_alef(self):
+        assert normalize_query("مَا حُكْمُ  الإِمَامِ") == normalize_query("ما حكم الامام")
+
+    def test_folds_ya_and_whitespace(self):
+        assert normalize_query("  على\tالمصلى ") == "علي المصلي"
+
+    def test_lowercases_english(self):
+        assert normalize_query("Wudu  Ruling") == "wudu ruling"
+
+
+class TestEmbeddingCache:
+    """Test LRU behaviour and statistics."""
+
+    def test_variants_share_one_vector(self):
+        cache = EmbeddingCache(maxsize=8)
+        calls: list[str] = []
+
+        def compute(text: str) -> list[float]:
+            calls.append(text)
+            return [0.1, 0.2]
+
+        cache.get_or_compute("m", "حُكْمُ الصلاة", compute)
+        cache.get_or_compute("m", "حكم  الصلاة", compute)
+
+        assert len(calls) == 1
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate_percent"] == 50.0
+
+    def test_model_name_is_part_of_key(self):
+        assert EmbeddingCache.make_key("a", "query") != EmbeddingCache.make_key("b", "query")
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(maxsize=2)
+        for text in ("one", "two", "three"):
+            cache.get_or_compute("m", text, lambda _t: [1.0])
+
+        assert cache.get_stats()["memory_cache_size"] == 2
+
+    def test_float16_roundtrip(self):
+        vector = [0.5, -0.25, 0.125]
+        assert _unpack_float16(_pack_float16(vector)) == vector
+
+
+def test_fiqh_rag_search_uses_embedding_cache(tmp_path):
+    cache = EmbeddingCache(maxsize=16)
+    rag = FiqhRAG(persist_directory=str(tmp_path / "qdrant"), embedding_cache=cache)
+
+    rag.search("حكم الوضوء", n_results=1, madhabs=["maliki"])
+    rag.search("حُكْمُ الوُضُوء", n_results=1, madhabs=["maliki"])
+
+    stats = cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
@@ -0,0 +1,96 @@
+"""Tests for the bounded Gemini SDK executor."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.services.gemini_executor import GeminiExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = GeminiExecutor(max_concurrency=2, timeout=5)
+    yield executor
+    executor.shutdown()
+
+
+class TestGeminiExecutor:
+    """Test concurrency cap, deadlines and stream cancellation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped_and_queue_visible(self, executor):
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def call():
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return "ok"
+
+        tasks = [asyncio.create_task(executor.run(call)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        assert executor.get_stats()["queued"] == 3
+
+        assert await asyncio.gather(*tasks) == ["ok"] * 5
+        stats = executor.get_stats()
+        assert peak == 2
+        assert stats["completed"] == 5
+        assert stats["active"] == stats["queued"] == 0
+        assert stats["queue_wait"]["count"] == 5
+
+    @pytest.mark.asyncio
+    async def test_deadline_keeps_slot_until_thread_finishes(self, executor):
+        release = threading.Event()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.run(release.wait, timeout=0.05)
+
+        assert executor.get_stats()["timeouts"] == 1
+        assert executor.get_stats()["active"] == 1
+        release.set()
+        await asyncio.sleep(0.05)
+        assert executor.get_stats()["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_and_forwards_errors(self, executor):
+        assert [item async for item in executor.stream(lambda: iter(["a", "b"]))] == ["a", "b"]
+
+        def failing():
+            yield "a"
+            raise ValueError("quota")
+
+        with pytest.raises(ValueError, match="quota"):
+            async for _ in executor.stream(failing):
+                pass
+        assert executor.get_stats()["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_stops_producer(self, executor):
+        produced = []
+        closed = threading.Event()
+
+        def chunks():
+            try:
+                for i in range(1000):
+                    produced.append(i)
+                    time.sleep(0.005)
+                    yield str(i)
+            finally:
+                closed.set()
+
+        stream = executor.stream(chunks)
+        assert await anext(stream) == "0"
+        await stream.aclose()
+
+        assert await asyncio.to_thread(closed.wait, 1)
+        assert len(produced) < 1000
+        assert executor.get_stats()["cancelled"] == 1
@@ -0,0 +1,114 @@
+"""Tests for the multi-provider LLM router."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.services import llm_router as llm_router_module
+from src.services.llm_router import LLMRouter
+
+# provider -> (delay seconds, response or None)
+BEHAVIOUR: dict[str, tuple[float, str | None]] = {}
+CALLS: list[str] = []
+CANCELLED: list[str] = []
+
+
+class FakeService:
+    """Stand-in for MultiLLMService driven by BEHAVIOUR."""
+
+    def __init__(self, provider: str, api_key: str | None = None) -> None:
+        self.provider = provider
+
+    async def generate(self, prompt, model, temperature=0.7, max_tokens=1000):
+        CALLS.append(self.provider)
+        delay, response = BEHAVIOUR[self.provider]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            CANCELLED.append(self.provider)
+            raise
+        return response
+
+
+@pytest.fixture
+def router(monkeypatch) -> LLMRouter:
+    BEHAVIOUR.clear()
+    CALLS.clear()
+    CANCELLED.clear()
+    monkeypatch.setattr(llm_router_module, "MultiLLMService", FakeService)
+    monkeypatch.setattr(llm_router_module.settings, "llm_hedge_default_delay", 0.05)
+    monkeypatch.setattr(llm_router_module.settings, "llm_health_min_samples", 3)
+    return LLMRouter()
+
+
+def _routes(*providers: str) -> list[dict]:
+    return [{"provider": p, "model": f"{p}-model", "api_key": None} for p in providers]
+
+
+class TestLLMRouter:
+    """Test failover, hedging and health-based ordering."""
+
+    @pytest.mark.asyncio
+    async def test_fails_over_on_error(self, router):
+        BEHAVIOUR.update({"groq": (0, None), "ollama": (0, "جواب")})
+
+        result = await router.generate("سؤال", _routes("groq", "ollama"))
+
+        assert result["content"] == "جواب"
+        assert result["provider"] == "ollama"
+        assert [a["reason"] for a in result["attempts"]] == ["primary", "failover"]
+        assert router.get_stats()["providers"]["groq"]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hedges_slow_provider_and_cancels_loser(self, router):
+        BEHAVIOUR.update({"openai": (1.0, "slow"), "groq": (0.01, "fast")})
+
+        result = await router.generate("سؤال", _routes("openai", "groq"))
+
+        assert result["content"] == "fast"
+        assert result["hedged"] is True
+        await asyncio.sleep(0)
+        assert CANCELLED == ["openai"]
+        assert router.get_stats()["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_all_routes_failing_returns_none(self, router):
+        BEHAVIOUR.update({"groq": (0, None), "ollama": (0, None)})
+
+        assert await router.generate("سؤال", _routes("groq", "ollama")) is None
+        assert router.get_stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_primary_moves_behind_healthy_backups(self, router):
+        for _ in range(3):
+            router._health("groq").record(False)
+        router._health("ollama").record(True, 0.5)
+        router._health("openai").record(True, 0.05)
+
+        order = [r["provider"] for r in router.order(_routes("groq", "ollama", "openai"))]
+
+        assert order == ["openai", "ollama", "groq"]
+
+    def test_hedge_delay_follows_tail_latency(self, router, monkeypatch):
+        monkeypatch.setattr(llm_router_module.settings, "llm_hedge_min_delay", 0.1)
+        assert router.hedge_delay("groq") == 0.05  # default until enough samples
+        for seconds in (0.2, 0.3, 2.0):
+            router._health("groq").record(True, seconds)
+
+        assert router.hedge_delay("groq") == pytest.approx(2.0)
+
+    def test_routes_for_appends_fallbacks(self, router, monkeypatch):
+        monkeypatch.setattr(
+            llm_router_module.settings,
+            "llm_fallback_routes",
+            [{"provider": "ollama", "model": "qwen2.5:7b"}, {"provider": "groq", "model": "m"}],
+        )
+
+        routes = router.routes_for("groq", "sk-abcdefghijklmnop", "m")
+
+        assert [(r["provider"], r["model"]) for r in routes] == [
+            ("groq", "m"),
+            ("ollama", "qwen2.5:7b"),
+        ]
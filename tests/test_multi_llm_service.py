@@ -0,0 +1,312 @@
+"""Tests for MultiLLMService HTTP clients, streaming, model catalogs and the Ollama backend."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.services.multi_llm_service import MultiLLMService, _catalog_key
+from src.services.ollama_service import AsyncOllamaBackend
+from src.services.provider_clients import ProviderClientPool, get_provider_client_pool
+
+API_KEY = "sk-abcdefghijklmnop"
+OLLAMA_URL = "http://ollama.test"
+
+
+class TestProviderClientPool:
+    """Test client reuse across service instances."""
+
+    @pytest.mark.asyncio
+    async def test_instances_share_one_client_per_provider(self):
+        first = MultiLLMService(provider="openai", api_key=API_KEY)
+        second = MultiLLMService(provider="openai", api_key=API_KEY)
+        groq = MultiLLMService(provider="groq", api_key=API_KEY)
+
+        assert first.client is second.client
+        assert first.client is not groq.client
+        await get_provider_client_pool().aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_and_reopens(self):
+        pool = ProviderClientPool()
+        client = pool.get("openai", "https://api.openai.com/v1")
+
+        await pool.aclose()
+
+        assert client.is_closed
+        assert pool.get("openai", "https://api.openai.com/v1") is not client
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_generate_uses_pooled_client(self, monkeypatch):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"choices": [{"message": {"content": "وعليكم السلام"}}]})
+
+        pool = ProviderClientPool()
+        pool._clients[("groq", "https://api.groq.com/openai/v1")] = httpx.AsyncClient(
+            base_url="https://api.groq.com/openai/v1", transport=httpx.MockTransport(handler)
+        )
+        monkeypatch.setattr("src.services.multi_llm_service.get_provider_client_pool", lambda: pool)
+
+        service = MultiLLMService(provider="groq", api_key=API_KEY)
+        assert await service.generate("السلام عليكم", model="llama-3.1-8b") == "وعليكم السلام"
+        assert await service.generate("السلام عليكم", model="llama-3.1-8b") == "وعليكم السلام"
+
+        assert [r.url.path for r in requests] == ["/openai/v1/chat/completions"] * 2
+        assert requests[0].headers["Authorization"] == f"Bearer {API_KEY}"
+        await pool.aclose()
+
+
+def _ollama_pool(handler) -> ProviderClientPool:
+    pool = ProviderClientPool()
+    pool._clients[("ollama", "http://ollama.test")] = httpx.AsyncClient(
+        base_url="http://ollama.test", transport=httpx.MockTransport(handler)
+    )
+    return pool
+
+
+class TestAsyncOllamaBackend:
+    """Test the non-blocking Ollama HTTP backend."""
+
+    @pytest.mark.asyncio
+    async def test_generate_and_stream(self, monkeypatch):
+        payloads: list[dict] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            payload = json.loads(request.content)
+            payloads.append(payload)
+            if not payload["stream"]:
+                return httpx.Response(200, json={"response": "بسم الله", "done": True})
+            lines = [
+                {"response": "بسم ", "done": False},
+                {"response": "الله", "done": False},
+                {"response": "", "done": True},
+            ]
+            return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+
+        pool = _ollama_pool(handler)
+        monkeypatch.setattr("src.services.ollama_service.get_provider_client_pool", lambda: pool)
+        backend = AsyncOllamaBackend(base_url="http://ollama.test", max_concurrency=1)
+
+        assert await backend.generate("qwen2.5:7b", "ابدأ", {"temperature": 0.1}) == "بسم الله"
+        chunks = [chunk async for chunk in backend.stream_generate("qwen2.5:7b", "ابدأ")]
+
+        assert chunks == ["بسم ", "الله"]
+        assert payloads[0]["options"] == {"temperature": 0.1}
+        assert backend.get_stats()["active"] == 0
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self, monkeypatch):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={"response": "ok", "done": True})
+
+        pool = _ollama_pool(handler)
+        monkeypatch.setattr("src.services.ollama_service.get_provider_client_pool", lambda: pool)
+        backend = AsyncOllamaBackend(base_url="http://ollama.test", max_concurrency=2)
+
+        results = await asyncio.gather(*(backend.generate("m", str(i)) for i in range(6)))
+
+        assert results == ["ok"] * 6
+        assert peak == 2
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_multi_llm_ollama_does_not_block_loop(self, monkeypatch):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"response": "done", "done": True})
+
+        pool = _ollama_pool(handler)
+        monkeypatch.setattr("src.services.ollama_service.get_provider_client_pool", lambda: pool)
+        monkeypatch.setattr(
+            "src.services.ollama_service._ollama_backend",
+            AsyncOllamaBackend(base_url="http://ollama.test"),
+        )
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        service = MultiLLMService(provider="ollama")
+        assert await service.generate("سؤال", model="qwen2.5:7b") == "done"
+        task.cancel()
+
+        assert ticks > 1
+        await pool.aclose()
+
+
+def _sse(*events) -> str:
+    return "".join(
+        f"data: {event if isinstance(event, str) else json.dumps(event)}\n\n" for event in events
+    )
+
+
+class TestProviderStreaming:
+    """Test token streaming for each provider family."""
+
+    async def _collect(self, monkeypatch, provider, base_url, handler, **kwargs) -> list[str]:
+        pool = ProviderClientPool()
+        pool._clients[(provider, base_url)] = httpx.AsyncClient(
+            base_url=base_url, transport=httpx.MockTransport(handler)
+        )
+        monkeypatch.setattr("src.services.multi_llm_service.get_provider_client_pool", lambda: pool)
+        monkeypatch.setattr("src.services.ollama_service.get_provider_client_pool", lambda: pool)
+        service = MultiLLMService(provider=provider, **kwargs)
+        try:
+            return [chunk async for chunk in service.stream("سؤال", model="m")]
+        finally:
+            await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_openai_compatible_stream(self, monkeypatch):
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert json.loads(request.content)["stream"] is True
+            body = _sse(
+                {"choices": [{"delta": {"role": "assistant"}}]},
+                {"choices": [{"delta": {"content": "الحمد "}}]},
+                {"choices": [{"delta": {"content": "لله"}}]},
+                "[DONE]",
+            )
+            return httpx.Response(200, text=body)
+
+        chunks = await self._collect(
+            monkeypatch, "openai", "https://api.openai.com/v1", handler, api_key=API_KEY
+        )
+        assert chunks == ["الحمد ", "لله"]
+
+    @pytest.mark.asyncio
+    async def test_anthropic_stream(self, monkeypatch):
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/v1/messages"
+            assert request.headers["x-api-key"] == API_KEY
+            body = _sse(
+                {"type": "message_start"},
+                {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "نعم"}},
+                {"type": "message_stop"},
+            )
+            return httpx.Response(200, text=body)
+
+        chunks = await self._collect(
+            monkeypatch, "anthropic", "https://api.anthropic.com/v1", handler, api_key=API_KEY
+        )
+        assert chunks == ["نعم"]
+
+    @pytest.mark.asyncio
+    async def test_gemini_stream(self, monkeypatch):
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path.endswith("/models/m:streamGenerateContent")
+            assert request.url.params["alt"] == "sse"
+            body = _sse(
+                {"candidates": [{"content": {"parts": [{"text": "بسم "}]}}]},
+                {"candidates": [{"content": {"parts": [{"text": "الله"}]}}]},
+            )
+            return httpx.Response(200, text=body)
+
+        chunks = await self._collect(
+            monkeypatch,
+            "gemini",
+            "https://generativelanguage.googleapis.com/v1beta",
+            handler,
+            api_key=API_KEY,
+        )
+        assert chunks == ["بسم ", "الله"]
+
+    @pytest.mark.asyncio
+    async def test_ollama_stream(self, monkeypatch):
+        monkeypatch.setattr("src.services.multi_llm_service.settings.ollama_base_url", OLLAMA_URL)
+        monkeypatch.setattr(
+            "src.services.ollama_service._ollama_backend", AsyncOllamaBackend(base_url=OLLAMA_URL)
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            lines = [{"response": "سلام", "done": False}, {"response": "", "done": True}]
+            return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+
+        assert await self._collect(monkeypatch, "ollama", OLLAMA_URL, handler) == ["سلام"]
+
+    @pytest.mark.asyncio
+    async def test_http_error_is_raised(self, monkeypatch):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(401, json={"error": "bad key"})
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await self._collect(
+                monkeypatch, "groq", "https://api.groq.com/openai/v1", handler, api_key=API_KEY
+            )
+
+
+class TestModelCatalogCache:
+    """Test caching of provider model lists per API key."""
+
+    @pytest.mark.asyncio
+    async def test_catalog_cached_per_api_key(self, monkeypatch):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            model = {"id": "llama-3.1-8b", "context_window": 8192}
+            return httpx.Response(200, json={"data": [model]})
+
+        pool = ProviderClientPool()
+        pool._clients[("groq", "https://api.groq.com/openai/v1")] = httpx.AsyncClient(
+            base_url="https://api.groq.com/openai/v1", transport=httpx.MockTransport(handler)
+        )
+        monkeypatch.setattr("src.services.multi_llm_service.get_provider_client_pool", lambda: pool)
+        first_key, second_key = "gsk-catalog-test-0001", "gsk-catalog-test-0002"
+
+        first = await MultiLLMService(provider="groq", api_key=first_key).list_available_models()
+        again = await MultiLLMService(provider="groq", api_key=first_key).list_available_models()
+        await MultiLLMService(provider="groq", api_key=second_key).list_available_models()
+
+        assert first == again
+        assert first[0]["id"] == "llama-3.1-8b"
+        assert len(requests) == 2
+
+        service = MultiLLMService(provider="groq", api_key=first_key)
+        assert first_key not in _catalog_key(service)
+        assert await service.invalidate_model_catalog()
+        await service.list_available_models()
+        assert len(requests) == 3
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_refresh_bypasses_and_replaces_cached_catalog(self, monkeypatch):
+        revoked = False
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if revoked:
+                return httpx.Response(401, json={"error": "invalid api key"})
+            return httpx.Response(200, json={"data": [{"id": "llama-3.1-8b"}]})
+
+        pool = ProviderClientPool()
+        pool._clients[("groq", "https://api.groq.com/openai/v1")] = httpx.AsyncClient(
+            base_url="https://api.groq.com/openai/v1", transport=httpx.MockTransport(handler)
+        )
+        monkeypatch.setattr("src.services.multi_llm_service.get_provider_client_pool", lambda: pool)
+        service = MultiLLMService(provider="groq", api_key="gsk-catalog-test-revoked")
+
+        assert await service.list_available_models()
+        revoked = True
+
+        assert await service.refresh_model_catalog() == []
+        assert await service.list_available_models() == []
+        await pool.aclose()
@@ -112,6 +112,30 @@ class TestFiqhRAG:
         stats = rag.get_statistics()
         assert stats["collections"]["hanafi"]["points"] == 1
 
+    def test_add_documents_batches_per_collection(self, tmp_path):
+        """Test bulk ingestion routes each document to its madhab collection."""
+        rag = FiqhRAG(persist_directory=str(tmp_path / "test_qdrant"))
+
+        docs = [
+            {"text": f"Maliki text {i}", "metadata": {"madhab": "maliki", "topic": "T"}}
+            for i in range(5)
+        ] + [
+            {"text": "Hanbali text", "metadata": {"madhab": "حنبلي", "topic": "T"}},
+            {"text": "   ", "metadata": {"madhab": "maliki"}},
+            {"text": "No madhab", "metadata": {}},
+        ]
+
+        report = rag.add_documents(iter(docs), batch_size=2)
+
+        assert report["added"] == 6
+        assert report["skipped"] == 2
+        assert report["failed"] == 0
+        assert report["collections"] == {"maliki": 5, "hanbali": 1}
+
+        stats = rag.get_statistics()
+        assert stats["collections"]["maliki"]["points"] == 5
+        assert stats["collections"]["hanbali"]["points"] == 1
+
     def test_search_single_madhab(self, tmp_path):
         """Test searching within a single madhab collection."""
         rag = FiqhRAG(persist_directory=str(tmp_path / "test_qdrant"))
@@ -177,6 +201,55 @@ class TestFiqhRAG:
         # Should potentially get results from multiple schools
         assert len(results) > 0
 
+    def test_search_with_breakdown_returns_per_madhab_results(self, tmp_path):
+        """Test one concurrent search returns merged and per-madhab results."""
+        rag = FiqhRAG(persist_directory=str(tmp_path / "test_qdrant"))
+
+        for madhab_name in ["maliki", "hanafi"]:
+            rag.add_document(
+                text="Ruling on wiping over leather socks during travel.",
+                metadata={"madhab": madhab_name, "topic": "Wiping", "category": "taharah"},
+            )
+
+        result = rag.search_with_breakdown(
+            "Ruling on wiping over leather socks during travel.",
+            n_results=5,
+            madhabs=["maliki", "hanafi", "shafii"],
+            score_threshold=0.1,
+        )
+
+        assert set(result["by_madhab"]) == {"maliki", "hanafi", "shafii"}
+        assert len(result["by_madhab"]["maliki"]) == 1
+        assert len(result["by_madhab"]["hanafi"]) == 1
+        assert result["by_madhab"]["shafii"] == []
+        assert {r["metadata"]["madhab"] for r in result["merged"]} == {"maliki", "hanafi"}
+
+    def test_retrieve_embeds_once_for_chunks_and_context(self, tmp_path):
+        """Test retrieve() serves chunks and budgeted context from one pass."""
+        rag = FiqhRAG(persist_directory=str(tmp_path / "test_qdrant"))
+        text = "Maliki ruling on combining prayers while travelling."
+        rag.add_document(
+            text=text,
+            metadata={"madhab": "maliki", "topic": "Combining", "category": "salah"},
+        )
+
+        calls: list[str] = []
+        original_embed = rag._embed
+
+        def counting_embed(value):
+            calls.append(value)
+            return original_embed(value)
+
+        rag._embed = counting_embed  # type: ignore[method-assign]
+        retrieval = rag.retrieve(text, madhabs=["maliki"], score_threshold=0.1)
+
+        assert len(retrieval) == 1
+        context = retrieval.context(max_context_length=1500)
+        assert "Combining" in context
+        assert retrieval.context(max_context_length=1500) is context
+        assert retrieval.context(max_context_length=10) == ""
+        assert len(calls) == 1
+
     def test_get_relevant_context_single_madhab(self, tmp_path):
         """Test context generation for single madhab."""
         rag = FiqhRAG(persist_directory=str(tmp_path / "test_qdrant"))
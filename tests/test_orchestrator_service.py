@@ -0,0 +1,261 @@
+"""Tests for the orchestrator: classification, concurrent retrieval and web context."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from src.config import settings
+from src.services.fiqh_rag_service import FiqhRAG
+from src.services.madhab_classifier import MultiMadhabClassifier
+from src.services.cache_service import get_cache_service
+from src.services.orchestrator_service import OrchestratorService, _classification_key
+
+
+@pytest.fixture
+def orchestrator(tmp_path) -> OrchestratorService:
+    rag = FiqhRAG(persist_directory=str(tmp_path / "qdrant"), create_all_collections=False)
+    return OrchestratorService(rag=rag)
+
+
+class TestClassifyQuestion:
+    """Test cached classification for the /ask pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_classification_cached_per_normalized_question(
+        self, orchestrator: OrchestratorService, monkeypatch
+    ):
+        calls = 0
+        original = orchestrator._multi_madhab_decision
+
+        async def counting(question: str) -> tuple[bool, str, str]:
+            nonlocal calls
+            calls += 1
+            return await original(question)
+
+        monkeypatch.setattr(orchestrator, "_multi_madhab_decision", counting)
+
+        first = await orchestrator.classify_question("ما حكم الوضوء بماء البحر؟")
+        second = await orchestrator.classify_question("ما  حُكم الوضوء بماء البحر؟")
+
+        assert first == second
+        assert set(first) == {"is_fiqh", "category", "multi_madhab", "reason", "source"}
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_keyword_fallback_cached_briefly(
+        self, orchestrator: OrchestratorService, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "gemini_api_key", "")
+        question = "compare the madhabs on the ruling of zakat on jewellery"
+
+        result = await orchestrator.classify_question(question)
+        entry = get_cache_service()._memory_get(_classification_key(None, question))
+
+        assert result["source"] == "keyword_fallback"
+        assert entry["negative"] is True
+        assert entry["expires_at"] - time.time() <= 300
+
+
+class StubGemini:
+    """Gemini stand-in returning a canned classification response."""
+
+    def __init__(self, response: str | None) -> None:
+        self.response = response
+        self.prompts: list[str] = []
+
+    async def generate_content(self, prompt: str, **_kwargs) -> str | None:
+        self.prompts.append(prompt)
+        return self.response
+
+
+class TestLLMDecision:
+    """Test the Gemini path of the multi-madhab decision."""
+
+    QUESTION = "What is the ruling on wiping over socks in wudu?"
+
+    @pytest.fixture
+    def classifier(self, orchestrator: OrchestratorService, tmp_path, monkeypatch):
+        classifier = MultiMadhabClassifier(rag=orchestrator.rag, path=str(tmp_path / "c.json"))
+        monkeypatch.setattr(settings, "gemini_api_key", "test-key")
+        monkeypatch.setattr(
+            "src.services.orchestrator_service.get_madhab_classifier", lambda: classifier
+        )
+        return classifier
+
+    @pytest.mark.asyncio
+    async def test_llm_decision_is_used_and_recorded(
+        self, orchestrator: OrchestratorService, classifier: MultiMadhabClassifier
+    ):
+        gemini = StubGemini('{"needs_multi_madhab": true, "reason": "Schools differ."}')
+        orchestrator._gemini_service = gemini
+
+        decision = await orchestrator._multi_madhab_decision(self.QUESTION)
+
+        assert decision == (True, "Schools differ.", "llm")
+        assert '"needs_multi_madhab": true/false' in gemini.prompts[0]
+        assert classifier.counts["multi"] == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("response", [None, ""])
+    async def test_failed_generation_falls_back_to_keywords(
+        self, orchestrator: OrchestratorService, classifier: MultiMadhabClassifier, response
+    ):
+        orchestrator._gemini_service = StubGemini(response)
+
+        decision = await orchestrator._multi_madhab_decision(self.QUESTION)
+
+        assert decision[2] == "keyword_fallback"
+        assert classifier.counts == {"multi": 0, "single": 0}
+
+
+class TestMultiMadhabClassifier:
+    """Test the local nearest-centroid classifier."""
+
+    @pytest.fixture
+    def classifier(self, tmp_path) -> MultiMadhabClassifier:
+        rag = FiqhRAG(persist_directory=str(tmp_path / "qdrant"), create_all_collections=False)
+        return MultiMadhabClassifier(
+            rag=rag, path=str(tmp_path / "classifier.json"), min_margin=0.05, min_examples=2
+        )
+
+    def _train(self, classifier: MultiMadhabClassifier) -> None:
+        classifier.record("compare the madhabs on wiping over socks", True)
+        classifier.record("compare the madhabs on raising hands in prayer", True)
+        classifier.record("what does the maliki madhab say about zakat on honey", False)
+        classifier.record("what does the maliki madhab say about zakat on gold", False)
+
+    def test_untrained_defers_to_llm(self, classifier: MultiMadhabClassifier):
+        classifier.record("compare the madhabs on wiping over socks", True)
+        assert classifier.predict("compare the madhabs on wiping over socks") is None
+
+    def test_confident_local_decisions(self, classifier: MultiMadhabClassifier):
+        self._train(classifier)
+
+        assert classifier.predict("compare the madhabs on wiping over leather socks")[0] is True
+        assert classifier.predict("what does the maliki madhab say about zakat on silver")[0] is False
+        assert classifier.get_stats()["local"] == 2
+
+    def test_centroids_persist(self, classifier: MultiMadhabClassifier):
+        self._train(classifier)
+        assert classifier.flush()
+
+        reloaded = MultiMadhabClassifier(
+            rag=classifier.rag, path=classifier.path, min_margin=0.05, min_examples=2
+        )
+
+        assert reloaded.counts == {"multi": 2, "single": 2}
+        assert reloaded.trained
+
+    def test_records_are_batched(self, classifier: MultiMadhabClassifier):
+        classifier.flush_every = 3
+        classifier.record("compare the madhabs on wiping over socks", True)
+        classifier.record("compare the madhabs on raising hands in prayer", True)
+
+        assert not os.path.exists(classifier.path)
+        classifier.record("what does the maliki madhab say about zakat on honey", False)
+        assert os.path.exists(classifier.path)
+        assert classifier.get_stats()["pending"] == 0
+
+    def test_workers_sharing_a_file_keep_every_example(self, classifier: MultiMadhabClassifier):
+        other = MultiMadhabClassifier(
+            rag=classifier.rag, path=classifier.path, min_margin=0.05, min_examples=2
+        )
+        classifier.record("compare the madhabs on wiping over socks", True)
+        other.record("what does the maliki madhab say about zakat on honey", False)
+        other.record("compare the madhabs on raising hands in prayer", True)
+        classifier.flush()
+        other.flush()
+
+        reloaded = MultiMadhabClassifier(rag=classifier.rag, path=classifier.path)
+        assert reloaded.counts == {"multi": 2, "single": 1}
+        # The last flusher also picked up the other worker's examples
+        assert other.counts == reloaded.counts
+
+    def test_llm_json_parsing(self):
+        parse = OrchestratorService._parse_llm_decision
+
+        assert parse('{"needs_multi_madhab": true, "reason": "x"}')["needs_multi_madhab"] is True
+        assert parse('Sure! {"needs_multi_madhab": false, "reason": "y"} Done.')["reason"] == "y"
+        assert parse("no json here") is None
+        assert parse(None) is None
+
+
+class TestGatherContext:
+    """Test the concurrent AS-mode retrieval stage."""
+
+    @pytest.mark.asyncio
+    async def test_sources_run_concurrently_with_partial_results(
+        self, orchestrator: OrchestratorService, monkeypatch
+    ):
+        async def slow_fiqh(*_args, **_kwargs):
+            await asyncio.sleep(0.1)
+            return {"maliki": [{"text": "..."}]}
+
+        async def slow_cache(*_args, **_kwargs):
+            await asyncio.sleep(0.1)
+            return {"quran": [{"ayah": 1}], "hadith": []}
+
+        async def broken_web(*_args, **_kwargs):
+            raise RuntimeError("crawler down")
+
+        monkeypatch.setattr(orchestrator, "search_madhabs_separately", slow_fiqh)
+        monkeypatch.setattr(orchestrator, "get_quran_hadith_from_cache", slow_cache)
+        monkeypatch.setattr(orchestrator, "perform_web_search", broken_web)
+
+        start = time.perf_counter()
+        retrieval = await orchestrator.gather_context("حكم المسح", web_search=True)
+
+        assert time.perf_counter() - start < 0.18
+        assert retrieval["madhab_results"] == {"maliki": [{"text": "..."}]}
+        assert retrieval["cached_content"]["quran"] == [{"ayah": 1}]
+        assert retrieval["web_context"] == ""
+        assert retrieval["timings"]["web"]["status"] == "error"
+        assert retrieval["timings"]["fiqh"]["status"] == "ok"
+
+    @pytest.mark.asyncio
+    async def test_slow_source_times_out(self, orchestrator: OrchestratorService, monkeypatch):
+        async def hanging(*_args, **_kwargs):
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(orchestrator, "search_madhabs_separately", hanging)
+        monkeypatch.setitem(settings.retrieval_timeouts, "fiqh", 0.05)
+
+        retrieval = await orchestrator.gather_context("حكم المسح")
+
+        assert retrieval["madhab_results"] == {}
+        assert retrieval["timings"]["fiqh"]["status"] == "timeout"
+        assert "web" not in retrieval["timings"]
+
+
+class TestWebContextBudget:
+    """Test deduplication and budgeting of scraped web pages."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_pages_dropped_and_budget_respected(
+        self, orchestrator: OrchestratorService, monkeypatch
+    ):
+        page = "Wiping over socks is valid when they cover the ankles and were worn in purity. " * 3
+
+        async def fake_queries(question, max_attempts=2, madhab=None):
+            return [f"{madhab} q1", f"{madhab} q2"]
+
+        async def fake_scrape(query):
+            # Both queries find the same page; the second also finds a long one
+            pages = [("https://same.example", page)]
+            if query.endswith("q2"):
+                pages.append(("https://long.example", "filler " * 2000))
+            return pages
+
+        monkeypatch.setattr(orchestrator, "generate_search_queries", fake_queries)
+        monkeypatch.setattr(orchestrator, "_scrape_query", fake_scrape)
+        monkeypatch.setattr(settings, "web_context_budget", 500)
+
+        context = await orchestrator.perform_web_search_by_madhab("q", ["maliki"])
+
+        assert "## MALIKI Madhab - Web Context" in context
+        assert context.count("https://same.example") == 1
+        assert "https://long.example" not in context
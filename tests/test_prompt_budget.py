@@ -0,0 +1,91 @@
+"""Tests for prompt-size budgeting and context packing."""
+
+from __future__ import annotations
+
+from src.utils.prompt_budget import (
+    ContextAssembler,
+    estimate_tokens,
+    prompt_token_report,
+    split_markdown_sections,
+)
+
+PAGE = (
+    "Wiping over leather socks is permitted for the resident for a day and a night "
+    "and for the traveller for three days and nights, provided they were put on in purity."
+)
+
+
+class TestEstimateTokens:
+    """Test the script-aware token heuristic."""
+
+    def test_empty_text_is_free(self):
+        assert estimate_tokens("") == 0
+
+    def test_arabic_costs_more_per_character(self):
+        english = "a" * 100
+        arabic = "ب" * 100
+
+        assert estimate_tokens(arabic, "ollama") > estimate_tokens(english, "ollama")
+
+
+class TestContextAssembler:
+    """Test deduplication and greedy packing."""
+
+    def test_packs_highest_scores_and_keeps_original_order(self):
+        assembler = ContextAssembler(budget_tokens=60, dedup_threshold=0.8)
+        assembler.add("fiqh", "low " * 40, score=0.1)
+        assembler.add("quran", "[Quran 5:6] wash your faces", score=2.0)
+        assembler.add("fiqh", PAGE, score=0.9)
+
+        packed = assembler.assemble()
+
+        assert packed["sections"] == {
+            "quran": ["[Quran 5:6] wash your faces"],
+            "fiqh": [PAGE],
+        }
+        assert packed["dropped"] == 1
+        assert packed["tokens"] <= packed["budget"] == 60
+
+    def test_smaller_piece_still_fits_after_a_drop(self):
+        assembler = ContextAssembler(budget_tokens=50, dedup_threshold=0.8)
+        assembler.add("web", "x " * 200, score=1.0)
+        assembler.add("web", "short note on tayammum", score=0.5)
+
+        packed = assembler.assemble()
+
+        assert packed["sections"]["web"] == ["short note on tayammum"]
+
+    def test_near_duplicates_are_dropped(self):
+        assembler = ContextAssembler(budget_tokens=1000, dedup_threshold=0.8)
+        assembler.add("web", f"### Source: https://a.example\n\n{PAGE}", score=0.5)
+        assembler.add("web", f"### Source: https://b.example\n\n{PAGE}", score=0.4)
+
+        packed = assembler.assemble()
+
+        assert packed["sections"]["web"] == [f"### Source: https://a.example\n\n{PAGE}"]
+        assert packed["duplicates"] == 1
+
+    def test_report_includes_prompt_estimate(self):
+        assembler = ContextAssembler(budget_tokens=1000, provider="gemini")
+        assembler.add("fiqh", PAGE, score=1.0)
+        packed = assembler.assemble()
+
+        report = prompt_token_report(f"Question\n\n{PAGE}", packed, "gemini")
+
+        assert report["context"] == estimate_tokens(PAGE, "gemini")
+        assert report["prompt"] > report["context"]
+        assert report["included"] == 1
+
+
+def test_split_markdown_sections():
+    text = (
+        "\n\n## MALIKI Madhab - Web Context\n"
+        "\n### Source: u1\n\nbody 1\n"
+        "\n### Source: u2\n\nbody 2"
+    )
+
+    assert split_markdown_sections(text) == [
+        "## MALIKI Madhab - Web Context",
+        "### Source: u1\n\nbody 1",
+        "### Source: u2\n\nbody 2",
+    ]
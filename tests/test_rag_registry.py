@@ -0,0 +1,34 @@
+"""Tests for the process-wide RAG registry."""
+
+from __future__ import annotations
+
+from src.services.rag_registry import RAGRegistry
+
+
+class TestRAGRegistry:
+    """Test shared lifecycle of the embedding model and FiqhRAG."""
+
+    def test_not_ready_before_first_use(self, tmp_path):
+        registry = RAGRegistry(persist_directory=str(tmp_path / "qdrant"))
+
+        assert registry.ready is False
+        assert registry.status()["fiqh_rag_loaded"] is False
+
+    def test_fiqh_rag_is_shared(self, tmp_path):
+        registry = RAGRegistry(persist_directory=str(tmp_path / "qdrant"))
+
+        first = registry.fiqh_rag
+        second = registry.fiqh_rag
+
+        assert first is second
+        assert registry.ready is True
+
+    def test_warm_up_reports_status(self, tmp_path):
+        registry = RAGRegistry(persist_directory=str(tmp_path / "qdrant"))
+
+        assert registry.warm_up() is True
+
+        status = registry.status()
+        assert status["ready"] is True
+        assert status["warmup_seconds"] is not None
+        assert status["error"] is None
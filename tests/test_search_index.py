@@ -0,0 +1,190 @@
+"""Tests for the cached-content inverted index."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.config import settings
+from src.services.cache_service import CacheService
+from src.services.cached_content_service import CachedContentService
+from src.services.search_index import InvertedIndex, build_quran_index, tokenize
+
+SURAHS = {
+    1: {
+        "englishName": "Al-Faatiha",
+        "ayahs": [
+            {"numberInSurah": 1, "text": "بِسْمِ ٱللَّهِ ٱلرَّحْمَٰنِ ٱلرَّحِيمِ"},
+            {"numberInSurah": 2, "text": "ٱلْحَمْدُ لِلَّهِ رَبِّ ٱلْعَٰلَمِينَ"},
+        ],
+    },
+    2: {
+        "englishName": "Al-Baqara",
+        "ayahs": [
+            {"numberInSurah": 153, "text": "ٱسْتَعِينُوا۟ بِٱلصَّبْرِ وَٱلصَّلَوٰةِ ۚ إِنَّ ٱللَّهَ مَعَ ٱلصَّٰبِرِينَ"},
+        ],
+    },
+}
+
+
+class TestTokenize:
+    """Test token normalization."""
+
+    def test_strips_diacritics_and_quranic_marks(self):
+        assert tokenize("ٱسْتَعِينُوا۟ بِٱلصَّبْرِ ۚ") == ["استعينوا", "بالصبر"]
+
+    def test_english_lowercase(self):
+        assert tokenize("Guide us to the Straight Path") == [
+            "guide",
+            "us",
+            "to",
+            "the",
+            "straight",
+            "path",
+        ]
+
+
+class TestInvertedIndex:
+    """Test phrase, prefix and ranking behaviour."""
+
+    @pytest.fixture
+    def index(self) -> InvertedIndex:
+        return build_quran_index(SURAHS)
+
+    def test_exact_word_lookup(self, index: InvertedIndex):
+        results = index.search("الرحيم")
+        assert [(r["surah_number"], r["ayah_number"]) for r in results] == [(1, 1)]
+
+    def test_prefix_lookup(self, index: InvertedIndex):
+        results = index.search("الصبري")
+        assert results[0]["surah_number"] == 2
+
+    def test_match_all_terms(self, index: InvertedIndex):
+        assert index.search("الحمد الصبر") == []
+        assert len(index.search("الحمد الصبر", match_all=False)) == 2
+
+    def test_phrase_ranks_first(self):
+        index = InvertedIndex()
+        index.add({"id": "scattered", "text": "path the straight is the guide"})
+        index.add({"id": "phrase", "text": "guide us to the straight path"})
+        index.finalize()
+
+        assert index.search("straight path")[0]["id"] == "phrase"
+
+    def test_roundtrip_serialization(self, index: InvertedIndex):
+        restored = InvertedIndex.from_dict(index.to_dict())
+
+        assert restored is not None
+        assert restored.search("الرحيم") == index.search("الرحيم")
+        assert InvertedIndex.from_dict({"version": -1}) is None
+
+
+@pytest.mark.asyncio
+async def test_search_quran_in_cache_uses_index():
+    service = CachedContentService()
+    service.cache = CacheService()
+    for surah_num, surah in SURAHS.items():
+        await service.cache.set(f"quran_surah:{surah_num}:quran-uthmani", surah)
+
+    results = await service.search_quran_in_cache("الصبر", limit=3)
+
+    assert len(results) == 1
+    assert results[0]["surah_name"] == "Al-Baqara"
+    assert results[0]["ayah_number"] == 153
+    assert await service.cache.get("quran_index:quran-uthmani") is not None
+
+
+@pytest.mark.asyncio
+async def test_search_hadith_in_cache_covers_whole_collection():
+    service = CachedContentService()
+    service.cache = CacheService()
+    hadiths = [
+        {"number": 1, "arab": "إنما الأعمال بالنيات", "id": "Amal tergantung niat"},
+        {"number": 4000, "arab": "الطهور شطر الإيمان", "id": "Bersuci sebagian iman"},
+    ]
+    await service.cache.set("hadith_range:muslim:3951-4000", {"hadiths": hadiths[1:]})
+    await service.cache.set("hadith_range:muslim:1-50", {"hadiths": hadiths[:1]})
+
+    results = await service.search_hadith_in_cache("الطهور", collections=["muslim"])
+
+    assert [r["number"] for r in results] == [4000]
+    assert results[0]["collection"] == "muslim"
+    assert results[0]["hadith_data"]["id"] == "Bersuci sebagian iman"
+    assert await service.cache.get("hadith_index:muslim") is not None
+
+
+@pytest.mark.asyncio
+async def test_build_hadith_index_from_fetched_hadiths():
+    service = CachedContentService()
+    service.cache = CacheService()
+    await service.build_hadith_index(
+        "malik", [{"number": 7, "arab": "الصلاة في السفر", "id": "Shalat safar"}]
+    )
+
+    results = await service.search_hadith_in_cache("shalat", collections=["malik", "bukhari"])
+
+    assert [(r["collection"], r["number"]) for r in results] == [("malik", 7)]
+
+
+@pytest.mark.asyncio
+async def test_newer_persisted_index_replaces_partial_one(monkeypatch):
+    worker = CachedContentService()
+    worker.cache = CacheService()
+    await worker.cache.set("quran_surah:1:quran-uthmani", SURAHS[1])
+    assert await worker.search_quran_in_cache("الصبر") == []
+
+    # A cache script finishes populating and rebuilds the index
+    script = CachedContentService()
+    script.cache = worker.cache
+    await worker.cache.set("quran_surah:2:quran-uthmani", SURAHS[2])
+    await script.build_quran_index()
+
+    assert await worker.search_quran_in_cache("الصبر") == []
+    monkeypatch.setattr(settings, "search_index_refresh_interval", 0)
+    # The refresh runs in the background; the current index keeps serving
+    assert await worker.search_quran_in_cache("الصبر") == []
+    await asyncio.gather(*worker.cache._background_tasks)
+    assert len(await worker.search_quran_in_cache("الصبر")) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_searches_load_index_once():
+    service = CachedContentService()
+    service.cache = CacheService()
+    await service.cache.set("quran_surah:2:quran-uthmani", SURAHS[2])
+    builds = 0
+    original = service.build_quran_index
+
+    async def counting(*args, **kwargs):
+        nonlocal builds
+        builds += 1
+        return await original(*args, **kwargs)
+
+    service.build_quran_index = counting
+    results = await asyncio.gather(
+        service.warm_search_indexes(collections=()),
+        *(service.search_quran_in_cache("الصبر") for _ in range(3)),
+    )
+
+    assert builds == 1
+    assert all(len(found) == 1 for found in results[1:])
+
+
+@pytest.mark.asyncio
+async def test_missing_index_is_not_rebuilt_on_every_search():
+    service = CachedContentService()
+    service.cache = CacheService()
+    builds = 0
+    original = service.build_quran_index
+
+    async def counting(*args, **kwargs):
+        nonlocal builds
+        builds += 1
+        return await original(*args, **kwargs)
+
+    service.build_quran_index = counting
+    await service.search_quran_in_cache("الصبر")
+    await service.search_quran_in_cache("الصبر")
+
+    assert builds == 1
@@ -0,0 +1,93 @@
+"""Tests for the semantic /ask answer cache."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.services.fiqh_rag_service import FiqhRAG
+from src.services.semantic_cache import SemanticAnswerCache
+
+QUESTION = "What is the ruling on wiping over socks during wudu?"
+RESPONSE = {"content": "Permitted under conditions.", "language": "en", "metadata": {}}
+
+
+@pytest.fixture
+def cache(tmp_path) -> SemanticAnswerCache:
+    rag = FiqhRAG(persist_directory=str(tmp_path / "qdrant"), create_all_collections=False)
+    return SemanticAnswerCache(rag=rag, collection_name="answer_cache_test", threshold=0.8)
+
+
+class TestSemanticAnswerCache:
+    """Test nearest-neighbour reuse of cached answers."""
+
+    def test_rephrased_question_hits(self, cache: SemanticAnswerCache):
+        scope = cache.scope_key(provider="ollama", language="en", madhabs=["maliki"])
+        assert cache.store(QUESTION, scope, RESPONSE)
+
+        hit = cache.lookup("what is the ruling on wiping over socks in wudu", scope)
+
+        assert hit is not None
+        assert hit["response"] == RESPONSE
+        assert hit["matched_question"] == QUESTION
+        assert hit["similarity"] >= 0.8
+
+    def test_unrelated_question_misses(self, cache: SemanticAnswerCache):
+        scope = cache.scope_key(provider="ollama", language="en")
+        cache.store(QUESTION, scope, RESPONSE)
+
+        assert cache.lookup("How many rakahs are in the Maghrib prayer?", scope) is None
+
+    def test_scope_must_match(self, cache: SemanticAnswerCache):
+        maliki = cache.scope_key(provider="ollama", language="en", madhabs=["maliki"])
+        hanafi = cache.scope_key(provider="ollama", language="en", madhabs=["hanafi"])
+        cache.store(QUESTION, maliki, RESPONSE)
+
+        assert cache.lookup(QUESTION, hanafi) is None
+        assert cache.scope_key(madhabs=["hanafi", "maliki"]) == cache.scope_key(
+            madhabs=["maliki", "hanafi"]
+        )
+
+    def test_expired_answer_not_served_and_swept(self, cache: SemanticAnswerCache):
+        cache.ttl = -1
+        scope = cache.scope_key(provider="ollama")
+        cache.store(QUESTION, scope, RESPONSE)
+
+        assert cache.lookup(QUESTION, scope) is None
+        assert cache.sweep_expired()
+        assert cache.rag.client.get_collection(cache.collection_name).points_count == 0
+
+    def test_expired_neighbours_do_not_take_result_slots(self, cache: SemanticAnswerCache):
+        scope = cache.scope_key(provider="ollama")
+        cache.ttl = -1
+        cache.sweep_interval = 10**9
+        for i in range(6):
+            cache.store(f"{QUESTION} ({i})", scope, {"content": "stale"})
+        cache.ttl = 3600
+        cache.store("what is the ruling on wiping over socks in wudu?", scope, RESPONSE)
+
+        hit = cache.lookup(QUESTION, scope)
+
+        assert hit is not None
+        assert hit["response"] == RESPONSE
+
+
+def test_lookup_filter_uses_qdrant_models(tmp_path):
+    """The embedded client rejects raw dict filters; use real qdrant_client types."""
+    pytest.importorskip("qdrant_client")
+    from qdrant_client.models import Filter
+
+    rag = FiqhRAG(persist_directory=str(tmp_path / "qdrant"), create_all_collections=False)
+    cache = SemanticAnswerCache(rag=rag, collection_name="answer_cache_test", threshold=0.5)
+    scope = cache.scope_key(provider="ollama", language="en")
+    filters = []
+    search = rag.client.search
+
+    def recording_search(**kwargs):
+        filters.append(kwargs["query_filter"])
+        return search(**kwargs)
+
+    rag.client.search = recording_search
+    assert cache.store(QUESTION, scope, RESPONSE)
+
+    assert cache.lookup(QUESTION, scope)["response"] == RESPONSE
+    assert isinstance(filters[0], Filter)
@@ -0,0 +1,131 @@
+"""Tests for concurrent Firecrawl scraping in WebSearchService."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.services.web_search_service import WebSearchService
+
+
+@pytest.fixture
+def service(monkeypatch) -> WebSearchService:
+    service = WebSearchService(api_key="test-key")
+    delays = {"https://fast.example/1": 0.01, "https://fast.example/2": 0.02}
+    service.started = []
+    service.cancelled = []
+
+    async def fake_scrape(url: str, formats=None):
+        service.started.append(url)
+        try:
+            await asyncio.sleep(delays.get(url, 1.0))
+        except asyncio.CancelledError:
+            service.cancelled.append(url)
+            raise
+        return {"markdown": f"page {url}"}
+
+    monkeypatch.setattr(service, "scrape_url", fake_scrape)
+    return service
+
+
+class TestScrapeUrls:
+    """Test first-N-wins scraping with limits and a deadline."""
+
+    @pytest.mark.asyncio
+    async def test_first_pages_win_and_rest_cancelled(self, service: WebSearchService):
+        urls = ["https://slow.example/a", "https://fast.example/1", "https://fast.example/2"]
+
+        results = await service.scrape_urls(urls, limit=2, deadline=5)
+
+        assert [r["url"] for r in results] == ["https://fast.example/1", "https://fast.example/2"]
+        await asyncio.sleep(0)
+        assert service.cancelled == ["https://slow.example/a"]
+
+    @pytest.mark.asyncio
+    async def test_deadline_returns_partial_results(self, service: WebSearchService):
+        urls = ["https://fast.example/1", "https://slow.example/a", "https://slow.example/b"]
+
+        results = await service.scrape_urls(urls, limit=3, deadline=0.2)
+
+        assert [r["url"] for r in results] == ["https://fast.example/1"]
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self, service: WebSearchService, monkeypatch):
+        monkeypatch.setattr(
+            "src.services.web_search_service.settings.web_search_per_host_limit", 1
+        )
+        urls = ["https://slow.example/a", "https://slow.example/b", "https://fast.example/1"]
+
+        await service.scrape_urls(urls, limit=1, deadline=0.1)
+
+        assert "https://slow.example/b" not in service.started
+
+    @pytest.mark.asyncio
+    async def test_without_api_key_nothing_is_scraped(self):
+        assert await WebSearchService(api_key="").scrape_urls(["https://a.example"]) == []
+
+
+class TestPageCache:
+    """Test the scraped-page and search result caches."""
+
+    @pytest.fixture
+    def firecrawl(self, monkeypatch):
+        service = WebSearchService(api_key="test-key")
+        service.calls = []
+
+        async def fake_post(path: str, payload: dict):
+            service.calls.append((path, payload))
+            if path == "/search":
+                return {"data": {"results": [{"url": "https://islamqa.info/en/answers/1"}]}}
+            return {
+                "success": True,
+                "data": {
+                    "markdown": f"# {payload['url']}",
+                    "metadata": {"ETag": '"v1"', "statusCode": 200},
+                },
+            }
+
+        monkeypatch.setattr(service, "_post", fake_post)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_repeated_scrape_is_served_from_cache(self, firecrawl: WebSearchService):
+        url = "https://seekersguidance.org/answers/page-cache-1"
+
+        first = await firecrawl.scrape_url(url)
+        second = await firecrawl.scrape_url(url)
+
+        assert first["markdown"] == second["markdown"] == f"# {url}"
+        assert len(firecrawl.calls) == 1
+        assert firecrawl.get_stats()["page_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_page_revalidated_with_etag(self, firecrawl: WebSearchService, monkeypatch):
+        url = "https://seekersguidance.org/answers/page-cache-2"
+        sent = {}
+
+        async def not_modified(page_url: str, entry: dict) -> bool:
+            sent.update(entry, held=entry)
+            return True
+
+        await firecrawl.scrape_url(url)
+        monkeypatch.setattr("src.services.web_search_service.settings.web_page_cache_ttl", -1)
+        monkeypatch.setattr(firecrawl, "_revalidate", not_modified)
+
+        page = await firecrawl.scrape_url(url)
+
+        assert page["markdown"] == f"# {url}"
+        assert sent["etag"] == '"v1"'
+        # The entry other readers share is replaced, not updated in place
+        assert sent["held"]["fetched_at"] == sent["fetched_at"]
+        assert len(firecrawl.calls) == 1
+        assert firecrawl.get_stats()["page_revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_search_results_cached_per_query(self, firecrawl: WebSearchService):
+        query = "wiping over socks page-cache-test"
+
+        assert await firecrawl.search(query) == ["https://islamqa.info/en/answers/1"]
+        assert await firecrawl.search(query) == ["https://islamqa.info/en/answers/1"]
+        assert [path for path, _ in firecrawl.calls] == ["/search"]